@@ -4,79 +4,318 @@ Assignments API routes.
 Handles all endpoints related to assignments and their milestones:
 
 - POST /assignments         → Create a new assignment and generate milestones via LLM
-- GET /assignments          → Retrieve all assignments
+                               (``"async": true`` queues generation and returns 202)
+- POST /assignments/batch   → Create many assignments, splitting descriptions concurrently
+- GET /assignments/{id}/generation → Poll the background generation job
+- GET /assignments          → Retrieve assignments (supports ?limit=&cursor=&fields=)
 - GET /assignments/{id}     → Retrieve a specific assignment and its milestones
-- PUT /assignments/{id}     → Update an assignment and its milestones
+- PUT /assignments/{id}     → Update an assignment; milestones are diffed, not rewritten
+- PATCH /assignments/{id}   → Apply JSON Patch operations to the assignment tree
 - DELETE /assignments/{id}  → Delete an assignment and its milestones
 
+Every write also rebuilds the assignment's rows in the timeline agenda index
+and bumps the user's data version. GET responses carry an ETag built from that
+version and are answered from a per-user response cache, or with 304, until
+the next write (see ``backend.services.response_cache``).
+
 All routes should:
 - Call the LLM service to split assignment descriptions into milestones
 - Return structured JSON responses containing assignment and milestone data
 """
 
-from flask import Blueprint, jsonify, request
-from flask_login import current_user, login_required
+import base64
+import json
+from datetime import date, datetime
 
-from backend.database.models import Assignment, Milestone, db
-from backend.services.llm_splitter import split_assignment
+from flask import Blueprint, current_app, jsonify, request
+from flask_login import current_user, login_required
+from sqlalchemy import delete, false, insert, select, true, tuple_, update
+
+from backend.api.serializers import (
+    ASSIGNMENT_FIELDS,
+    assignment_serializer,
+    json_response,
+    serialize_assignment,
+)
+from backend.database.dates import parse_date, parse_datetime
+from backend.database.models import (
+    Assignment,
+    GenerationJob,
+    Milestone,
+    Subtask,
+    db,
+)
+from backend.services.agenda import refresh_assignments
+from backend.services.assignment_patch import PatchError, apply_patch
+from backend.services.generation_jobs import (
+    ASYNC_GENERATION,
+    create_job,
+    default_milestones,
+    fallback_milestones,
+    milestones_from_split,
+)
+from backend.services.llm_splitter import split_assignments
+from backend.services.local_planner import (
+    generate_milestones,
+    plan_assignment,
+    prefers_local,
+)
+from backend.services.ordering import reorder_keys
+from backend.services.response_cache import CachedResponse, bump_data_version
 
 assignments_bp = Blueprint("assignments", __name__)
 
 
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SIZE = 100
+
+
+def _versioned(response, assignment, user_version):
+    """Attach ``"<assignment version>-<user data version>"`` as the ETag.
+
+    The first part is what If-Match checks; the whole tag is what
+    If-None-Match on ``GET /assignments/{id}`` compares.
+    """
+    response.headers["ETag"] = f'"{assignment.version}-{user_version}"'
+    return response
+
+
+def _if_match_version():
+    """Return the assignment version sent in If-Match, or None if absent.
+
+    Raises:
+        ValueError: If the header is not a version ETag
+    """
+    header = request.headers.get("If-Match")
+    if header is None or header.strip() == "*":
+        return None
+    tag = header.strip().removeprefix("W/").strip('"').split("-", 1)[0]
+    if not tag.isdigit():
+        raise ValueError("If-Match must be an assignment version")
+    return int(tag)
+
+
+def _bump_version(assignment, expected):
+    """Increment the assignment version if it still equals ``expected``.
+
+    The conditional UPDATE is the optimistic lock: when another request
+    committed a change since ``expected`` was read, no row matches.
+
+    Returns:
+        bool: Whether the version was bumped
+    """
+    result = db.session.execute(
+        update(Assignment)
+        .where(
+            Assignment.assignment_id == assignment.assignment_id,
+            Assignment.version == expected,
+        )
+        .values(version=Assignment.version + 1)
+    )
+    return result.rowcount == 1
+
+
+def _cacheable(response, etag):
+    response.headers["ETag"] = f'"{etag}"'
+    # Browsers keep the body but revalidate it with If-None-Match every time
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _not_modified(etag):
+    """Return a 304 response if the request's If-None-Match lists ``etag``."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return _cacheable(current_app.response_class(status=304), etag)
+
+
+def _cached_read(user_version):
+    """Answer this GET from the response cache; None on a miss."""
+    entry = current_app.extensions["response_cache"].get(
+        current_user.user_id, request.full_path, user_version
+    )
+    if entry is None:
+        return None
+    not_modified = _not_modified(entry.etag)
+    if not_modified is not None:
+        return not_modified
+    response = current_app.response_class(
+        entry.body, mimetype="application/json", headers=entry.headers
+    )
+    return _cacheable(response, entry.etag)
+
+
+def _store_read(response, user_version, etag):
+    """Put a freshly built GET response in the response cache and tag it."""
+    headers = {
+        name: response.headers[name]
+        for name in ("X-Next-Cursor",)
+        if name in response.headers
+    }
+    current_app.extensions["response_cache"].set(
+        current_user.user_id,
+        request.full_path,
+        CachedResponse(user_version, etag, response.get_data(), headers),
+    )
+    return _cacheable(response, etag)
+
+
+def _encode_cursor(deadline, created_at, assignment_id):
+    """Encode the keyset position of an assignment as an opaque cursor."""
+    position = [deadline.isoformat(), created_at.isoformat(), assignment_id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """Decode a cursor produced by ``_encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        deadline, created_at, assignment_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        return (
+            date.fromisoformat(deadline),
+            datetime.fromisoformat(created_at),
+            int(assignment_id),
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _parse_list_params(args):
+    """Parse ``limit``, ``cursor`` and ``fields`` query parameters.
+
+    Returns:
+        tuple: (limit or None, decoded cursor or None, tuple of fields)
+
+    Raises:
+        ValueError: If any parameter is invalid
+    """
+    limit = args.get("limit")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    cursor = args.get("cursor")
+    if cursor:
+        cursor = _decode_cursor(cursor)
+        limit = limit or MAX_PAGE_SIZE
+
+    fields = ASSIGNMENT_FIELDS
+    if args.get("fields"):
+        fields = tuple(f.strip() for f in args["fields"].split(",") if f.strip())
+        unknown = set(fields) - set(ASSIGNMENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        if "id" not in fields:
+            fields = ("id",) + fields
+
+    return limit, cursor or None, fields
+
+
+def _list_assignments(archived):
+    """List the current user's assignments, optionally one page at a time.
+
+    Assignments are ordered by (deadline, created_at, id). When ``limit`` or
+    ``cursor`` is given, the page is found with a keyset condition on that
+    tuple and the cursor for the next page is returned in the
+    ``X-Next-Cursor`` header. Without them the whole list is returned, as
+    before.
+
+    Only the columns named in ``fields`` are selected, as plain rows, and
+    milestones come from one ``IN`` query, so a page costs two queries, or
+    just one when ``subtasks`` is left out. Neither runs when the page is in
+    the response cache or the client's ETag is still current.
+    """
+    try:
+        limit, cursor, fields = _parse_list_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    user_version = current_user.data_version
+    cached = _cached_read(user_version)
+    if cached is not None:
+        return cached
+    etag = f"{current_user.user_id}-{user_version}"
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    serializer = assignment_serializer(fields)
+    keyset = (Assignment.deadline, Assignment.created_at, Assignment.assignment_id)
+    # The keyset columns go last so every row ends with its cursor position.
+    # A literal true/false lets the planner use the partial index on active rows
+    query = (
+        select(*serializer.columns, *keyset)
+        .where(
+            Assignment.user_id == current_user.user_id,
+            Assignment.archived == (true() if archived else false()),
+        )
+        .order_by(*keyset)
+    )
+    if cursor:
+        query = query.where(tuple_(*keyset) > tuple_(*cursor))
+    if limit:
+        # Fetch one extra row to learn whether another page exists
+        query = query.limit(limit + 1)
+
+    rows = db.session.execute(query).all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(*rows[-1][-3:])
+
+    response = json_response(serializer.rows(rows))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return _store_read(response, user_version, etag)
+
+
 @assignments_bp.route("/assignments", methods=["GET"])
 @login_required
 def get_assignments():
-    """Get all non-archived assignments for the current user."""
-    assignments = Assignment.query.filter_by(user_id=current_user.id, archived=False).all()
-    
-    result = []
-    for assignment in assignments:
-        milestones = Milestone.query.filter_by(assignment_id=assignment.id).order_by(Milestone.order).all()
-        result.append({
-            "id": assignment.id,
-            "title": assignment.title,
-            "description": assignment.description,
-            "deadline": assignment.deadline,
-            "progress": assignment.progress,
-            "createdAt": assignment.created_at,
-            "archived": assignment.archived,
-            "subtasks": [{
-                "id": m.id,
-                "text": m.text,
-                "completed": m.completed
-            } for m in milestones]
-        })
-    
-    return jsonify(result)
+    """Get non-archived assignments for the current user.
+
+    Query params: ``limit``, ``cursor`` and ``fields`` (see ``_list_assignments``).
+    """
+    return _list_assignments(archived=False)
 
 
 @assignments_bp.route("/assignments/<int:assignment_id>", methods=["GET"])
 @login_required
 def get_assignment(assignment_id):
     """Get a specific assignment with its milestones."""
-    assignment = Assignment.query.filter_by(
-        assignment_id=assignment_id, user_id=current_user.user_id
+    user_version = current_user.data_version
+    cached = _cached_read(user_version)
+    if cached is not None:
+        return cached
+
+    serializer = assignment_serializer()
+    row = db.session.execute(
+        select(*serializer.columns).where(
+            Assignment.assignment_id == assignment_id,
+            Assignment.user_id == current_user.user_id,
+        )
     ).first()
 
-    if not assignment:
+    if not row:
         return jsonify({"error": "Assignment not found"}), 404
-    
-    milestones = Milestone.query.filter_by(assignment_id=assignment.id).order_by(Milestone.order).all()
-    
-    return jsonify({
-        "id": assignment.id,
-        "title": assignment.title,
-        "description": assignment.description,
-        "deadline": assignment.deadline,
-        "progress": assignment.progress,
-        "createdAt": assignment.created_at,
-        "archived": assignment.archived,
-        "subtasks": [{
-            "id": m.id,
-            "text": m.text,
-            "completed": m.completed
-        } for m in milestones]
-    })
+
+    # Milestones are only read once we know the client's copy is stale
+    etag = f"{row.version}-{user_version}"
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    [body] = serializer.rows([row])
+    return _store_read(json_response(body), user_version, etag)
 
 
 @assignments_bp.route("/assignments", methods=["POST"])
@@ -92,10 +331,17 @@ def create_assignment():
     if not title or not deadline:
         return jsonify({"error": "Title and deadline are required"}), 400
 
-    # Create assignment
-    from datetime import datetime
+    try:
+        deadline = parse_date(deadline)
+        created_at = (
+            parse_datetime(data["createdAt"])
+            if data.get("createdAt")
+            else datetime.utcnow()
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    created_at = data.get("createdAt") or datetime.now().isoformat()
+    # Create assignment
 
     assignment = Assignment(
         user_id=current_user.user_id,
@@ -124,45 +370,41 @@ def create_assignment():
             flush=True,
         )
         for idx, subtask in enumerate(subtasks_data):
+            text = subtask.get("text", "")
             milestone = Milestone(
                 assignment_id=assignment.assignment_id,
-                text=subtask.get("text", ""),
+                title=text[:500],
+                text=text,
                 completed=subtask.get("completed", False),
                 order=idx,
             )
             db.session.add(milestone)
+    elif description and description.strip() and data.get("async", ASYNC_GENERATION):
+        # Commit now and let a background worker call the LLM
+        job = create_job(assignment)
+        refresh_assignments([assignment.assignment_id])
+        bump_data_version(current_user.user_id)
+        db.session.commit()
+        current_app.extensions["generation_jobs"].submit(job.job_id)
+        print(f"[API] Queued milestone generation job {job.job_id}", flush=True)
+
+        body = serialize_assignment(assignment)
+        body["jobId"] = job.job_id
+        return json_response(body), 202
     elif description and description.strip():
         # Generate via LLM
         print(
             f"[API] No subtasks provided, generating via LLM for: {title}", flush=True
         )
         try:
-            llm_milestones = split_assignment(description, deadline)
+            llm_milestones = generate_milestones(description, deadline)
             print(
-                f"[API] Successfully generated {len(llm_milestones)} milestones via LLM",
+                f"[API] Successfully generated {len(llm_milestones)} milestones",
                 flush=True,
             )
-
-            # split_assignment returns a list of milestone dicts with structured data
-            for idx, milestone_data in enumerate(llm_milestones):
-                # Use title as the main text, with description as additional context
-                title = milestone_data.get("title", f"Milestone {idx + 1}")
-                description_text = milestone_data.get("description", "")
-
-                # Combine title and description for the milestone text
-                milestone_text = f"{title}"
-                if description_text:
-                    milestone_text += (
-                        f": {description_text[:200]}"  # Truncate long descriptions
-                    )
-
-                milestone = Milestone(
-                    assignment_id=assignment.assignment_id,
-                    text=milestone_text,
-                    completed=False,
-                    order=idx,
-                )
-                db.session.add(milestone)
+            db.session.add_all(
+                milestones_from_split(assignment.assignment_id, llm_milestones)
+            )
         except Exception as e:
             # If LLM fails, use defaults
             print(f"[API] ❌ LLM FAILED: {e}", flush=True)
@@ -170,41 +412,202 @@ def create_assignment():
             import traceback
 
             traceback.print_exc()
-            default_milestones = [
-                "Research and gather information",
-                "Create initial outline or plan",
-                "Draft first version",
-                "Review and revise content",
-                "Final proofreading and editing",
-                "Submit or present final work",
-            ]
-            for idx, text in enumerate(default_milestones):
-                milestone = Milestone(
-                    assignment_id=assignment.assignment_id,
-                    text=text,
-                    completed=False,
-                    order=idx,
-                )
-                db.session.add(milestone)
+            db.session.add_all(default_milestones(assignment.assignment_id))
 
+    refresh_assignments([assignment.assignment_id])
+    bump_data_version(current_user.user_id)
     db.session.commit()
 
     # Return created assignment
-    milestones = Milestone.query.filter_by(assignment_id=assignment.id).order_by(Milestone.order).all()
-    return jsonify({
-        "id": assignment.id,
-        "title": assignment.title,
-        "description": assignment.description,
-        "deadline": assignment.deadline,
-        "progress": assignment.progress,
-        "createdAt": assignment.created_at,
-        "archived": assignment.archived,
-        "subtasks": [{
-            "id": m.id,
-            "text": m.text,
-            "completed": m.completed
-        } for m in milestones]
-    }), 201
+    return json_response(serialize_assignment(assignment)), 201
+
+
+def _subtasks_error(subtasks):
+    """Return an error message for malformed submitted subtasks, or None."""
+    if not isinstance(subtasks, list):
+        return "'subtasks' must be a list of objects"
+    for subtask in subtasks:
+        if not isinstance(subtask, dict):
+            return "'subtasks' must be a list of objects"
+        if not isinstance(subtask.get("text", ""), str):
+            return "Subtask 'text' must be a string"
+        if not isinstance(subtask.get("completed", False), bool):
+            return "Subtask 'completed' must be a boolean"
+    return None
+
+
+@assignments_bp.route("/assignments/batch", methods=["POST"])
+@login_required
+def create_assignments_batch():
+    """Create many assignments at once (e.g. a whole syllabus import).
+
+    Body: ``{"assignments": [{"title", "description", "deadline",
+    "subtasks"?, "createdAt"?}, ...]}``. LLM splits for items without
+    subtasks run concurrently, with identical descriptions split only once.
+    LOCAL_PLANNER_MODE applies as for single creates: short descriptions may
+    be planned locally, and failed splits get the local plan. Everything
+    valid is inserted in a single transaction.
+
+    Returns ``results`` with one entry per input item, in order.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("assignments")
+
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "'assignments' must be a non-empty list"}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return (
+            jsonify({"error": f"At most {MAX_BATCH_SIZE} assignments per batch"}),
+            400,
+        )
+
+    now = datetime.utcnow()
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        if (
+            not isinstance(item, dict)
+            or not item.get("title")
+            or not item.get("deadline")
+        ):
+            results[index] = {
+                "index": index,
+                "ok": False,
+                "error": "Title and deadline are required",
+            }
+            continue
+        try:
+            deadline = parse_date(item["deadline"])
+            created_at = (
+                parse_datetime(item["createdAt"]) if item.get("createdAt") else now
+            )
+        except ValueError as e:
+            results[index] = {"index": index, "ok": False, "error": str(e)}
+            continue
+        error = _subtasks_error(item.get("subtasks") or [])
+        if error:
+            results[index] = {"index": index, "ok": False, "error": error}
+            continue
+        valid.append((index, {**item, "deadline": deadline, "createdAt": created_at}))
+
+    # Fan out LLM calls for items that did not bring their own subtasks
+    to_generate = [
+        (index, item)
+        for index, item in valid
+        if not item.get("subtasks") and (item.get("description") or "").strip()
+    ]
+    splits = {}
+    to_split = []
+    for index, item in to_generate:
+        if not prefers_local(item["description"]):
+            to_split.append((index, item))
+            continue
+        try:
+            splits[index] = plan_assignment(item["description"], item["deadline"])
+        except ValueError as e:
+            splits[index] = e
+    print(
+        f"[API] Batch create: {len(items)} items, {len(to_split)} need the LLM",
+        flush=True,
+    )
+    splits.update(
+        zip(
+            [index for index, _ in to_split],
+            split_assignments(
+                [(item["description"], item["deadline"]) for _, item in to_split]
+            ),
+        )
+    )
+
+    created = []
+    for index, item in valid:
+        assignment = Assignment(
+            user_id=current_user.user_id,
+            title=item["title"],
+            description=item.get("description", ""),
+            deadline=item["deadline"],
+            progress=0,
+            created_at=item["createdAt"],
+        )
+        warning = None
+        if item.get("subtasks"):
+            assignment.milestones = [
+                Milestone(
+                    title=subtask.get("text", "")[:500],
+                    text=subtask.get("text", ""),
+                    completed=subtask.get("completed", False),
+                    order=idx,
+                )
+                for idx, subtask in enumerate(item["subtasks"])
+            ]
+        elif isinstance(splits.get(index), Exception):
+            print(f"[API] ❌ LLM FAILED for item {index}: {splits[index]}", flush=True)
+            assignment.milestones = fallback_milestones(
+                None, item["description"], item["deadline"]
+            )
+            warning = "LLM generation failed; fallback milestones used"
+        elif index in splits:
+            assignment.milestones = milestones_from_split(None, splits[index])
+        created.append((index, assignment, warning))
+
+    # One flush inserts every assignment, then every milestone, in batches
+    db.session.add_all([assignment for _, assignment, _ in created])
+    db.session.flush()
+
+    for index, assignment, warning in created:
+        results[index] = {
+            "index": index,
+            "ok": True,
+            "assignment": serialize_assignment(assignment),
+        }
+        if warning:
+            results[index]["warning"] = warning
+
+    refresh_assignments([assignment.assignment_id for _, assignment, _ in created])
+    if created:
+        bump_data_version(current_user.user_id)
+    db.session.commit()
+
+    return (
+        json_response(
+            {
+                "results": results,
+                "created": len(created),
+                "failed": len(items) - len(created),
+            }
+        ),
+        201 if created else 400,
+    )
+
+
+@assignments_bp.route("/assignments/<int:assignment_id>/generation", methods=["GET"])
+@login_required
+def get_generation_status(assignment_id):
+    """Report the state of the latest milestone generation job."""
+    assignment = Assignment.query.filter_by(
+        assignment_id=assignment_id, user_id=current_user.user_id
+    ).first()
+
+    if not assignment:
+        return jsonify({"error": "Assignment not found"}), 404
+
+    job = (
+        GenerationJob.query.filter_by(assignment_id=assignment.assignment_id)
+        .order_by(GenerationJob.job_id.desc())
+        .first()
+    )
+    if not job:
+        return jsonify({"error": "No generation job for this assignment"}), 404
+
+    return jsonify(
+        {
+            "jobId": job.job_id,
+            "status": job.status,
+            "attempts": job.attempts,
+            "error": job.last_error,
+            "assignmentStatus": assignment.status,
+        }
+    )
 
 
 @assignments_bp.route("/assignments/<int:assignment_id>", methods=["PUT"])
@@ -218,6 +621,15 @@ def update_assignment(assignment_id):
     if not assignment:
         return jsonify({"error": "Assignment not found"}), 404
 
+    try:
+        expected = _if_match_version()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if expected is None:
+        expected = assignment.version
+    elif expected != assignment.version:
+        return jsonify({"error": "Assignment was modified by another request"}), 412
+
     data = request.get_json()
 
     # Update assignment fields
@@ -226,56 +638,194 @@ def update_assignment(assignment_id):
     if "description" in data:
         assignment.description = data["description"]
     if "deadline" in data:
-        assignment.deadline = data["deadline"]
+        try:
+            assignment.deadline = parse_date(data["deadline"])
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 400
     if "progress" in data:
         assignment.progress = data["progress"]
 
     # Update milestones if provided
+    changes = None
     if "subtasks" in data:
-        # Delete existing milestones
-        Milestone.query.filter_by(assignment_id=assignment.assignment_id).delete()
+        if not isinstance(data["subtasks"], list) or not all(
+            isinstance(subtask, dict) for subtask in data["subtasks"]
+        ):
+            return jsonify({"error": "'subtasks' must be a list of objects"}), 400
+        changes = _apply_milestone_diff(assignment.assignment_id, data["subtasks"])
+
+    refresh_assignments([assignment.assignment_id])
+    if not _bump_version(assignment, expected):
+        db.session.rollback()
+        return jsonify({"error": "Assignment was modified by another request"}), 412
+    user_version = bump_data_version(current_user.user_id)
+    db.session.commit()
 
-        # Add new milestones
-        for idx, subtask in enumerate(data["subtasks"]):
-            milestone = Milestone(
-                assignment_id=assignment.assignment_id,
-                text=subtask.get("text", ""),
-                completed=subtask.get("completed", False),
-                order=idx,
-            )
-            db.session.add(milestone)
+    # Return updated assignment
+    body = serialize_assignment(assignment)
+    if changes is not None:
+        body["changes"] = changes
+    return _versioned(json_response(body), assignment, user_version)
 
+
+@assignments_bp.route("/assignments/<int:assignment_id>", methods=["PATCH"])
+@login_required
+def patch_assignment(assignment_id):
+    """Apply RFC 6902 JSON Patch operations to an assignment tree.
+
+    The body is a list of operations (see ``assignment_patch`` for the
+    supported paths). All operations are applied in one transaction: if any
+    fails, nothing is written. Send the version from the last response's
+    ETag in If-Match to have the patch rejected with 412 when someone else
+    changed the assignment in the meantime.
+    """
+    assignment = Assignment.query.filter_by(
+        assignment_id=assignment_id, user_id=current_user.user_id
+    ).first()
+
+    if not assignment:
+        return jsonify({"error": "Assignment not found"}), 404
+
+    try:
+        expected = _if_match_version()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if expected is None:
+        expected = assignment.version
+    elif expected != assignment.version:
+        return jsonify({"error": "Assignment was modified by another request"}), 412
+
+    # RFC 6902 clients send application/json-patch+json
+    operations = request.get_json(force=True, silent=True)
+    try:
+        apply_patch(assignment, operations)
+    except PatchError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), e.status
+
+    refresh_assignments([assignment.assignment_id])
+    if not _bump_version(assignment, expected):
+        db.session.rollback()
+        return jsonify({"error": "Assignment was modified by another request"}), 412
+    user_version = bump_data_version(current_user.user_id)
     db.session.commit()
 
-    # Return updated assignment
-    milestones = Milestone.query.filter_by(assignment_id=assignment.id).order_by(Milestone.order).all()
-    return jsonify({
-        "id": assignment.id,
-        "title": assignment.title,
-        "description": assignment.description,
-        "deadline": assignment.deadline,
-        "progress": assignment.progress,
-        "createdAt": assignment.created_at,
-        "archived": assignment.archived,
-        "subtasks": [{
-            "id": m.id,
-            "text": m.text,
-            "completed": m.completed
-        } for m in milestones]
-    })
+    return _versioned(
+        json_response(serialize_assignment(assignment)), assignment, user_version
+    )
+
+
+def _apply_milestone_diff(assignment_id, submitted):
+    """Bring an assignment's milestones in line with a submitted list.
+
+    Submitted items are matched to existing rows by ``id``; items without a
+    known id are new. Only the differences are written, with one bulk
+    statement per kind of change, so untouched rows keep their primary keys
+    and ``google_task_id`` links. Ordering keys come from ``reorder_keys``,
+    so only moved and new milestones get a new ``order``.
+
+    Returns:
+        dict: Milestone ids that were ``inserted``, ``updated`` (text or
+        completion changed), ``reordered`` (only position changed) and
+        ``deleted``
+    """
+    existing = {
+        row.milestone_id: row
+        for row in db.session.execute(
+            select(
+                Milestone.milestone_id,
+                Milestone.text,
+                Milestone.completed,
+                Milestone.order,
+            ).where(Milestone.assignment_id == assignment_id)
+        )
+    }
+
+    # Pair each submitted item with its row; new items get a placeholder key
+    matched, current = [], {}
+    for idx, subtask in enumerate(submitted):
+        row = existing.get(subtask.get("id"))
+        if row is None or row.milestone_id in current:
+            row, key = None, ("new", idx)
+        else:
+            key = row.milestone_id
+        current[key] = row.order if row else None
+        matched.append((key, row, subtask))
+    orders = reorder_keys(current, [key for key, _, _ in matched])
+
+    inserts, updates, updated, reordered = [], [], [], []
+    kept = set()
+    for key, row, subtask in matched:
+        text = subtask.get("text", "")
+        completed = bool(subtask.get("completed", False))
+        if row is None:
+            inserts.append(
+                {
+                    "assignment_id": assignment_id,
+                    "title": text[:500],
+                    "text": text,
+                    "completed": completed,
+                    "order": orders[key],
+                }
+            )
+            continue
+
+        kept.add(row.milestone_id)
+        values = {}
+        if row.text != text:
+            values.update(text=text, title=text[:500])
+        if bool(row.completed) != completed:
+            values["completed"] = completed
+        if values:
+            updated.append(row.milestone_id)
+        elif key in orders:
+            reordered.append(row.milestone_id)
+        if key in orders:
+            values["order"] = orders[key]
+        if values:
+            updates.append({"milestone_id": row.milestone_id, **values})
+
+    deleted = sorted(set(existing) - kept)
+    if deleted:
+        db.session.execute(delete(Subtask).where(Subtask.milestone_id.in_(deleted)))
+        db.session.execute(delete(Milestone).where(Milestone.milestone_id.in_(deleted)))
+    if updates:
+        db.session.execute(update(Milestone), updates)
+    inserted = []
+    if inserts:
+        inserted = list(
+            db.session.scalars(
+                insert(Milestone).returning(
+                    Milestone.milestone_id, sort_by_parameter_order=True
+                ),
+                inserts,
+            )
+        )
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "reordered": reordered,
+        "deleted": deleted,
+    }
 
 
 @assignments_bp.route("/assignments/<int:assignment_id>", methods=["DELETE"])
 @login_required
 def delete_assignment(assignment_id):
     """Archive an assignment (soft delete)."""
-    assignment = Assignment.query.filter_by(id=assignment_id, user_id=current_user.id).first()
+    assignment = Assignment.query.filter_by(
+        assignment_id=assignment_id, user_id=current_user.user_id
+    ).first()
     
     if not assignment:
         return jsonify({"error": "Assignment not found"}), 404
     
     # Archive the assignment instead of deleting
     assignment.archived = True
+    refresh_assignments([assignment.assignment_id])
+    bump_data_version(current_user.user_id)
     db.session.commit()
     
     return jsonify({"message": "Assignment archived successfully"}), 200
@@ -284,35 +834,20 @@ def delete_assignment(assignment_id):
 @assignments_bp.route("/assignments/archived", methods=["GET"])
 @login_required
 def get_archived_assignments():
-    """Get all archived assignments for the current user."""
-    assignments = Assignment.query.filter_by(user_id=current_user.id, archived=True).all()
-    
-    result = []
-    for assignment in assignments:
-        milestones = Milestone.query.filter_by(assignment_id=assignment.id).order_by(Milestone.order).all()
-        result.append({
-            "id": assignment.id,
-            "title": assignment.title,
-            "description": assignment.description,
-            "deadline": assignment.deadline,
-            "progress": assignment.progress,
-            "createdAt": assignment.created_at,
-            "archived": assignment.archived,
-            "subtasks": [{
-                "id": m.id,
-                "text": m.text,
-                "completed": m.completed
-            } for m in milestones]
-        })
-    
-    return jsonify(result)
+    """Get archived assignments for the current user.
+
+    Query params: ``limit``, ``cursor`` and ``fields`` (see ``_list_assignments``).
+    """
+    return _list_assignments(archived=True)
 
 
 @assignments_bp.route("/assignments/<int:assignment_id>/archive", methods=["PATCH"])
 @login_required
 def archive_assignment(assignment_id):
     """Archive or unarchive an assignment."""
-    assignment = Assignment.query.filter_by(id=assignment_id, user_id=current_user.id).first()
+    assignment = Assignment.query.filter_by(
+        assignment_id=assignment_id, user_id=current_user.user_id
+    ).first()
     
     if not assignment:
         return jsonify({"error": "Assignment not found"}), 404
@@ -321,6 +856,8 @@ def archive_assignment(assignment_id):
     archived = data.get("archived", True)
     
     assignment.archived = archived
+    refresh_assignments([assignment.assignment_id])
+    bump_data_version(current_user.user_id)
     db.session.commit()
     
     return jsonify({"message": f"Assignment {'archived' if archived else 'unarchived'} successfully"}), 200
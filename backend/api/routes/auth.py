@@ -1,17 +1,31 @@
 from flask import Blueprint, jsonify, request
-from flask_bcrypt import Bcrypt
 from flask_login import current_user, login_user, logout_user
+from sqlalchemy.exc import IntegrityError
 
 from backend.database.models import User, db
+from backend.services.password_hashing import HasherBusy, hasher
+from backend.services.user_cache import invalidate_user
+from backend.services.usernames import allocate_username, resync_counter
 
 auth_bp = Blueprint("auth", __name__)
-bcrypt = Bcrypt()
+
+# Inserts retried after losing a username or email race
+_SIGNUP_ATTEMPTS = 3
 
 
 @auth_bp.record_once
 def init_bcrypt(setup_state):
     app = setup_state.app
-    bcrypt.init_app(app)
+    hasher.init_app(app)
+
+
+@auth_bp.errorhandler(HasherBusy)
+def hasher_busy(e):
+    return (
+        jsonify({"error": "Too many sign-in requests, please try again shortly"}),
+        503,
+        {"Retry-After": str(e.retry_after)},
+    )
 
 
 @auth_bp.route("/signup", methods=["POST"])
@@ -27,20 +41,25 @@ def signup():
     if User.query.filter_by(email=email).first():
         return jsonify({"error": "Email already exists"}), 400
 
-    # Generate username from email (part before @)
-    username = email.split("@")[0]
-    # Ensure username is unique
-    base_username = username
-    counter = 1
-    while User.query.filter_by(username=username).first():
-        username = f"{base_username}{counter}"
-        counter += 1
-
-    hashed_pw = bcrypt.generate_password_hash(password).decode("utf-8")
-    new_user = User(username=username, email=email, name=name, password=hashed_pw)
-    db.session.add(new_user)
-    db.session.commit()
-
+    hashed_pw = hasher.hash(password)
+
+    # Username from the email (part before @), numbered when taken
+    for _ in range(_SIGNUP_ATTEMPTS):
+        username = allocate_username(email)
+        new_user = User(username=username, email=email, name=name, password=hashed_pw)
+        db.session.add(new_user)
+        try:
+            db.session.commit()
+            break
+        except IntegrityError:
+            db.session.rollback()
+            if User.query.filter_by(email=email).first():
+                return jsonify({"error": "Email already exists"}), 400
+            resync_counter(email)
+    else:
+        return jsonify({"error": "Could not create the account, try again"}), 503
+
+    invalidate_user(new_user.user_id)
     login_user(new_user)
     return (
         jsonify(
@@ -68,7 +87,16 @@ def login():
         return jsonify({"error": "Email and password are required"}), 400
 
     user = User.query.filter_by(email=email).first()
-    if user and bcrypt.check_password_hash(user.password, password):
+    if user and hasher.check(user.password, password):
+        if hasher.needs_rehash(user.password):
+            # The bcrypt cost changed since this hash was made; upgrade it
+            # now that the plain password is at hand.
+            try:
+                user.password = hasher.hash(password)
+                db.session.commit()
+            except HasherBusy:
+                pass  # try again on the next login
+        invalidate_user(user.user_id)
         login_user(user)
         return jsonify(
             {
@@ -86,6 +114,8 @@ def login():
 
 @auth_bp.route("/logout", methods=["POST"])
 def logout():
+    if current_user.is_authenticated:
+        invalidate_user(current_user.user_id)
     logout_user()
     return jsonify({"message": "Logged out successfully!"})
 
@@ -1,87 +1,258 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy import case, select, update
 from backend.database.models import db, Milestone, Assignment
+from backend.services.agenda import refresh_assignments
+from backend.services.ordering import reorder_keys
+from backend.services.progress import recompute_progress
+from backend.services.response_cache import bump_data_version
 
 milestones_bp = Blueprint("milestones", __name__)
 
+# Largest number of changes accepted by one PATCH /milestones/bulk
+MAX_BULK_CHANGES = 500
 
-@milestones_bp.route("/milestones/<int:milestone_id>", methods=["PATCH"])
+
+def _owned_milestones(milestone_ids):
+    """Return {milestone_id: assignment_id} for the current user's milestones.
+
+    One query joining milestone to assignment; ids that do not exist or
+    belong to another user are simply missing from the result.
+    """
+    rows = db.session.execute(
+        select(Milestone.milestone_id, Milestone.assignment_id)
+        .join(Assignment, Assignment.assignment_id == Milestone.assignment_id)
+        .where(
+            Milestone.milestone_id.in_(milestone_ids),
+            Assignment.user_id == current_user.user_id,
+        )
+    )
+    return dict(rows.all())
+
+
+def _apply_changes(changes):
+    """Write ``changes`` ({id, completed?, text?} dicts) in one UPDATE ... CASE.
+
+    ``title`` follows ``text`` (first 500 characters), as in PUT and PATCH
+    /assignments.
+    """
+    values = {}
+    for field, column in (("completed", Milestone.completed), ("text", Milestone.text)):
+        updates = {c["id"]: c[field] for c in changes if field in c}
+        if updates:
+            values[field] = case(updates, value=Milestone.milestone_id, else_=column)
+    titles = {c["id"]: c["text"][:500] for c in changes if "text" in c}
+    if titles:
+        values["title"] = case(
+            titles, value=Milestone.milestone_id, else_=Milestone.title
+        )
+    if values:
+        db.session.execute(
+            update(Milestone)
+            .where(Milestone.milestone_id.in_([c["id"] for c in changes]))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _validate_changes(changes):
+    """Return an error message for a malformed bulk body, or None."""
+    if not isinstance(changes, list) or not changes:
+        return "'milestones' must be a non-empty list"
+    if len(changes) > MAX_BULK_CHANGES:
+        return f"At most {MAX_BULK_CHANGES} changes per request"
+    seen = set()
+    for change in changes:
+        milestone_id = change.get("id") if isinstance(change, dict) else None
+        if not isinstance(milestone_id, int) or isinstance(milestone_id, bool):
+            return "Each change needs an integer 'id'"
+        if change["id"] in seen:
+            return f"Milestone {change['id']} is listed twice"
+        seen.add(change["id"])
+        if "completed" in change and not isinstance(change["completed"], bool):
+            return "'completed' must be a boolean"
+        if "text" in change and not isinstance(change["text"], str):
+            return "'text' must be a string"
+    return None
+
+
+def _milestone_rows(milestone_ids):
+    return db.session.execute(
+        select(
+            Milestone.milestone_id,
+            Milestone.assignment_id,
+            Milestone.text,
+            Milestone.completed,
+            Milestone.order,
+        )
+        .where(Milestone.milestone_id.in_(milestone_ids))
+        .order_by(Milestone.milestone_id)
+    ).all()
+
+
+def _milestone_json(row):
+    return {
+        "id": row.milestone_id,
+        "assignment_id": row.assignment_id,
+        "text": row.text,
+        "completed": row.completed,
+        "order": row.order,
+    }
+
+
+@milestones_bp.route("/milestones/bulk", methods=["PATCH"])
 @login_required
-def update_milestone(milestone_id):
-    """Update a single milestone (text or completed)."""
-    milestone = Milestone.query.get(milestone_id)
+def bulk_update_milestones():
+    """Apply many milestone changes at once.
 
-    if not milestone:
-        return jsonify({"error": "Milestone not found"}), 404
+    The body is ``{"milestones": [{"id", "completed"?, "text"?}, ...]}`` (or
+    the bare list). Every id must belong to the current user, checked with
+    one joined query; otherwise nothing is written and the unknown ids are
+    returned with 404. Changes go out in a single ``UPDATE ... CASE`` and
+    the progress of every affected assignment is recomputed in the same
+    transaction.
+    """
+    data = request.get_json(silent=True)
+    changes = data.get("milestones") if isinstance(data, dict) else data
 
-    #Security check — ensure milestone belongs to current user
-    assignment = Assignment.query.get(milestone.assignment_id)
-    if assignment.user_id != current_user.id:
-        return jsonify({"error": "Not authorized"}), 403
+    error = _validate_changes(changes)
+    if error:
+        return jsonify({"error": error}), 400
 
-    data = request.get_json()
-    if "text" in data:
-        milestone.text = data["text"]
-    if "completed" in data:
-        milestone.completed = data["completed"]
+    milestone_ids = [c["id"] for c in changes]
+    owned = _owned_milestones(milestone_ids)
+    missing = [i for i in milestone_ids if i not in owned]
+    if missing:
+        return jsonify({"error": "Milestones not found", "ids": missing}), 404
 
+    assignment_ids = sorted(set(owned.values()))
+    _apply_changes(changes)
+    progress = recompute_progress(assignment_ids)
+    refresh_assignments(assignment_ids)
+    bump_data_version(current_user.user_id)
     db.session.commit()
 
-    return jsonify({
-        "id": milestone.id,
-        "assignment_id": milestone.assignment_id,
-        "text": milestone.text,
-        "completed": milestone.completed,
-        "order": milestone.order
-    }), 200
+    return (
+        jsonify(
+            {
+                "milestones": [
+                    _milestone_json(row) for row in _milestone_rows(milestone_ids)
+                ],
+                "assignments": [
+                    {"id": assignment_id, "progress": progress.get(assignment_id)}
+                    for assignment_id in assignment_ids
+                ],
+            }
+        ),
+        200,
+    )
 
 
-from flask import Blueprint, request, jsonify
-from flask_login import login_required, current_user
-from backend.database.models import db, Assignment, Milestone
+@milestones_bp.route("/milestones/<int:milestone_id>", methods=["PATCH"])
+@login_required
+def update_milestone(milestone_id):
+    """Update a single milestone (text or completed)."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    change = {"id": milestone_id}
+    change.update((k, data[k]) for k in ("text", "completed") if k in data)
 
-reorder_bp = Blueprint("reorder", __name__)
+    error = _validate_changes([change])
+    if error:
+        return jsonify({"error": error}), 400
 
+    # Security check — ensure milestone belongs to current user
+    assignment_id = _owned_milestones([milestone_id]).get(milestone_id)
+    if assignment_id is None:
+        return jsonify({"error": "Milestone not found"}), 404
 
-@reorder_bp.route("/assignments/<int:assignment_id>/milestones/reorder", methods=["PATCH"])
+    _apply_changes([change])
+    recompute_progress([assignment_id])
+    refresh_assignments([assignment_id])
+    bump_data_version(current_user.user_id)
+    db.session.commit()
+
+    return jsonify(_milestone_json(_milestone_rows([milestone_id])[0])), 200
+
+
+@milestones_bp.route(
+    "/assignments/<int:assignment_id>/milestones/reorder", methods=["PATCH"]
+)
 @login_required
 def reorder_milestones(assignment_id):
-    """Reorder milestones using a list of milestone IDs."""
-    assignment = Assignment.query.filter_by(id=assignment_id, user_id=current_user.id).first()
-    
-    if not assignment:
+    """Reorder milestones using a list of milestone IDs.
+
+    Only milestones that actually moved get a new ``order`` key (see
+    ``backend.services.ordering``), written with one executemany UPDATE.
+    """
+    found = db.session.scalar(
+        select(Assignment.assignment_id).where(
+            Assignment.assignment_id == assignment_id,
+            Assignment.user_id == current_user.user_id,
+        )
+    )
+    if not found:
         return jsonify({"error": "Assignment not found"}), 404
 
-    data = request.get_json()
-    new_order = data.get("order")
+    data = request.get_json(silent=True) or {}
+    new_order = data.get("order") if isinstance(data, dict) else None
 
     if not new_order or not isinstance(new_order, list):
         return jsonify({"error": "Invalid 'order' format"}), 400
 
-    milestones = Milestone.query.filter_by(assignment_id=assignment.id).all()
-    milestone_ids = {m.id for m in milestones}
+    current = dict(
+        db.session.execute(
+            select(Milestone.milestone_id, Milestone.order).where(
+                Milestone.assignment_id == assignment_id
+            )
+        ).all()
+    )
 
-    # Validate: ensure submitted IDs exist in this assignment
-    if set(new_order) != milestone_ids:
+    # Validate: ensure submitted IDs exist in this assignment, once each
+    if len(new_order) != len(current) or set(new_order) != set(current):
         return jsonify({"error": "Order list does not match existing milestones"}), 400
 
-    # Apply new ordering
-    for index, milestone_id in enumerate(new_order):
-        milestone = next(m for m in milestones if m.id == milestone_id)
-        milestone.order = index
+    changes = reorder_keys(current, new_order)
+    if changes:
+        db.session.execute(
+            update(Milestone),
+            [{"milestone_id": i, "order": key} for i, key in changes.items()],
+        )
+        db.session.execute(
+            update(Assignment)
+            .where(Assignment.assignment_id == assignment_id)
+            .values(version=Assignment.version + 1)
+        )
+        bump_data_version(current_user.user_id)
+        db.session.commit()
 
-    db.session.commit()
+    return (
+        jsonify(
+            {
+                "message": "Milestones reordered successfully",
+                "moved": sorted(changes),
+            }
+        ),
+        200,
+    )
 
-    return jsonify({"message": "Milestones reordered successfully"}), 200
 
+import json
 
-from flask import Blueprint, request, jsonify
-from backend.services.llm_splitter import split_assignment
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from backend.services.llm_splitter import split_assignment, stream_split_assignment
 
 llm_bp = Blueprint("llm", __name__)
 
 
+def _sse(event, data):
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @llm_bp.route("/llm/split", methods=["POST"])
+@login_required
 def llm_split():
     """Generate milestones from a description + deadline using the LLM service."""
     data = request.get_json()
@@ -97,8 +268,65 @@ def llm_split():
     except Exception as e:
         print(f"[LLM] Failed to generate milestones: {e}")
 
-        return jsonify({
-            "error": "LLM generation failed. Try again or use manual subtasks."
-        }), 500
+        return (
+            jsonify(
+                {"error": "LLM generation failed. Try again or use manual subtasks."}
+            ),
+            500,
+        )
+
+
+@llm_bp.route("/llm/split/stream", methods=["GET", "POST"])
+@login_required
+def llm_split_stream():
+    """Stream generated milestones over Server-Sent Events.
+
+    Accepts ``description`` and ``deadline`` as JSON (POST) or query params
+    (GET, for ``EventSource``). Emits one ``milestone`` event per milestone as
+    soon as Claude finishes it, then ``done`` (or ``error``).
+    """
+    data = request.get_json(silent=True) or request.args
+    description = data.get("description", "")
+    deadline = data.get("deadline")
+
+    if not description or not deadline:
+        return jsonify({"error": "Description and deadline are required"}), 400
+
+    milestones = stream_split_assignment(description, deadline)
+    try:
+        # Run input validation before the 200 response is committed
+        first = next(milestones, None)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"[LLM] Failed to generate milestones: {e}")
+        return (
+            jsonify(
+                {"error": "LLM generation failed. Try again or use manual subtasks."}
+            ),
+            500,
+        )
 
+    def events():
+        count = 0
+        try:
+            if first is not None:
+                count += 1
+                yield _sse("milestone", first)
+            for milestone in milestones:
+                count += 1
+                yield _sse("milestone", milestone)
+        except Exception as e:
+            print(f"[LLM] Failed to generate milestones: {e}")
+            yield _sse(
+                "error",
+                {"error": "LLM generation failed. Try again or use manual subtasks."},
+            )
+            return
+        yield _sse("done", {"count": count})
 
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,66 @@
+"""
+Timeline API routes.
+
+- GET /timeline?from=&to=   → Everything due in a date range, across all of the
+                               user's active assignments, sorted by date
+
+Served from the ``agenda_item`` index (see ``backend.services.agenda``), so a
+request is one range scan no matter how many assignments the user has.
+"""
+
+from datetime import date, timedelta
+
+from flask import Blueprint, jsonify, request
+from flask_login import current_user, login_required
+
+from backend.database.dates import parse_date
+from backend.services.agenda import MAX_RANGE_DAYS, timeline
+
+timeline_bp = Blueprint("timeline", __name__)
+
+DEFAULT_RANGE_DAYS = 14
+
+
+def _serialize_item(item):
+    return {
+        "type": item.kind,
+        "assignmentId": item.assignment_id,
+        "assignmentTitle": item.assignment_title,
+        "milestoneId": item.milestone_id,
+        "subtaskId": item.subtask_id,
+        "title": item.title,
+        "dueDate": item.due_date.isoformat(),
+        "completed": item.completed,
+    }
+
+
+@timeline_bp.route("/timeline", methods=["GET"])
+@login_required
+def get_timeline():
+    """Return assignments, milestones and subtasks due between two dates.
+
+    Query params:
+    - ``from``: first day, inclusive (default today)
+    - ``to``: last day, inclusive (default ``from`` + 14 days)
+    """
+    try:
+        start = parse_date(request.args["from"]) if "from" in request.args else None
+        end = parse_date(request.args["to"]) if "to" in request.args else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    start = start or date.today()
+    end = end or start + timedelta(days=DEFAULT_RANGE_DAYS)
+    if end < start:
+        return jsonify({"error": "'to' must not be before 'from'"}), 400
+    if (end - start).days > MAX_RANGE_DAYS:
+        return jsonify({"error": f"Range is limited to {MAX_RANGE_DAYS} days"}), 400
+
+    items = timeline(current_user.user_id, start, end)
+    return jsonify(
+        {
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "items": [_serialize_item(item) for item in items],
+        }
+    )
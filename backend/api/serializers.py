@@ -0,0 +1,170 @@
+"""
+JSON serializers for assignment responses.
+
+Reads build responses from plain row tuples (a ``select`` of just the needed
+columns) rather than ORM instances. ``assignment_serializer(fields)`` compiles
+the plan for one ``fields`` projection once (which columns to select, which
+keys they map to, which need converting) and caches it, so serializing a row
+is a ``zip`` plus one isoformat call per date column.
+
+``dumps`` encodes with orjson or msgspec when one is installed and falls back
+to the stdlib ``json`` module; ``json_response`` wraps the bytes in a Flask
+response.
+
+Configuration (environment variables):
+- JSON_BACKEND: "auto" (default: orjson, then msgspec, then stdlib),
+  "orjson", "msgspec" or "stdlib"
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from flask import current_app
+from sqlalchemy import select
+
+from backend.database.models import Assignment, Milestone, db
+
+_JSON_BACKEND = os.getenv("JSON_BACKEND", "auto").lower()
+
+# Milestones are fetched with one IN query per this many assignments
+_IN_CHUNK = 500
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def load_backend(name):
+    """Return ``(name, dumps)`` for a JSON backend.
+
+    ``"auto"`` picks the fastest installed one.
+
+    Raises:
+        RuntimeError: If the requested backend is not installed
+        ValueError: If the name is unknown
+    """
+    if name not in ("auto", "orjson", "msgspec", "stdlib"):
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+
+            return "orjson", orjson.dumps
+        except ImportError:
+            if name == "orjson":
+                raise RuntimeError("JSON_BACKEND=orjson requires the `orjson` package")
+    if name in ("auto", "msgspec"):
+        try:
+            import msgspec
+
+            return "msgspec", msgspec.json.Encoder().encode
+        except ImportError:
+            if name == "msgspec":
+                raise RuntimeError(
+                    "JSON_BACKEND=msgspec requires the `msgspec` package"
+                )
+    return "stdlib", _stdlib_dumps
+
+
+BACKEND, dumps = load_backend(_JSON_BACKEND)
+
+
+def json_response(obj):
+    """Return a Flask response with ``obj`` encoded by the JSON backend."""
+    return current_app.response_class(dumps(obj), mimetype="application/json")
+
+
+def _iso(value):
+    return value.isoformat()
+
+
+# Response key -> (column, converter or None), in response order
+ASSIGNMENT_COLUMNS = {
+    "id": (Assignment.assignment_id, None),
+    "title": (Assignment.title, None),
+    "description": (Assignment.description, None),
+    "deadline": (Assignment.deadline, _iso),
+    "progress": (Assignment.progress, None),
+    "createdAt": (Assignment.created_at, _iso),
+    "archived": (Assignment.archived, None),
+    "status": (Assignment.status, None),
+    "version": (Assignment.version, None),
+}
+ASSIGNMENT_FIELDS = (*ASSIGNMENT_COLUMNS, "subtasks")
+
+
+class AssignmentSerializer:
+    """Serializer for one ``fields`` projection (see ``assignment_serializer``).
+
+    ``columns`` is what to select. Rows passed to ``rows`` must start with
+    those columns; anything after them (e.g. sort keys) is ignored.
+    """
+
+    def __init__(self, fields):
+        keys = [key for key in ASSIGNMENT_COLUMNS if key in fields]
+        self.columns = tuple(ASSIGNMENT_COLUMNS[key][0] for key in keys)
+        self.subtasks = "subtasks" in fields
+        self._keys = tuple(keys)
+        self._converted = tuple(
+            (key, index, ASSIGNMENT_COLUMNS[key][1])
+            for index, key in enumerate(keys)
+            if ASSIGNMENT_COLUMNS[key][1] is not None
+        )
+
+    def _dict(self, row):
+        data = dict(zip(self._keys, row))
+        for key, index, convert in self._converted:
+            data[key] = convert(row[index])
+        return data
+
+    def rows(self, rows):
+        """Serialize row tuples, fetching milestones in bulk if requested."""
+        items = [self._dict(row) for row in rows]
+        if self.subtasks:
+            milestones = _milestones_by_assignment([item["id"] for item in items])
+            for item in items:
+                item["subtasks"] = milestones[item["id"]]
+        return items
+
+    def instance(self, assignment):
+        """Serialize an ORM assignment, using its loaded milestones."""
+        data = self._dict([getattr(assignment, column.key) for column in self.columns])
+        if self.subtasks:
+            data["subtasks"] = [
+                {"id": m.milestone_id, "text": m.text, "completed": m.completed}
+                for m in assignment.milestones
+            ]
+        return data
+
+
+@lru_cache(maxsize=64)
+def assignment_serializer(fields=ASSIGNMENT_FIELDS):
+    """Return the (cached) serializer for a tuple of fields; ``id`` is required."""
+    return AssignmentSerializer(fields)
+
+
+def serialize_assignment(assignment, fields=ASSIGNMENT_FIELDS):
+    """Build the JSON-ready dict for an ORM assignment and its milestones."""
+    return assignment_serializer(fields).instance(assignment)
+
+
+def _milestones_by_assignment(assignment_ids):
+    grouped = {assignment_id: [] for assignment_id in assignment_ids}
+    for start in range(0, len(assignment_ids), _IN_CHUNK):
+        chunk = assignment_ids[start : start + _IN_CHUNK]
+        rows = db.session.execute(
+            select(
+                Milestone.assignment_id,
+                Milestone.milestone_id,
+                Milestone.text,
+                Milestone.completed,
+            )
+            .where(Milestone.assignment_id.in_(chunk))
+            .order_by(Milestone.assignment_id, Milestone.order, Milestone.milestone_id)
+        )
+        for assignment_id, milestone_id, text, completed in rows:
+            grouped[assignment_id].append(
+                {"id": milestone_id, "text": text, "completed": completed}
+            )
+    return grouped
@@ -0,0 +1,308 @@
+"""
+ASGI entry point.
+
+    uvicorn backend.asgi:app
+
+The Flask app itself stays WSGI; this module puts a small ASGI front on it.
+
+- The Claude-bound routes, ``POST /llm/split`` and ``/llm/split/stream``, are
+  served natively on the event loop with the ``AsyncAnthropic`` variants in
+  ``llm_splitter``. Waiting on Claude costs a coroutine, not a thread, so one
+  process can hold hundreds of these calls open.
+- Every other request goes to the Flask app on a bounded thread pool
+  (ASGI_WSGI_THREADS), as under a threaded WSGI server. Plain database reads
+  therefore keep their own threads and never queue behind upstream calls.
+
+The async routes accept the same signed Flask session cookie as the Flask
+routes, and answer with the same bodies and CORS headers.
+
+Configuration (environment variables):
+- ASGI_WSGI_THREADS: threads running Flask requests (default 16)
+"""
+
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.wrappers import Request
+
+from backend.api.routes.milestones import _sse
+from backend.api.serializers import dumps
+from backend.main import CORS_ORIGINS, create_app
+from backend.services import google_tasks_async, llm_client
+from backend.services.llm_splitter import (
+    async_split_assignment,
+    async_stream_split_assignment,
+)
+
+_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "16"))
+
+_LLM_FAILED = "LLM generation failed. Try again or use manual subtasks."
+
+
+def _environ(scope, body):
+    """Build a WSGI environ for an ASGI HTTP request."""
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin1"),
+        "PATH_INFO": scope["path"].encode().decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": scope["client"][0] if scope.get("client") else "",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1").upper().replace("-", "_")
+        value = value.decode("latin1")
+        if name == "CONTENT_LENGTH":
+            continue
+        key = "CONTENT_TYPE" if name == "CONTENT_TYPE" else f"HTTP_{name}"
+        if key in environ:
+            separator = "; " if key == "HTTP_COOKIE" else ","
+            value = environ[key] + separator + value
+        environ[key] = value
+    return environ
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _encode_headers(headers):
+    return [
+        (name.lower().encode("latin1"), value.encode("latin1"))
+        for name, value in headers
+    ]
+
+
+class AsgiApp:
+    """ASGI application serving async routes and delegating the rest to Flask."""
+
+    def __init__(self, flask_app, threads=_WSGI_THREADS):
+        self.flask_app = flask_app
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="wsgi"
+        )
+        self.routes = {
+            ("POST", "/llm/split"): self.llm_split,
+            ("GET", "/llm/split/stream"): self.llm_split_stream,
+            ("POST", "/llm/split/stream"): self.llm_split_stream,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        environ = _environ(scope, await _read_body(receive))
+        handler = self.routes.get((scope["method"], scope["path"]))
+        if handler is None:
+            await self._wsgi(environ, send)
+            return
+
+        request = Request(environ)
+        if self._user_id(request) is None:
+            status, headers, body = 401, [], dumps({"error": "Login required"})
+        else:
+            status, headers, body = await handler(request)
+        await self._respond(request, send, status, headers, body)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                await llm_client.async_registry.aclose()
+                await google_tasks_async.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _user_id(self, request):
+        """Return the logged-in user's id from the Flask session cookie."""
+        session = self.flask_app.session_interface.open_session(self.flask_app, request)
+        return session.get("_user_id") if session else None
+
+    async def _respond(self, request, send, status, headers, body):
+        """Send a response; ``body`` is bytes or an async iterator of str."""
+        origin = request.headers.get("Origin")
+        if origin in CORS_ORIGINS:
+            headers = headers + [
+                ("Access-Control-Allow-Origin", origin),
+                ("Access-Control-Allow-Credentials", "true"),
+                ("Vary", "Origin"),
+            ]
+        if isinstance(body, bytes):
+            headers = [("Content-Type", "application/json")] + headers
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": _encode_headers(headers),
+            }
+        )
+        if isinstance(body, bytes):
+            await send({"type": "http.response.body", "body": body})
+            return
+        async for chunk in body:
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk.encode(),
+                    "more_body": True,
+                }
+            )
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _wsgi(self, environ, send):
+        """Run the Flask app for one request on the thread pool.
+
+        The whole WSGI response, including iterating the body and closing
+        it, runs in one worker thread (Flask's request context must be
+        popped on the thread that pushed it); start and body chunks are
+        handed back to the event loop through a queue.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def put(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def start_response(status, headers, exc_info=None):
+            put(("start", int(status.split(" ", 1)[0]), headers))
+            return lambda data: put(("body", data))
+
+        def run():
+            try:
+                result = self.flask_app(environ, start_response)
+                try:
+                    for chunk in result:
+                        if chunk:
+                            put(("body", chunk))
+                finally:
+                    if hasattr(result, "close"):
+                        result.close()
+            except Exception as e:
+                put(("error", e))
+            put(("end", None))
+
+        loop.run_in_executor(self.executor, run)
+
+        started = False
+        while True:
+            kind, *payload = await queue.get()
+            if kind == "start":
+                status, headers = payload
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": status,
+                        "headers": _encode_headers(headers),
+                    }
+                )
+                started = True
+            elif kind == "body":
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": payload[0],
+                        "more_body": True,
+                    }
+                )
+            elif kind == "error":
+                print(f"[ASGI] Flask request failed: {payload[0]}", flush=True)
+                if not started:
+                    await send(
+                        {"type": "http.response.start", "status": 500, "headers": []}
+                    )
+                    started = True
+            else:
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+    async def llm_split(self, request):
+        """Async ``POST /llm/split`` (see ``milestones.llm_split``)."""
+        data = request.get_json(silent=True) or {}
+        description = data.get("description", "")
+        deadline = data.get("deadline")
+
+        if not description or not deadline:
+            return 400, [], dumps({"error": "Description and deadline are required"})
+
+        try:
+            milestones = await async_split_assignment(description, deadline)
+            return 200, [], dumps(milestones)
+        except Exception as e:
+            print(f"[LLM] Failed to generate milestones: {e}")
+            return 500, [], dumps({"error": _LLM_FAILED})
+
+    async def llm_split_stream(self, request):
+        """Async ``/llm/split/stream`` (see ``milestones.llm_split_stream``)."""
+        data = request.get_json(silent=True) or request.args
+        description = data.get("description", "")
+        deadline = data.get("deadline")
+
+        if not description or not deadline:
+            return 400, [], dumps({"error": "Description and deadline are required"})
+
+        milestones = async_stream_split_assignment(description, deadline)
+        try:
+            # Run input validation before the 200 response is committed
+            first = await anext(milestones, None)
+        except ValueError as e:
+            return 400, [], dumps({"error": str(e)})
+        except Exception as e:
+            print(f"[LLM] Failed to generate milestones: {e}")
+            return 500, [], dumps({"error": _LLM_FAILED})
+
+        async def events():
+            count = 0
+            try:
+                if first is not None:
+                    count += 1
+                    yield _sse("milestone", first)
+                async for milestone in milestones:
+                    count += 1
+                    yield _sse("milestone", milestone)
+            except Exception as e:
+                print(f"[LLM] Failed to generate milestones: {e}")
+                yield _sse("error", {"error": _LLM_FAILED})
+                return
+            yield _sse("done", {"count": count})
+
+        headers = [
+            ("Content-Type", "text/event-stream"),
+            ("Cache-Control", "no-cache"),
+            ("X-Accel-Buffering", "no"),
+        ]
+        return 200, headers, events()
+
+
+def __getattr__(name):
+    # Build ``app`` on first access so importing this module (e.g. in tests)
+    # does not start a Flask app and its background workers.
+    if name == "app":
+        global app
+        app = AsgiApp(create_app())
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
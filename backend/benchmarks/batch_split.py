@@ -0,0 +1,78 @@
+"""
+Benchmark: serial split_assignment calls vs. the concurrent batch path.
+
+Simulates a syllabus import against a fake Claude client with fixed latency,
+so it runs offline and the numbers only reflect request scheduling.
+
+Usage:
+    python -m backend.benchmarks.batch_split [--items 30] [--unique 20] [--latency 0.5]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from backend.services import llm_cache
+from backend.services.llm_splitter import split_assignment, split_assignments
+
+_MILESTONES = json.dumps(
+    [
+        {"id": i, "title": f"Milestone {i}", "description": "Do the work."}
+        for i in range(1, 6)
+    ]
+)
+
+
+class SlowFakeAnthropic:
+    """Fake Claude client that sleeps for a fixed latency per call."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.messages = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return SimpleNamespace(content=[SimpleNamespace(text=_MILESTONES)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--unique", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    # Measure the LLM fan-out itself, not the result cache
+    llm_cache.set_cache(None)
+
+    due = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+    requests = [
+        (f"Assignment {i % args.unique}: write a report.", due)
+        for i in range(args.items)
+    ]
+
+    client = SlowFakeAnthropic(args.latency)
+    started = time.perf_counter()
+    for description, deadline in requests:
+        split_assignment(description, deadline, client=client)
+    serial = time.perf_counter() - started
+    serial_calls = client.calls
+
+    client = SlowFakeAnthropic(args.latency)
+    started = time.perf_counter()
+    split_assignments(requests, max_workers=args.workers, client=client)
+    batch = time.perf_counter() - started
+
+    print(f"items={args.items} unique={args.unique} latency={args.latency}s")
+    print(f"serial: {serial:.2f}s ({serial_calls} LLM calls)")
+    print(f"batch:  {batch:.2f}s ({client.calls} LLM calls, {args.workers} workers)")
+    print(f"speedup: {serial / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
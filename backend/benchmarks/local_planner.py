@@ -0,0 +1,58 @@
+"""
+Benchmark: local milestone planner vs. the Claude-backed splitter.
+
+The planner is timed over many runs. The LLM path is timed with live Claude
+calls when --live is given (needs ANTHROPIC_API_KEY; the result cache is
+disabled), otherwise against a fake client sleeping for --latency seconds.
+
+Usage:
+    python -m backend.benchmarks.local_planner [--runs 10000] [--live] [--latency 3]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from backend.benchmarks.batch_split import SlowFakeAnthropic
+from backend.services import llm_cache
+from backend.services.llm_splitter import split_assignment
+from backend.services.local_planner import plan_assignment
+
+_DESCRIPTION = (
+    "Write a 3000-word research paper on AI in education. Include a literature "
+    "review, two case studies and recommendations, then present your findings."
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--llm-runs", type=int, default=3)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--latency", type=float, default=3.0)
+    args = parser.parse_args()
+
+    due = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        plan_assignment(_DESCRIPTION, due)
+    planner = (time.perf_counter() - started) / args.runs
+
+    llm_cache.set_cache(None)
+    client = None if args.live else SlowFakeAnthropic(args.latency)
+    started = time.perf_counter()
+    for _ in range(args.llm_runs):
+        split_assignment(_DESCRIPTION, due, client=client)
+    llm = (time.perf_counter() - started) / args.llm_runs
+
+    print(f"local planner: {planner * 1e6:.1f} µs/plan over {args.runs} runs")
+    print(
+        f"llm ({'live' if args.live else f'simulated {args.latency}s'}): "
+        f"{llm * 1e3:.0f} ms/plan over {args.llm_runs} runs"
+    )
+    print(f"planner is {llm / planner:,.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
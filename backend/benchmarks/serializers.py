@@ -0,0 +1,151 @@
+"""
+Benchmark: assignment list serialization, ORM + jsonify vs. rows + serializers.
+
+Seeds an in-memory SQLite database with --assignments assignments of
+--milestones milestones each (default 1,000 and 6,000 in total) and times
+building the full ``GET /assignments`` body both ways, query included:
+
+- before: ORM instances with ``selectinload``, dicts built per instance,
+  encoded by Flask's ``jsonify``
+- after: ``select`` of plain rows, the precompiled ``assignment_serializer``
+  and each installed JSON backend
+
+Usage:
+    python -m backend.benchmarks.serializers [--assignments 1000] [--milestones 6] [--runs 20]
+"""
+
+import argparse
+import os
+import time
+from datetime import date, datetime, timedelta
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from flask import jsonify
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from backend.api import serializers
+from backend.api.serializers import ASSIGNMENT_FIELDS, assignment_serializer
+from backend.database.models import Assignment, Milestone, User, db
+from backend.main import create_app
+
+
+def _seed(assignments, milestones):
+    db.session.add(
+        User(user_id=1, username="bench", email="b@x", name="B", password="x")
+    )
+    db.session.execute(
+        insert(Assignment),
+        [
+            {
+                "assignment_id": i,
+                "user_id": 1,
+                "title": f"Assignment {i}",
+                "description": "Write a report on the assigned reading. " * 4,
+                "deadline": date(2030, 1, 1) + timedelta(days=i % 120),
+                "created_at": datetime(2029, 9, 1, 12, 0, i % 60),
+                "progress": i % 100,
+            }
+            for i in range(1, assignments + 1)
+        ],
+    )
+    db.session.execute(
+        insert(Milestone),
+        [
+            {
+                "assignment_id": i,
+                "title": f"Step {order}",
+                "text": f"Step {order}: do the work",
+                "completed": order % 2 == 0,
+                "order": order,
+            }
+            for i in range(1, assignments + 1)
+            for order in range(milestones)
+        ],
+    )
+    db.session.commit()
+
+
+def _orm_jsonify():
+    """The listing path as it was: ORM instances, dicts, jsonify."""
+    assignments = (
+        Assignment.query.filter_by(user_id=1, archived=False)
+        .options(selectinload(Assignment.milestones))
+        .order_by(Assignment.deadline, Assignment.created_at, Assignment.assignment_id)
+        .all()
+    )
+    body = [
+        {
+            "id": a.assignment_id,
+            "title": a.title,
+            "description": a.description,
+            "deadline": a.deadline.isoformat(),
+            "progress": a.progress,
+            "createdAt": a.created_at.isoformat(),
+            "archived": a.archived,
+            "status": a.status,
+            "version": a.version,
+            "subtasks": [
+                {"id": m.milestone_id, "text": m.text, "completed": m.completed}
+                for m in a.milestones
+            ],
+        }
+        for a in assignments
+    ]
+    data = jsonify(body).get_data()
+    # Drop the instances so every run pays for loading them again
+    db.session.expunge_all()
+    return data
+
+
+def _rows(dumps):
+    serializer = assignment_serializer(ASSIGNMENT_FIELDS)
+    keyset = (Assignment.deadline, Assignment.created_at, Assignment.assignment_id)
+    rows = db.session.execute(
+        select(*serializer.columns, *keyset)
+        .where(Assignment.user_id == 1, Assignment.archived.is_(False))
+        .order_by(*keyset)
+    ).all()
+    return dumps(serializer.rows(rows))
+
+
+def _time(label, fn, runs):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(runs):
+        size = len(fn())
+    per_call = (time.perf_counter() - started) / runs
+    print(f"{label:<28} {per_call * 1e3:8.1f} ms/response  {size / 1024:8.0f} KiB")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=1000)
+    parser.add_argument("--milestones", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        _seed(args.assignments, args.milestones)
+        print(
+            f"assignments={args.assignments} "
+            f"milestones={args.assignments * args.milestones} runs={args.runs}"
+        )
+
+        before = _time("ORM + jsonify (before)", _orm_jsonify, args.runs)
+        for name in ("stdlib", "orjson", "msgspec"):
+            try:
+                _, dumps = serializers.load_backend(name)
+            except RuntimeError:
+                print(f"rows + {name:<21} not installed")
+                continue
+            after = _time(f"rows + {name}", lambda: _rows(dumps), args.runs)
+            print(f"{'':<28} {before / after:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
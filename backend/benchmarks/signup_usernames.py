@@ -0,0 +1,98 @@
+"""
+Load test: concurrent signups whose emails share one username base.
+
+Sends --signups POST /auth/signup requests for ``john@<n>.example.com`` from
+--threads threads and checks that every signup succeeded with a distinct
+username (``john``, ``john1``, ...). It also reports the SQL statements per
+signup that touched usernames: the old probe loop needed one SELECT per
+existing ``johnN``, while the counter needs one UPDATE.
+
+Runs against a temporary SQLite file unless --database-url is given (use a
+scratch Postgres database to test real row locking; its tables are created
+and dropped).
+
+Usage:
+    python -m backend.benchmarks.signup_usernames [--signups 1000] [--threads 50] [--database-url URL]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--signups", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.database_url or (
+        f"sqlite:///{os.path.join(tmp.name, 'signup.db')}"
+    )
+
+    from sqlalchemy import event
+
+    from backend.database.models import db
+    from backend.main import create_app
+    from backend.services.password_hashing import hasher
+
+    hasher.max_queue = args.signups
+    app = create_app()
+    if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 60}}
+    with app.app_context():
+        db.create_all()
+        username_statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if "username_counter" in statement or "LIKE" in statement:
+                username_statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _record)
+
+    def signup(i):
+        return app.test_client().post(
+            "/auth/signup",
+            json={
+                "email": f"john@{i}.example.com",
+                "password": "secret",
+                "name": "John",
+            },
+        )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        responses = list(pool.map(signup, range(args.signups)))
+    elapsed = time.perf_counter() - started
+
+    ok = [r for r in responses if r.status_code == 201]
+    usernames = {r.get_json()["user"]["username"] for r in ok}
+    expected = {"john"} | {f"john{i}" for i in range(1, args.signups)}
+    print(
+        f"signups={args.signups} threads={args.threads} "
+        f"database={app.config['SQLALCHEMY_DATABASE_URI'].split(':')[0]}"
+    )
+    print(f"{'succeeded':<28} {len(ok):8d}")
+    print(f"{'failed':<28} {len(responses) - len(ok):8d}")
+    print(f"{'distinct usernames':<28} {len(usernames):8d}")
+    print(f"{'usernames = john..johnN-1':<28} {str(usernames == expected):>8}")
+    print(
+        f"{'username SQL per signup':<28} "
+        f"{len(username_statements) / args.signups:8.2f}"
+    )
+    print(f"{'signups per second':<28} {args.signups / elapsed:8.0f}")
+
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Microbenchmark: per-call Google Tasks service construction overhead.
+
+Compares what each task operation used to pay (``discovery.build`` on every
+call) with building from the bundled, pre-parsed discovery document and with
+the cached ``_get_tasks_service``. No network access is needed.
+
+Usage:
+    python -m backend.benchmarks.tasks_service [--runs 500]
+"""
+
+import argparse
+import time
+
+from googleapiclient.discovery import build
+
+from backend.services.google_tasks import (
+    _DISCOVERY_DOCUMENT,
+    _get_tasks_service,
+    build_from_document,
+    get_credentials_from_token,
+)
+
+
+def _time(label, fn, runs):
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    per_call = (time.perf_counter() - started) / runs
+    print(f"{label:<32} {per_call * 1e6:10.1f} µs/call")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    credentials = get_credentials_from_token("benchmark-token")
+
+    before = _time(
+        "build() per call (before)",
+        lambda: build("tasks", "v1", credentials=credentials),
+        args.runs,
+    )
+    _time(
+        "build_from_document per call",
+        lambda: build_from_document(_DISCOVERY_DOCUMENT, credentials=credentials),
+        args.runs,
+    )
+    after = _time(
+        "cached _get_tasks_service (after)",
+        lambda: _get_tasks_service(credentials),
+        args.runs,
+    )
+    print(f"speedup: {before / after:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Parsing helpers for the Date/DateTime columns.
+
+Clients send deadlines and timestamps in a few shapes (``2025-11-12``,
+``11/12/2025``, JavaScript's ``2025-11-11T14:23:57.959Z``). Routes parse them
+once on the way in; the database stores native values.
+"""
+
+from datetime import date, datetime, timezone
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y")
+
+
+def _from_iso(text):
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        # Stored timestamps are naive UTC
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_date(value):
+    """Parse a date from a date/datetime object or one of ``DATE_FORMATS``.
+
+    ISO timestamps are accepted too; their calendar date is kept as written.
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"Unable to parse date: {value!r}")
+    text = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    try:
+        return date.fromisoformat(text[:10]) if "T" in text else _from_iso(text).date()
+    except ValueError:
+        raise ValueError(f"Unable to parse date: {value!r}") from None
+
+
+def parse_datetime(value):
+    """Parse a timestamp into a naive UTC datetime.
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"Unable to parse timestamp: {value!r}")
+    try:
+        return _from_iso(value.strip())
+    except ValueError:
+        return datetime.combine(parse_date(value), datetime.min.time())
@@ -0,0 +1,83 @@
+"""
+Versioned schema migrations (Alembic).
+
+The schema is no longer created at application startup; apply migrations as
+a deploy step instead, before starting the workers:
+
+    python -m backend.database.migrate upgrade          # to the latest revision
+    python -m backend.database.migrate current          # show the applied revision
+    python -m backend.database.migrate revision -m "add foo"   # autogenerate
+    python -m backend.database.migrate downgrade <revision>
+
+Revisions live in ``backend/database/migrations/versions``. Databases that
+were created with ``db.create_all()`` before migrations existed can simply be
+upgraded: the early revisions skip tables and columns that already exist.
+"""
+
+import argparse
+import os
+
+from alembic import command
+from alembic.config import Config
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+
+def alembic_config(connection=None):
+    """Build an Alembic config that runs on ``connection``."""
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    if connection is not None:
+        config.set_main_option(
+            "sqlalchemy.url",
+            connection.engine.url.render_as_string(hide_password=False).replace(
+                "%", "%%"
+            ),
+        )
+    config.attributes["connection"] = connection
+    return config
+
+
+def upgrade(engine, revision="head"):
+    """Migrate the database behind ``engine`` up to ``revision``."""
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), revision)
+
+
+def downgrade(engine, revision):
+    """Migrate the database behind ``engine`` down to ``revision``."""
+    with engine.begin() as connection:
+        command.downgrade(alembic_config(connection), revision)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.database.migrate")
+    commands = parser.add_subparsers(dest="command", required=True)
+    up = commands.add_parser("upgrade", help="apply migrations")
+    up.add_argument("revision", nargs="?", default="head")
+    down = commands.add_parser("downgrade", help="revert migrations")
+    down.add_argument("revision")
+    commands.add_parser("current", help="show the applied revision")
+    revision = commands.add_parser("revision", help="autogenerate a migration")
+    revision.add_argument("-m", "--message", required=True)
+    args = parser.parse_args(argv)
+
+    from backend.database.models import db
+    from backend.main import create_db_app
+
+    # The app resolves DATABASE_URL (including relative SQLite paths); the
+    # full app would also resume pending generation jobs in this process
+    with create_db_app().app_context(), db.engine.begin() as connection:
+        config = alembic_config(connection)
+        if args.command == "upgrade":
+            command.upgrade(config, args.revision)
+        elif args.command == "downgrade":
+            command.downgrade(config, args.revision)
+        elif args.command == "current":
+            command.current(config, verbose=True)
+        else:
+            command.revision(config, message=args.message, autogenerate=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Alembic environment.
+
+Run migrations through ``backend.database.migrate``, which hands over an open
+connection in ``config.attributes["connection"]``; ``sqlalchemy.url`` is only
+used for offline (``--sql``) runs.
+"""
+
+from alembic import context
+
+from backend.database.models import db
+
+config = context.config
+target_metadata = db.metadata
+
+
+def _configure(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        compare_type=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline():
+    _configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes["connection"]
+    # SQLite cannot ALTER most things; batch mode recreates the table instead
+    _configure(
+        connection=connection,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
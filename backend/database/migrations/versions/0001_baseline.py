@@ -0,0 +1,97 @@
+"""Baseline schema: users, assignments, milestones and subtasks
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-17
+
+Tables that already exist (databases created by ``db.create_all()`` before
+migrations were introduced) are left alone, so existing deployments can run
+the whole chain.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "user" not in existing:
+        op.create_table(
+            "user",
+            sa.Column("user_id", sa.Integer(), primary_key=True),
+            sa.Column("username", sa.String(100), nullable=False),
+            sa.Column("email", sa.String(100), nullable=False),
+            sa.Column("name", sa.String(100), nullable=False),
+            sa.Column("password", sa.String(200), nullable=False),
+        )
+        op.create_index("ix_user_username", "user", ["username"], unique=True)
+        op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    if "assignment" not in existing:
+        op.create_table(
+            "assignment",
+            sa.Column("assignment_id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("user.user_id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("title", sa.String(200), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("deadline", sa.String(50), nullable=False),
+            sa.Column("progress", sa.Integer()),
+            sa.Column("created_at", sa.String(50), nullable=False),
+        )
+        op.create_index("ix_assignment_user_id", "assignment", ["user_id"])
+
+    if "milestone" not in existing:
+        op.create_table(
+            "milestone",
+            sa.Column("milestone_id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "assignment_id",
+                sa.Integer(),
+                sa.ForeignKey("assignment.assignment_id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("title", sa.String(500), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("due_date", sa.String(50)),
+            sa.Column("google_task_id", sa.String(200)),
+            sa.Column("completed", sa.Boolean()),
+            sa.Column("order", sa.Integer()),
+        )
+        op.create_index("ix_milestone_assignment_id", "milestone", ["assignment_id"])
+
+    if "subtask" not in existing:
+        op.create_table(
+            "subtask",
+            sa.Column("subtask_id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "milestone_id",
+                sa.Integer(),
+                sa.ForeignKey("milestone.milestone_id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("title", sa.String(500), nullable=False),
+            sa.Column("notes", sa.Text()),
+            sa.Column("due_date", sa.String(50)),
+            sa.Column("google_task_id", sa.String(200)),
+            sa.Column("completed", sa.Boolean()),
+            sa.Column("order", sa.Integer()),
+        )
+        op.create_index("ix_subtask_milestone_id", "subtask", ["milestone_id"])
+
+
+def downgrade():
+    op.drop_table("subtask")
+    op.drop_table("milestone")
+    op.drop_table("assignment")
+    op.drop_table("user")
@@ -0,0 +1,97 @@
+"""Add archived/status/version, Milestone.text and generation jobs
+
+Revision ID: 0002_assignment_state
+Revises: 0001_baseline
+Create Date: 2026-10-17
+
+The API has been reading and writing these columns while ``db.create_all()``
+only created missing tables, so older databases never got them. Columns that
+are already present are skipped.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002_assignment_state"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+ACTIVE_INDEX = "ix_assignment_active_user_deadline"
+
+
+def _columns(inspector, table):
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    assignment_columns = _columns(inspector, "assignment")
+    milestone_columns = _columns(inspector, "milestone")
+
+    with op.batch_alter_table("assignment") as batch:
+        if "archived" not in assignment_columns:
+            batch.add_column(
+                sa.Column(
+                    "archived", sa.Boolean(), nullable=False, server_default=sa.false()
+                )
+            )
+        if "status" not in assignment_columns:
+            batch.add_column(
+                sa.Column(
+                    "status", sa.String(20), nullable=False, server_default="ready"
+                )
+            )
+        if "version" not in assignment_columns:
+            batch.add_column(
+                sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+            )
+
+    if "text" not in milestone_columns:
+        op.add_column("milestone", sa.Column("text", sa.Text(), nullable=True))
+    # The API shows ``text``; rows written before it existed only have a title
+    op.execute("UPDATE milestone SET text = title WHERE text IS NULL")
+
+    # Most reads list one user's active assignments by deadline; a partial
+    # index keeps archived rows out of it
+    indexes = {index["name"] for index in inspector.get_indexes("assignment")}
+    if ACTIVE_INDEX not in indexes:
+        archived = sa.column("archived")
+        op.create_index(
+            ACTIVE_INDEX,
+            "assignment",
+            ["user_id", "deadline"],
+            postgresql_where=archived == sa.false(),
+            sqlite_where=archived == sa.false(),
+        )
+
+    if not inspector.has_table("generation_job"):
+        op.create_table(
+            "generation_job",
+            sa.Column("job_id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "assignment_id",
+                sa.Integer(),
+                sa.ForeignKey("assignment.assignment_id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.Text()),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index(
+            "ix_generation_job_assignment_id", "generation_job", ["assignment_id"]
+        )
+        op.create_index("ix_generation_job_status", "generation_job", ["status"])
+
+
+def downgrade():
+    op.drop_table("generation_job")
+    op.drop_index(ACTIVE_INDEX, table_name="assignment")
+    op.drop_column("milestone", "text")
+    with op.batch_alter_table("assignment") as batch:
+        batch.drop_column("version")
+        batch.drop_column("status")
+        batch.drop_column("archived")
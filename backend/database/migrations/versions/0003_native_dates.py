@@ -0,0 +1,133 @@
+"""Convert deadline/created_at/due_date to native Date/DateTime
+
+Revision ID: 0003_native_dates
+Revises: 0002_assignment_state
+Create Date: 2026-10-17
+
+The columns used to be String(50) holding whatever the client sent
+(``2025-11-12``, ``11/12/2025``, ``2025-11-11T14:23:57.959Z``). Every value is
+first normalized to the canonical format SQLAlchemy uses for Date/DateTime;
+values that cannot be parsed become NULL (``due_date``) or the migration
+time (``deadline``/``created_at``, which are NOT NULL). Then the column types
+are changed and the (user_id, archived, deadline) index is created.
+"""
+
+from datetime import date, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+from backend.database.dates import parse_date, parse_datetime
+
+revision = "0003_native_dates"
+down_revision = "0002_assignment_state"
+branch_labels = None
+depends_on = None
+
+# (table, primary key, column, new type, nullable)
+COLUMNS = (
+    ("assignment", "assignment_id", "deadline", sa.Date(), False),
+    ("assignment", "assignment_id", "created_at", sa.DateTime(), False),
+    ("milestone", "milestone_id", "due_date", sa.Date(), True),
+    ("subtask", "subtask_id", "due_date", sa.Date(), True),
+)
+DEADLINE_INDEX = "ix_assignment_user_archived_deadline"
+ACTIVE_INDEX = "ix_assignment_active_user_deadline"
+
+
+def _normalize(value, type_):
+    """Return the canonical text for ``value``, or None if it cannot be parsed."""
+    try:
+        if isinstance(type_, sa.DateTime):
+            return parse_datetime(value).strftime("%Y-%m-%d %H:%M:%S.%f")
+        return parse_date(value).isoformat()
+    except ValueError:
+        return None
+
+
+def _normalized_rows(conn, table, pk, column, type_, nullable):
+    """Return ``{"row_id", "value"}`` params for every text value in a column."""
+    fallback = None if nullable else _normalize(datetime.utcnow(), type_)
+    params = []
+    rows = conn.execute(sa.text(f'SELECT "{pk}", "{column}" FROM "{table}"'))
+    for row_id, value in rows:
+        if value is None or isinstance(value, (date, datetime)):
+            continue
+        normalized = _normalize(value, type_)
+        if normalized is None:
+            print(
+                f"[MIGRATE] {table}.{column} #{row_id}: cannot parse {value!r}, "
+                f"using {fallback!r}",
+                flush=True,
+            )
+            normalized = fallback
+        params.append({"row_id": row_id, "value": normalized})
+    return params
+
+
+def _write(conn, table, pk, column, params):
+    if params:
+        conn.execute(
+            sa.text(f'UPDATE "{table}" SET "{column}" = :value WHERE "{pk}" = :row_id'),
+            params,
+        )
+
+
+def _recreate_active_index():
+    archived = sa.column("archived")
+    op.create_index(
+        ACTIVE_INDEX,
+        "assignment",
+        ["user_id", "deadline"],
+        postgresql_where=archived == sa.false(),
+        sqlite_where=archived == sa.false(),
+    )
+
+
+def upgrade():
+    conn = op.get_bind()
+    # PostgreSQL casts the text in place, so it must be clean beforehand
+    normalized = {}
+    for table, pk, column, type_, nullable in COLUMNS:
+        normalized[table, column] = _normalized_rows(
+            conn, table, pk, column, type_, nullable
+        )
+        _write(conn, table, pk, column, normalized[table, column])
+
+    # SQLite rebuilds the table for a type change and would lose the
+    # partial index's WHERE clause, so drop and recreate it around the change
+    op.drop_index(ACTIVE_INDEX, table_name="assignment")
+    for table, pk, column, type_, nullable in COLUMNS:
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(
+                column,
+                type_=type_,
+                existing_type=sa.String(50),
+                existing_nullable=nullable,
+                postgresql_using=f'"{column}"::{type_.compile(conn.dialect)}',
+            )
+        if conn.dialect.name == "sqlite":
+            # The rebuild copies rows with CAST(... AS DATE), which SQLite
+            # turns into a number ('2025-11-12' -> 2025); put the text back
+            _write(conn, table, pk, column, normalized[table, column])
+    _recreate_active_index()
+
+    indexes = {index["name"] for index in sa.inspect(conn).get_indexes("assignment")}
+    if DEADLINE_INDEX not in indexes:
+        op.create_index(
+            DEADLINE_INDEX, "assignment", ["user_id", "archived", "deadline"]
+        )
+
+
+def downgrade():
+    op.drop_index(DEADLINE_INDEX, table_name="assignment")
+    op.drop_index(ACTIVE_INDEX, table_name="assignment")
+    for table, _, column, type_, nullable in COLUMNS:
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(
+                column,
+                type_=sa.String(50),
+                existing_type=type_,
+                existing_nullable=nullable,
+            )
+    _recreate_active_index()
@@ -0,0 +1,102 @@
+"""Add the agenda_item timeline index
+
+Revision ID: 0004_agenda_items
+Revises: 0003_native_dates
+Create Date: 2026-10-17
+
+Creates the table and fills it from the existing assignments, milestones and
+subtasks; from then on the routes keep it up to date.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_agenda_items"
+down_revision = "0003_native_dates"
+branch_labels = None
+depends_on = None
+
+_BACKFILL = (
+    """
+    INSERT INTO agenda_item (user_id, assignment_id, kind, title,
+                             assignment_title, due_date, completed)
+    SELECT a.user_id, a.assignment_id, 'assignment', a.title, a.title,
+           a.deadline, COALESCE(a.progress, 0) >= 100
+    FROM assignment a
+    WHERE a.archived = :no
+    """,
+    """
+    INSERT INTO agenda_item (user_id, assignment_id, milestone_id, kind, title,
+                             assignment_title, due_date, completed)
+    SELECT a.user_id, a.assignment_id, m.milestone_id, 'milestone', m.title,
+           a.title, m.due_date, COALESCE(m.completed, :no)
+    FROM milestone m JOIN assignment a ON a.assignment_id = m.assignment_id
+    WHERE a.archived = :no AND m.due_date IS NOT NULL
+    """,
+    """
+    INSERT INTO agenda_item (user_id, assignment_id, milestone_id, subtask_id,
+                             kind, title, assignment_title, due_date, completed)
+    SELECT a.user_id, a.assignment_id, m.milestone_id, s.subtask_id, 'subtask',
+           s.title, a.title, s.due_date, COALESCE(s.completed, :no)
+    FROM subtask s
+    JOIN milestone m ON m.milestone_id = s.milestone_id
+    JOIN assignment a ON a.assignment_id = m.assignment_id
+    WHERE a.archived = :no AND s.due_date IS NOT NULL
+    """,
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+    if sa.inspect(conn).has_table("agenda_item"):
+        # Created empty by db.create_all(); only the backfill is missing
+        if conn.execute(sa.text("SELECT 1 FROM agenda_item LIMIT 1")).first():
+            return
+    else:
+        _create_table()
+    for statement in _BACKFILL:
+        conn.execute(sa.text(statement), {"no": False})
+
+
+def _create_table():
+    op.create_table(
+        "agenda_item",
+        sa.Column("agenda_item_id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("user.user_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "assignment_id",
+            sa.Integer(),
+            sa.ForeignKey("assignment.assignment_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "milestone_id",
+            sa.Integer(),
+            sa.ForeignKey("milestone.milestone_id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column(
+            "subtask_id",
+            sa.Integer(),
+            sa.ForeignKey("subtask.subtask_id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("assignment_title", sa.String(200), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_agenda_item_assignment_id", "agenda_item", ["assignment_id"])
+    op.create_index(
+        "ix_agenda_item_user_due_date", "agenda_item", ["user_id", "due_date"]
+    )
+
+
+def downgrade():
+    op.drop_table("agenda_item")
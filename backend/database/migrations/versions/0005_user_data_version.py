@@ -0,0 +1,32 @@
+"""Add user.data_version for read ETags and the response cache
+
+Revision ID: 0005_user_data_version
+Revises: 0004_agenda_items
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_user_data_version"
+down_revision = "0004_agenda_items"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("user")
+    }
+    if "data_version" not in columns:
+        with op.batch_alter_table("user") as batch:
+            batch.add_column(
+                sa.Column(
+                    "data_version", sa.Integer(), nullable=False, server_default="1"
+                )
+            )
+
+
+def downgrade():
+    with op.batch_alter_table("user") as batch:
+        batch.drop_column("data_version")
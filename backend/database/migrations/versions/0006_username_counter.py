@@ -0,0 +1,31 @@
+"""Add the username_counter table for single-query username allocation
+
+Revision ID: 0006_username_counter
+Revises: 0005_user_data_version
+Create Date: 2026-10-17
+
+Rows are created lazily from the existing usernames the first time a base is
+allocated, so no backfill is needed.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_username_counter"
+down_revision = "0005_user_data_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("username_counter"):
+        return  # created by db.create_all()
+    op.create_table(
+        "username_counter",
+        sa.Column("base", sa.String(100), primary_key=True),
+        sa.Column("last_suffix", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("username_counter")
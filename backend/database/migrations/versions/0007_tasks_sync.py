@@ -0,0 +1,69 @@
+"""Add Google Tasks sync bookkeeping: change times and list watermarks
+
+Revision ID: 0007_tasks_sync
+Revises: 0006_username_counter
+Create Date: 2026-10-17
+
+Existing rows get updated_at = the migration time and synced_at = NULL, so
+linked rows are pushed once by the first sync (and win any conflict with
+an older Google change).
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_tasks_sync"
+down_revision = "0006_username_counter"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("milestone", "subtask")
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in _TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        indexes = {index["name"] for index in inspector.get_indexes(table)}
+        with op.batch_alter_table(table) as batch:
+            if "updated_at" not in columns:
+                batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+            if "synced_at" not in columns:
+                batch.add_column(sa.Column("synced_at", sa.DateTime(), nullable=True))
+            if f"ix_{table}_google_task_id" not in indexes:
+                batch.create_index(f"ix_{table}_google_task_id", ["google_task_id"])
+
+        op.execute(
+            sa.text(
+                f"UPDATE {table} SET updated_at = :now WHERE updated_at IS NULL"
+            ).bindparams(now=datetime.utcnow())
+        )
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(
+                "updated_at", existing_type=sa.DateTime(), nullable=False
+            )
+
+    if not inspector.has_table("task_sync_state"):
+        op.create_table(
+            "task_sync_state",
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("user.user_id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("tasklist_id", sa.String(200), primary_key=True),
+            sa.Column("updated_min", sa.String(40), nullable=True),
+            sa.Column("synced_at", sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade():
+    op.drop_table("task_sync_state")
+    for table in _TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_index(f"ix_{table}_google_task_id")
+            batch.drop_column("synced_at")
+            batch.drop_column("updated_at")
@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import false
 
 db = SQLAlchemy()
 
@@ -12,6 +15,9 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(100), unique=True, nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     password = db.Column(db.String(200), nullable=False)
+    # Bumped by every write to the user's assignments; drives read ETags and
+    # the response cache (see backend.services.response_cache)
+    data_version = db.Column(db.Integer, default=1, nullable=False)
 
     # Flask-Login requires get_id method
     def get_id(self):
@@ -30,15 +36,34 @@ class Assignment(db.Model):
     )
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    deadline = db.Column(db.String(50), nullable=False)
+    deadline = db.Column(db.Date, nullable=False)
     progress = db.Column(db.Integer, default=0)
-    created_at = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    archived = db.Column(db.Boolean, default=False, nullable=False)
+    # "ready", or "generating" while a background job builds the milestones
+    status = db.Column(db.String(20), default="ready", nullable=False)
+    # Bumped on every edit; clients send it back in If-Match to detect conflicts
+    version = db.Column(db.Integer, default=1, nullable=False)
 
     user = db.relationship(
         "User",
         backref=db.backref("assignments", lazy=True, cascade="all, delete-orphan"),
     )
 
+    __table_args__ = (
+        # Serves the per-user list pages and "due between" range scans
+        db.Index("ix_assignment_user_archived_deadline", user_id, archived, deadline),
+        # Active assignments only; queries must compare archived to a literal
+        # false (not a bound parameter) for SQLite to pick it
+        db.Index(
+            "ix_assignment_active_user_deadline",
+            user_id,
+            deadline,
+            postgresql_where=archived == false(),
+            sqlite_where=archived == false(),
+        ),
+    )
+
 
 class Milestone(db.Model):
     __tablename__ = "milestone"
@@ -51,11 +76,18 @@ class Milestone(db.Model):
         index=True,
     )
     title = db.Column(db.String(500), nullable=False)
+    text = db.Column(db.Text, nullable=True)
     description = db.Column(db.Text, nullable=True)
-    due_date = db.Column(db.String(50), nullable=True)
-    google_task_id = db.Column(db.String(200), nullable=True)
+    due_date = db.Column(db.Date, nullable=True)
+    google_task_id = db.Column(db.String(200), nullable=True, index=True)
     completed = db.Column(db.Boolean, default=False)
     order = db.Column(db.Integer, default=0)
+    # Last local change and last Google Tasks sync; the row needs pushing
+    # while updated_at > synced_at (see backend.services.tasks_sync)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    synced_at = db.Column(db.DateTime, nullable=True)
 
     assignment = db.relationship(
         "Assignment",
@@ -80,10 +112,14 @@ class Subtask(db.Model):
     )
     title = db.Column(db.String(500), nullable=False)
     notes = db.Column(db.Text, nullable=True)
-    due_date = db.Column(db.String(50), nullable=True)
-    google_task_id = db.Column(db.String(200), nullable=True)
+    due_date = db.Column(db.Date, nullable=True)
+    google_task_id = db.Column(db.String(200), nullable=True, index=True)
     completed = db.Column(db.Boolean, default=False)
     order = db.Column(db.Integer, default=0)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    synced_at = db.Column(db.DateTime, nullable=True)
 
     milestone = db.relationship(
         "Milestone",
@@ -94,3 +130,104 @@ class Subtask(db.Model):
             cascade="all, delete-orphan",
         ),
     )
+
+
+class GenerationJob(db.Model):
+    """Background LLM milestone generation for one assignment.
+
+    Jobs live in the database so work that was queued or in flight when a
+    worker process stopped is picked up again on the next startup.
+    """
+
+    __tablename__ = "generation_job"
+
+    job_id = db.Column(db.Integer, primary_key=True)
+    assignment_id = db.Column(
+        db.Integer,
+        db.ForeignKey("assignment.assignment_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # "pending", "running", "done" or "failed"
+    status = db.Column(db.String(20), default="pending", nullable=False, index=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    assignment = db.relationship(
+        "Assignment",
+        backref=db.backref("generation_jobs", lazy=True, cascade="all, delete-orphan"),
+    )
+
+
+class AgendaItem(db.Model):
+    """One dated assignment, milestone or subtask, denormalized for timelines.
+
+    Rows are derived data: ``backend.services.agenda`` rebuilds an
+    assignment's rows whenever a route changes it, so ``GET /timeline`` is a
+    single range scan on (user_id, due_date) with no joins.
+    """
+
+    __tablename__ = "agenda_item"
+
+    agenda_item_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False
+    )
+    assignment_id = db.Column(
+        db.Integer,
+        db.ForeignKey("assignment.assignment_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    milestone_id = db.Column(
+        db.Integer,
+        db.ForeignKey("milestone.milestone_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    subtask_id = db.Column(
+        db.Integer,
+        db.ForeignKey("subtask.subtask_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    # "assignment", "milestone" or "subtask"
+    kind = db.Column(db.String(20), nullable=False)
+    title = db.Column(db.String(500), nullable=False)
+    assignment_title = db.Column(db.String(200), nullable=False)
+    due_date = db.Column(db.Date, nullable=False)
+    completed = db.Column(db.Boolean, default=False, nullable=False)
+
+    __table_args__ = (db.Index("ix_agenda_item_user_due_date", user_id, due_date),)
+
+
+class UsernameCounter(db.Model):
+    """Highest numeric username suffix handed out per base name.
+
+    ``backend.services.usernames`` turns ``john@...`` into ``john``, ``john1``,
+    ``john2``, ... by incrementing ``last_suffix`` (0 stands for the bare
+    base), so a signup allocates its username with one UPDATE and concurrent
+    signups queue on the counter row instead of racing on the user table.
+    """
+
+    __tablename__ = "username_counter"
+
+    base = db.Column(db.String(100), primary_key=True)
+    last_suffix = db.Column(db.Integer, nullable=False)
+
+
+class TaskSyncState(db.Model):
+    """Per-user, per-task-list watermark for incremental Google Tasks pulls.
+
+    ``updated_min`` is the newest ``updated`` timestamp seen in Google, sent
+    back as ``updatedMin`` so the next sync only lists tasks changed since.
+    """
+
+    __tablename__ = "task_sync_state"
+
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("user.user_id", ondelete="CASCADE"), primary_key=True
+    )
+    tasklist_id = db.Column(db.String(200), primary_key=True)
+    updated_min = db.Column(db.String(40), nullable=True)
+    synced_at = db.Column(db.DateTime, nullable=True)
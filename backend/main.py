@@ -15,47 +15,74 @@ load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from backend.database.models import User, db
+from backend.database.models import db
 
+CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
-def create_app():
+
+def create_db_app():
+    """Build an app with the configuration and database only.
+
+    No routes and no background workers; enough for the migration CLI.
+    """
     app = Flask(__name__)
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "super-secret-key")
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
     db.init_app(app)
+    return app
+
+
+def create_app():
+    app = create_db_app()
     # Настройка CORS для работы с фронтендом
     CORS(
         app,
         supports_credentials=True,
-        origins=["http://localhost:3000", "http://127.0.0.1:3000"],
-        allow_headers=["Content-Type", "Authorization"],
-        methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        origins=CORS_ORIGINS,
+        allow_headers=["Content-Type", "Authorization", "If-Match", "If-None-Match"],
+        methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
     login_manager = LoginManager()
     login_manager.init_app(app)
 
-    @login_manager.user_loader
-    def load_user(user_id):
-        return User.query.filter_by(user_id=int(user_id)).first()
+    # Cached per process (see backend.services.user_cache)
+    from backend.services.user_cache import load_user
+
+    login_manager.user_loader(load_user)
 
     # --- Register auth routes ---
     from backend.api.routes.assignments import assignments_bp
     from backend.api.routes.auth import auth_bp
+    from backend.api.routes.milestones import llm_bp, milestones_bp
+    from backend.api.routes.timeline import timeline_bp
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(assignments_bp)
+    app.register_blueprint(llm_bp)
+    app.register_blueprint(milestones_bp)
+    app.register_blueprint(timeline_bp)
 
     # --- Health check route ---
     @app.route("/health")
     def health():
         return jsonify({"status": "ok"})
 
-    # --- Ensure DB tables exist ---
-    with app.app_context():
-        db.create_all()
+    # The schema is managed by migrations: python -m backend.database.migrate upgrade
+
+    # --- Per-user cache of serialized GET responses ---
+    from backend.services.response_cache import ResponseCache
+
+    app.extensions["response_cache"] = ResponseCache()
+
+    # --- Background milestone generation (resumes unfinished jobs) ---
+    from backend.services.generation_jobs import GenerationWorkerPool
+
+    app.extensions["generation_jobs"] = GenerationWorkerPool(app)
+    app.extensions["generation_jobs"].resume()
 
     # --- Serve React frontend ---
     @app.route("/", defaults={"path": ""})
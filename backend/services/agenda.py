@@ -0,0 +1,132 @@
+"""
+Per-user agenda index behind ``GET /timeline``.
+
+``agenda_item`` holds one row per dated assignment, milestone and subtask,
+copied from the source tables. Routes that change an assignment tree call
+``refresh_assignments`` before committing; it rewrites those assignments'
+rows with one DELETE, three SELECTs and one INSERT, inside the same
+transaction as the change. Archived assignments have no rows.
+"""
+
+from sqlalchemy import delete, insert, select
+
+from backend.database.models import AgendaItem, Assignment, Milestone, Subtask, db
+
+MAX_RANGE_DAYS = 366
+
+
+def _agenda_rows(assignment_ids):
+    active = select(
+        Assignment.assignment_id,
+        Assignment.user_id,
+        Assignment.title,
+        Assignment.deadline,
+        Assignment.progress,
+    ).where(
+        Assignment.assignment_id.in_(assignment_ids),
+        Assignment.archived.is_(False),
+    )
+    assignments = {row.assignment_id: row for row in db.session.execute(active)}
+    if not assignments:
+        return []
+
+    rows = [
+        {
+            "user_id": a.user_id,
+            "assignment_id": a.assignment_id,
+            "milestone_id": None,
+            "subtask_id": None,
+            "kind": "assignment",
+            "title": a.title,
+            "due_date": a.deadline,
+            "completed": (a.progress or 0) >= 100,
+        }
+        for a in assignments.values()
+    ]
+    milestones = db.session.execute(
+        select(
+            Milestone.assignment_id,
+            Milestone.milestone_id,
+            Milestone.title,
+            Milestone.due_date,
+            Milestone.completed,
+        ).where(
+            Milestone.assignment_id.in_(assignments), Milestone.due_date.is_not(None)
+        )
+    )
+    rows += [
+        {
+            "user_id": assignments[m.assignment_id].user_id,
+            "assignment_id": m.assignment_id,
+            "milestone_id": m.milestone_id,
+            "subtask_id": None,
+            "kind": "milestone",
+            "title": m.title,
+            "due_date": m.due_date,
+            "completed": bool(m.completed),
+        }
+        for m in milestones
+    ]
+    subtasks = db.session.execute(
+        select(
+            Milestone.assignment_id,
+            Subtask.milestone_id,
+            Subtask.subtask_id,
+            Subtask.title,
+            Subtask.due_date,
+            Subtask.completed,
+        )
+        .join(Milestone, Milestone.milestone_id == Subtask.milestone_id)
+        .where(Milestone.assignment_id.in_(assignments), Subtask.due_date.is_not(None))
+    )
+    rows += [
+        {
+            "user_id": assignments[s.assignment_id].user_id,
+            "assignment_id": s.assignment_id,
+            "milestone_id": s.milestone_id,
+            "subtask_id": s.subtask_id,
+            "kind": "subtask",
+            "title": s.title,
+            "due_date": s.due_date,
+            "completed": bool(s.completed),
+        }
+        for s in subtasks
+    ]
+    for row in rows:
+        row["assignment_title"] = assignments[row["assignment_id"]].title
+    return rows
+
+
+def refresh_assignments(assignment_ids):
+    """Rebuild the agenda rows of the given assignments.
+
+    Flushes pending ORM changes first so the rows reflect what is about to
+    be committed. Does not commit.
+    """
+    assignment_ids = sorted(set(assignment_ids))
+    if not assignment_ids:
+        return
+    db.session.flush()
+    db.session.execute(
+        delete(AgendaItem).where(AgendaItem.assignment_id.in_(assignment_ids))
+    )
+    rows = _agenda_rows(assignment_ids)
+    if rows:
+        db.session.execute(insert(AgendaItem), rows)
+
+
+def timeline(user_id, start, end):
+    """Return the user's agenda items due between ``start`` and ``end``.
+
+    Items come back sorted by due date straight from the
+    (user_id, due_date) index.
+    """
+    return db.session.scalars(
+        select(AgendaItem)
+        .where(
+            AgendaItem.user_id == user_id,
+            AgendaItem.due_date >= start,
+            AgendaItem.due_date <= end,
+        )
+        .order_by(AgendaItem.due_date, AgendaItem.agenda_item_id)
+    ).all()
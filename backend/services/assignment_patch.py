@@ -0,0 +1,230 @@
+"""
+RFC 6902-style JSON Patch for assignment trees.
+
+Applies ``add``, ``remove``, ``replace``, ``move`` and ``test`` operations to
+an Assignment and its milestones/subtasks through the ORM, so only the rows
+an operation touches are written on flush. Paths mirror the JSON returned by
+the assignments API:
+
+- /title, /description, /deadline, /progress, /archived
+- /subtasks/{i}                  → milestone {"text", "completed"}
+- /subtasks/{i}/text, /subtasks/{i}/completed
+- /subtasks/{i}/children/{j}     → subtask {"title", "notes", "completed"}
+- /subtasks/{i}/children/{j}/title, .../notes, .../completed
+
+``-`` may be used as the index to append with ``add``.
+"""
+
+from backend.database.dates import parse_date
+from backend.database.models import Milestone, Subtask
+from backend.services.ordering import reorder_keys
+
+# field → (accepted types, nullable)
+_ASSIGNMENT_FIELDS = {
+    "title": (str, False),
+    "description": (str, True),
+    "deadline": (str, False),
+    "progress": (int, False),
+    "archived": (bool, False),
+}
+_MILESTONE_FIELDS = {"text": (str, False), "completed": (bool, False)}
+_SUBTASK_FIELDS = {
+    "title": (str, False),
+    "notes": (str, True),
+    "completed": (bool, False),
+}
+
+
+class PatchError(ValueError):
+    """Raised when a patch cannot be applied; ``status`` is the HTTP code."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_pointer(path):
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {path!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in path[1:].split("/")]
+
+
+def _check_value(fields, name, value):
+    if name not in fields:
+        raise PatchError(f"Unknown field: {name}")
+    types, nullable = fields[name]
+    if value is None and nullable:
+        return value
+    # bool is a subclass of int, but progress=True is not a valid value
+    if not isinstance(value, types) or (types is int and isinstance(value, bool)):
+        raise PatchError(f"Invalid value for {name}")
+    if name == "progress" and not 0 <= value <= 100:
+        raise PatchError("progress must be between 0 and 100")
+    if name in ("title", "text") and not value.strip():
+        raise PatchError(f"{name} cannot be empty")
+    if name == "deadline":
+        try:
+            return parse_date(value)
+        except ValueError as e:
+            raise PatchError(str(e)) from None
+    return value
+
+
+def _check_object(fields, value):
+    if not isinstance(value, dict):
+        raise PatchError("Value must be an object")
+    return {name: _check_value(fields, name, v) for name, v in value.items()}
+
+
+def _index(token, items, allow_end=False):
+    if allow_end and token == "-":
+        return len(items)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise PatchError(f"Invalid array index: {token}")
+    index = int(token)
+    if index > len(items) or (index == len(items) and not allow_end):
+        raise PatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _new_milestone(value):
+    values = _check_object(_MILESTONE_FIELDS, value)
+    text = values.get("text", "")
+    return Milestone(
+        title=text[:500], text=text, completed=values.get("completed", False)
+    )
+
+
+def _new_subtask(value):
+    values = _check_object(_SUBTASK_FIELDS, value)
+    if not values.get("title"):
+        raise PatchError("title is required")
+    return Subtask(
+        title=values["title"],
+        notes=values.get("notes"),
+        completed=values.get("completed", False),
+    )
+
+
+class _Patcher:
+    def __init__(self, assignment):
+        self.assignment = assignment
+        self.touched = set()
+
+    def resolve(self, tokens, allow_end=False):
+        """Return (collection or owner, index or field, fields, factory)."""
+        if len(tokens) == 1:
+            return self.assignment, tokens[0], _ASSIGNMENT_FIELDS, None
+        if tokens[0] != "subtasks":
+            raise PatchError(f"Unknown path: /{'/'.join(tokens)}")
+
+        milestones = self.assignment.milestones
+        if len(tokens) == 2:
+            return (
+                milestones,
+                _index(tokens[1], milestones, allow_end),
+                None,
+                _new_milestone,
+            )
+        milestone = milestones[_index(tokens[1], milestones)]
+        if len(tokens) == 3:
+            return milestone, tokens[2], _MILESTONE_FIELDS, None
+        if tokens[2] != "children":
+            raise PatchError(f"Unknown path: /{'/'.join(tokens)}")
+
+        self.touched.add(milestone)
+        subtasks = milestone.subtasks
+        if len(tokens) == 4:
+            return subtasks, _index(tokens[3], subtasks, allow_end), None, _new_subtask
+        subtask = subtasks[_index(tokens[3], subtasks)]
+        if len(tokens) == 5:
+            return subtask, tokens[4], _SUBTASK_FIELDS, None
+        raise PatchError(f"Unknown path: /{'/'.join(tokens)}")
+
+    def apply(self, operation):
+        if not isinstance(operation, dict):
+            raise PatchError("Each operation must be an object")
+        op = operation.get("op")
+        tokens = _parse_pointer(operation.get("path"))
+
+        if op == "move":
+            source, source_index, _, _ = self.resolve(
+                _parse_pointer(operation.get("from"))
+            )
+            item = source[source_index] if isinstance(source, list) else None
+            if item is None:
+                raise PatchError("move is only supported between array items")
+            source.pop(source_index)
+            target, target_index, _, _ = self.resolve(tokens, allow_end=True)
+            if target is not source:
+                source.insert(source_index, item)
+                raise PatchError("move is only supported within one array")
+            target.insert(target_index, item)
+            return
+
+        if op not in ("add", "remove", "replace", "test"):
+            raise PatchError(f"Unsupported operation: {op!r}")
+        if op != "remove" and "value" not in operation:
+            raise PatchError(f"'{op}' requires a value")
+        value = operation.get("value")
+        target, key, fields, factory = self.resolve(tokens, allow_end=op == "add")
+
+        if isinstance(target, list):
+            if op == "add":
+                target.insert(key, factory(value))
+            elif op == "remove":
+                target.pop(key)
+            elif op == "replace":
+                target[key] = factory(value)
+            else:
+                raise PatchError("test is only supported on fields")
+            return
+
+        if op == "remove":
+            raise PatchError("Fields cannot be removed")
+        value = _check_value(fields, key, value)
+        if op == "test":
+            if getattr(target, key) != value:
+                raise PatchError(f"Test failed at {operation['path']}", status=409)
+            return
+        setattr(target, key, value)
+        if key == "text":
+            target.title = value[:500]
+
+    def renumber(self):
+        """Give new and moved items ordering keys (see ``ordering``).
+
+        Items that kept their relative place keep their key, so only the
+        rows an operation moved or added get an ``order`` written.
+        """
+        _reorder(self.assignment.milestones)
+        for milestone in self.touched:
+            _reorder(milestone.subtasks)
+
+
+def _reorder(items):
+    # Keyed by object: new items have no primary key until flush
+    changes = reorder_keys({item: item.order for item in items}, items)
+    for item, key in changes.items():
+        item.order = key
+
+
+def apply_patch(assignment, operations):
+    """
+    Apply a list of patch operations to an assignment tree in memory.
+
+    Nothing is committed; on error the caller should roll back the session.
+
+    Args:
+        assignment: Assignment model instance
+        operations: List of RFC 6902 operation objects
+
+    Raises:
+        PatchError: If an operation is invalid or a ``test`` fails
+    """
+    if not isinstance(operations, list):
+        raise PatchError("Patch body must be a list of operations")
+    patcher = _Patcher(assignment)
+    for operation in operations:
+        patcher.apply(operation)
+    patcher.renumber()
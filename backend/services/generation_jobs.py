@@ -0,0 +1,278 @@
+"""
+Background milestone generation.
+
+POST /assignments can commit the assignment right away with
+``status="generating"`` and leave the slow Claude call to a bounded worker
+pool. Jobs are rows in the ``generation_job`` table, so anything queued or in
+flight when a process stops is resumed on the next startup.
+
+Also holds the helpers that turn ``split_assignment`` output (or the
+fallback plan) into Milestone rows, shared with the synchronous path. Jobs
+follow LOCAL_PLANNER_MODE (see ``local_planner``): short descriptions may be
+planned locally without the LLM, and when the LLM keeps failing the local
+plan replaces it unless the mode is "off".
+
+Configuration (environment variables):
+- LLM_ASYNC_GENERATION: make background generation the default (default false)
+- GENERATION_WORKERS: concurrent generation jobs per process (default 4)
+- GENERATION_MAX_ATTEMPTS: LLM attempts before falling back (default 3);
+  invalid inputs (``ValueError``) fall back without retrying
+- GENERATION_RETRY_DELAY: base retry delay in seconds, doubled per attempt
+- GENERATION_STALE_AFTER: seconds before a "running" job is considered lost
+"""
+
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.database.dates import parse_date
+from backend.database.models import Assignment, GenerationJob, Milestone, db
+from backend.services.agenda import refresh_assignments
+from backend.services.llm_splitter import split_assignment
+from backend.services.local_planner import (
+    fallback_plan,
+    plan_assignment,
+    prefers_local,
+)
+from backend.services.response_cache import bump_data_version
+
+ASYNC_GENERATION = os.getenv("LLM_ASYNC_GENERATION", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+_WORKERS = int(os.getenv("GENERATION_WORKERS", "4"))
+_MAX_ATTEMPTS = int(os.getenv("GENERATION_MAX_ATTEMPTS", "3"))
+_RETRY_DELAY = float(os.getenv("GENERATION_RETRY_DELAY", "2"))
+_STALE_AFTER = int(os.getenv("GENERATION_STALE_AFTER", "600"))
+
+DEFAULT_MILESTONES = [
+    "Research and gather information",
+    "Create initial outline or plan",
+    "Draft first version",
+    "Review and revise content",
+    "Final proofreading and editing",
+    "Submit or present final work",
+]
+
+
+def _due_date(value):
+    """Parse an LLM-suggested date, dropping ones that do not parse."""
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def milestones_from_split(assignment_id, llm_milestones):
+    """Build Milestone rows from the dicts returned by ``split_assignment``."""
+    milestones = []
+    for idx, milestone_data in enumerate(llm_milestones):
+        # Use title as the main text, with description as additional context
+        title = milestone_data.get("title", f"Milestone {idx + 1}")
+        description_text = milestone_data.get("description", "")
+
+        milestone_text = f"{title}"
+        if description_text:
+            milestone_text += f": {description_text[:200]}"  # Truncate long text
+
+        milestones.append(
+            Milestone(
+                assignment_id=assignment_id,
+                title=title[:500],
+                text=milestone_text,
+                description=description_text,
+                due_date=_due_date(milestone_data.get("suggested_end_date")),
+                completed=False,
+                order=idx,
+            )
+        )
+    return milestones
+
+
+def default_milestones(assignment_id):
+    """Build the generic Milestone rows used when the LLM is unavailable."""
+    return [
+        Milestone(
+            assignment_id=assignment_id,
+            title=text,
+            text=text,
+            completed=False,
+            order=idx,
+        )
+        for idx, text in enumerate(DEFAULT_MILESTONES)
+    ]
+
+
+def fallback_milestones(assignment_id, description, deadline):
+    """Build the Milestone rows used when the LLM failed.
+
+    This is the local plan, or the generic list when LOCAL_PLANNER_MODE is
+    "off" or the inputs cannot be planned (e.g. a past deadline).
+    """
+    plan = fallback_plan(description, deadline)
+    if plan is None:
+        return default_milestones(assignment_id)
+    return milestones_from_split(assignment_id, plan)
+
+
+def create_job(assignment):
+    """Mark an assignment as generating and add a pending job for it.
+
+    The caller commits the session, then passes ``job.job_id`` to
+    ``GenerationWorkerPool.submit``.
+    """
+    assignment.status = "generating"
+    job = GenerationJob(assignment_id=assignment.assignment_id, status="pending")
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+class GenerationWorkerPool:
+    """Runs generation jobs on a bounded thread pool with retries.
+
+    Each attempt first claims the job with a conditional UPDATE
+    (pending → running), so a job resumed by several processes is still
+    only run once at a time.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_workers=_WORKERS,
+        max_attempts=_MAX_ATTEMPTS,
+        retry_delay=_RETRY_DELAY,
+        split_fn=split_assignment,
+    ):
+        self.app = app
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.split_fn = split_fn
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="milestone-generation"
+        )
+
+    def submit(self, job_id):
+        """Queue a job for execution on the pool."""
+        return self.executor.submit(self._run_safely, job_id)
+
+    def resume(self, stale_after=_STALE_AFTER):
+        """Requeue pending jobs and running jobs whose worker went away."""
+        with self.app.app_context():
+            cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+            try:
+                GenerationJob.query.filter(
+                    GenerationJob.status == "running",
+                    GenerationJob.updated_at < cutoff,
+                ).update({"status": "pending"}, synchronize_session=False)
+                db.session.commit()
+                job_ids = [
+                    job_id
+                    for (job_id,) in db.session.query(GenerationJob.job_id).filter_by(
+                        status="pending"
+                    )
+                ]
+            except SQLAlchemyError as e:
+                # Startup must not fail before migrations have been applied
+                db.session.rollback()
+                print(
+                    f"[JOBS] Could not resume jobs, is the schema migrated? "
+                    f"({type(e).__name__})",
+                    flush=True,
+                )
+                return []
+        for job_id in job_ids:
+            self.submit(job_id)
+        return job_ids
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+    def _run_safely(self, job_id):
+        try:
+            self.run(job_id)
+        except Exception:
+            print(f"[JOBS] Job {job_id} crashed", flush=True)
+            traceback.print_exc()
+
+    def _retry_later(self, job_id, attempts):
+        delay = self.retry_delay * 2 ** (attempts - 1)
+        timer = threading.Timer(delay, self.submit, args=(job_id,))
+        timer.daemon = True
+        timer.start()
+
+    def run(self, job_id):
+        """Run one attempt of a job in the calling thread.
+
+        Returns:
+            str: The job status afterwards, or None if the job could not be
+            claimed (already running or finished).
+        """
+        with self.app.app_context():
+            claimed = GenerationJob.query.filter_by(
+                job_id=job_id, status="pending"
+            ).update(
+                {
+                    "status": "running",
+                    "attempts": GenerationJob.attempts + 1,
+                    "updated_at": datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            db.session.commit()
+            if not claimed:
+                return None
+
+            job = db.session.get(GenerationJob, job_id)
+            assignment = db.session.get(Assignment, job.assignment_id)
+            print(
+                f"[JOBS] Generating milestones for assignment "
+                f"{assignment.assignment_id} (attempt {job.attempts})",
+                flush=True,
+            )
+
+            try:
+                if prefers_local(assignment.description):
+                    print("[JOBS] Short description, using local planner", flush=True)
+                    llm_milestones = plan_assignment(
+                        assignment.description, assignment.deadline
+                    )
+                else:
+                    llm_milestones = self.split_fn(
+                        assignment.description, assignment.deadline
+                    )
+                milestones = milestones_from_split(
+                    assignment.assignment_id, llm_milestones
+                )
+                job.status = "done"
+                job.last_error = None
+            except Exception as e:
+                print(f"[JOBS] ❌ LLM FAILED: {e}", flush=True)
+                job.last_error = str(e)
+                # Invalid inputs (ValueError) fail the same way on every try
+                if job.attempts < self.max_attempts and not isinstance(e, ValueError):
+                    job.status = "pending"
+                    job.updated_at = datetime.utcnow()
+                    db.session.commit()
+                    self._retry_later(job_id, job.attempts)
+                    return job.status
+                print(f"[JOBS] ⚠️  Using fallback milestones instead", flush=True)
+                milestones = fallback_milestones(
+                    assignment.assignment_id,
+                    assignment.description,
+                    assignment.deadline,
+                )
+                job.status = "failed"
+
+            db.session.add_all(milestones)
+            assignment.status = "ready"
+            refresh_assignments([assignment.assignment_id])
+            bump_data_version(assignment.user_id)
+            job.updated_at = datetime.utcnow()
+            db.session.commit()
+            return job.status
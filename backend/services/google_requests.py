@@ -0,0 +1,366 @@
+"""
+Shared executor for Google Tasks API requests: rate limiting and retries.
+
+Every call to the Tasks API goes through ``executor`` so bulk syncs slow down
+instead of failing when they run into quota:
+
+- Rate limiting. Calls draw from two token buckets, one for the user the
+  call is made for and one for the whole process (the project's quota).
+  A call that finds a bucket empty waits until it has refilled. A batch
+  HTTP request draws one token per call in it, since Google counts those
+  calls separately.
+- Retries. Calls answered with 429, a 403 quota error (``rateLimitExceeded``
+  / ``userRateLimitExceeded``) or a 5xx are retried with exponential backoff
+  and full jitter, up to GOOGLE_TASKS_MAX_RETRIES times. A ``Retry-After``
+  header sets the minimum wait and also holds back the user's other calls
+  for that long. Failed calls inside a batch are retried together in a
+  smaller batch.
+- Retry budget. Retries are paid for from a process-wide budget that each
+  new call tops up by GOOGLE_TASKS_RETRY_RATIO (up to
+  GOOGLE_TASKS_RETRY_BURST). While the API keeps failing, retries stay a
+  fraction of the traffic instead of multiplying it. A call that finds the
+  budget empty fails with its original ``HttpError``.
+
+``get_executor_stats()`` reports how many calls were throttled, retried or
+given up on.
+
+Configuration (environment variables):
+- GOOGLE_TASKS_USER_QPS: calls per second per user (default 10, 0 disables)
+- GOOGLE_TASKS_PROJECT_QPS: calls per second per process (default 50,
+  0 disables)
+- GOOGLE_TASKS_BURST: calls a bucket allows back to back (default 50)
+- GOOGLE_TASKS_MAX_RETRIES: retries per call (default 5)
+- GOOGLE_TASKS_BACKOFF_BASE: first backoff ceiling in seconds (default 0.5)
+- GOOGLE_TASKS_BACKOFF_MAX: largest backoff in seconds (default 32)
+- GOOGLE_TASKS_RETRY_RATIO: retries earned per call (default 0.2)
+- GOOGLE_TASKS_RETRY_BURST: most retries held in the budget (default 20)
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from googleapiclient.errors import HttpError
+
+_USER_QPS = float(os.getenv("GOOGLE_TASKS_USER_QPS", "10"))
+_PROJECT_QPS = float(os.getenv("GOOGLE_TASKS_PROJECT_QPS", "50"))
+_BURST = float(os.getenv("GOOGLE_TASKS_BURST", "50"))
+_MAX_RETRIES = int(os.getenv("GOOGLE_TASKS_MAX_RETRIES", "5"))
+_BACKOFF_BASE = float(os.getenv("GOOGLE_TASKS_BACKOFF_BASE", "0.5"))
+_BACKOFF_MAX = float(os.getenv("GOOGLE_TASKS_BACKOFF_MAX", "32"))
+_RETRY_RATIO = float(os.getenv("GOOGLE_TASKS_RETRY_RATIO", "0.2"))
+_RETRY_BURST = float(os.getenv("GOOGLE_TASKS_RETRY_BURST", "20"))
+
+# Idle per-user buckets kept before the least recently used is dropped
+_MAX_USER_BUCKETS = 4096
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_QUOTA_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+def _reason(error):
+    """Return the first ``reason`` in an API error body, or None."""
+    try:
+        body = json.loads(error.content)
+        return body["error"]["errors"][0]["reason"]
+    except (ValueError, TypeError, KeyError, IndexError):
+        return None
+
+
+def is_rate_limited(error):
+    """Whether ``error`` is Google refusing the call for quota reasons."""
+    status = error.resp.status
+    return status == 429 or (status == 403 and _reason(error) in _QUOTA_REASONS)
+
+
+def is_retryable(error):
+    """Whether a call that failed with ``error`` may succeed if retried."""
+    return isinstance(error, HttpError) and (
+        error.resp.status in _RETRY_STATUSES or is_rate_limited(error)
+    )
+
+
+def _retry_after(error):
+    """Return the ``Retry-After`` of an error response in seconds (0 if none)."""
+    try:
+        return max(0.0, float(error.resp.get("retry-after", 0)))
+    except ValueError:
+        return 0.0  # HTTP-date form; fall back to backoff
+
+
+class TokenBucket:
+    """Token bucket from which callers reserve tokens ahead of time.
+
+    ``reserve`` always takes the tokens and returns how long the caller must
+    wait for them, so the balance can go negative. Concurrent callers thus
+    queue up behind each other, and a batch larger than the bucket simply
+    waits longer.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self, tokens=1):
+        """Take ``tokens`` and return the seconds to wait before using them."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def pause(self, seconds):
+        """Empty the bucket so the next token is ready in ``seconds``."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class RetryBudget:
+    """Process-wide allowance of retries, earned by making calls."""
+
+    def __init__(self, ratio=_RETRY_RATIO, burst=_RETRY_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._balance = burst
+        self._lock = threading.Lock()
+
+    def deposit(self, calls=1):
+        with self._lock:
+            self._balance = min(self.burst, self._balance + calls * self.ratio)
+
+    def withdraw(self, retries):
+        """Take up to ``retries`` retries; return how many were granted."""
+        with self._lock:
+            granted = min(retries, int(self._balance))
+            self._balance -= granted
+            return granted
+
+
+class ExecutorStats:
+    """Counters for throttled, retried and abandoned calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.throttled = 0
+            self.throttled_seconds = 0.0
+            self.rate_limited = 0
+            self.server_errors = 0
+            self.retries = 0
+            self.backoff_seconds = 0.0
+            self.exhausted = 0
+            self.budget_denied = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict:
+        """Return the current counters as a dict."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "rate_limited": self.rate_limited,
+                "server_errors": self.server_errors,
+                "retries": self.retries,
+                "backoff_seconds": round(self.backoff_seconds, 3),
+                "exhausted": self.exhausted,
+                "budget_denied": self.budget_denied,
+            }
+
+
+class RequestExecutor:
+    """Runs Tasks API requests under the rate limits and retry policy."""
+
+    def __init__(
+        self,
+        user_rate=_USER_QPS,
+        project_rate=_PROJECT_QPS,
+        burst=_BURST,
+        max_retries=_MAX_RETRIES,
+        backoff_base=_BACKOFF_BASE,
+        backoff_max=_BACKOFF_MAX,
+        budget=None,
+        sleep=time.sleep,
+        clock=time.monotonic,
+        jitter=random.random,
+    ):
+        self.user_rate = user_rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget or RetryBudget()
+        self.stats = ExecutorStats()
+        self._project = TokenBucket(project_rate, burst, clock)
+        self._users = OrderedDict()
+        self._users_lock = threading.Lock()
+        self._sleep = sleep
+        self._clock = clock
+        self._jitter = jitter
+
+    def _user_bucket(self, user_key):
+        with self._users_lock:
+            bucket = self._users.get(user_key)
+            if bucket is None:
+                bucket = self._users[user_key] = TokenBucket(
+                    self.user_rate, self.burst, self._clock
+                )
+                while len(self._users) > _MAX_USER_BUCKETS:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(user_key)
+            return bucket
+
+    def begin(self, calls=1):
+        """Count ``calls`` new calls (not retries) and earn retry budget."""
+        self.stats.add(calls=calls)
+        self.budget.deposit(calls)
+
+    def reserve(self, user_key, calls=1):
+        """Reserve ``calls`` from both buckets; return the seconds to wait."""
+        wait = max(
+            self._user_bucket(user_key).reserve(calls), self._project.reserve(calls)
+        )
+        if wait > 0:
+            self.stats.add(throttled=calls, throttled_seconds=wait)
+        return wait
+
+    def plan_retry(self, errors, attempt, user_key):
+        """Decide whether retryable ``errors`` from one round are retried.
+
+        Args:
+            errors: HttpErrors (all retryable) that failed on try ``attempt``
+            attempt: 0 for the first try
+            user_key: Key of the user the calls were made for
+
+        Returns:
+            tuple: (calls that may be retried, seconds to wait first); the
+            first ``count`` errors are the ones to retry
+        """
+        rate_limited = sum(1 for error in errors if is_rate_limited(error))
+        self.stats.add(
+            rate_limited=rate_limited, server_errors=len(errors) - rate_limited
+        )
+        if attempt >= self.max_retries:
+            self.stats.add(exhausted=len(errors))
+            return 0, 0.0
+
+        granted = self.budget.withdraw(len(errors))
+        if granted < len(errors):
+            self.stats.add(budget_denied=len(errors) - granted)
+        if not granted:
+            return 0, 0.0
+
+        retry_after = max(_retry_after(error) for error in errors)
+        if retry_after:
+            self._user_bucket(user_key).pause(retry_after)
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        delay = max(retry_after, self._jitter() * ceiling)
+        self.stats.add(retries=granted, backoff_seconds=delay)
+        return granted, delay
+
+    def execute(self, request, user_key=None):
+        """Run one ``HttpRequest``, retrying it per the policy.
+
+        Raises:
+            HttpError: The last error once the call is not retried further
+        """
+        self.begin()
+        attempt = 0
+        while True:
+            self._sleep_for(self.reserve(user_key))
+            try:
+                return request.execute()
+            except HttpError as e:
+                if not is_retryable(e):
+                    raise
+                granted, delay = self.plan_retry([e], attempt, user_key)
+                if not granted:
+                    raise
+                self._sleep_for(delay)
+                attempt += 1
+
+    def execute_batch(self, service, calls, user_key=None, batch_size=50):
+        """Run (request_id, HttpRequest) pairs in batch HTTP requests.
+
+        Calls that fail with a retryable error are sent again in later
+        rounds; other results are final.
+
+        Returns:
+            dict: str(request_id) → response, or the HttpError for that call
+        """
+        results = {}
+        pending = [(str(request_id), call) for request_id, call in calls]
+        self.begin(len(pending))
+
+        def _collect(request_id, response, exception):
+            results[request_id] = exception if exception is not None else response
+
+        attempt = 0
+        while pending:
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start : start + batch_size]
+                self._sleep_for(self.reserve(user_key, len(chunk)))
+                batch = service.new_batch_http_request(callback=_collect)
+                for request_id, call in chunk:
+                    batch.add(call, request_id=request_id)
+                try:
+                    batch.execute()
+                except HttpError as e:
+                    # The batch request itself was refused
+                    for request_id, _ in chunk:
+                        results[request_id] = e
+
+            failed = [
+                (request_id, call)
+                for request_id, call in pending
+                if is_retryable(results.get(request_id))
+            ]
+            if not failed:
+                break
+            granted, delay = self.plan_retry(
+                [results[request_id] for request_id, _ in failed], attempt, user_key
+            )
+            pending = failed[:granted]
+            self._sleep_for(delay)
+            attempt += 1
+
+        return results
+
+    def _sleep_for(self, seconds):
+        if seconds > 0:
+            self._sleep(seconds)
+
+
+executor = RequestExecutor()
+
+
+def get_executor_stats() -> dict:
+    """Return counts of throttled, retried and abandoned Google API calls."""
+    return executor.stats.snapshot()
@@ -5,20 +5,44 @@ Provides functions to interact with Google Tasks API:
 - Creating tasks
 - Updating task status (completed/needsAction)
 - Deleting tasks
+- Pushing a whole assignment tree in batched HTTP requests
+- Listing changed tasks and batched updates (used by ``tasks_sync``)
 
 All functions accept a `credentials` parameter for dependency injection,
-allowing for easier testing and flexible authentication handling.
+allowing for easier testing and flexible authentication handling. Requests
+run through ``google_requests.executor``, which rate-limits them per user
+(``user_key``, by default the access token) and per process and retries
+quota and server errors with backoff.
 """
 
-from datetime import datetime
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
 
 from dotenv import load_dotenv
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
 from googleapiclient.errors import HttpError
 
+from backend.services.google_requests import executor
+
 load_dotenv()
 
+# Calls per batch HTTP request (the API accepts up to 1000)
+_BATCH_SIZE = int(os.getenv("GOOGLE_TASKS_BATCH_SIZE", "50"))
+_SERVICE_CACHE_SIZE = int(os.getenv("GOOGLE_TASKS_SERVICE_CACHE_SIZE", "64"))
+# Tasks per page when listing (the API maximum is 100)
+_LIST_PAGE_SIZE = 100
+
+# Discovery document shipped with the app, parsed once at import
+_DISCOVERY_PATH = os.path.join(os.path.dirname(__file__), "discovery", "tasks.v1.json")
+with open(_DISCOVERY_PATH, encoding="utf-8") as f:
+    _DISCOVERY_DOCUMENT = json.load(f)
+
+_thread_state = threading.local()
+
 
 def get_credentials_from_token(access_token):
     """
@@ -41,12 +65,33 @@ def get_credentials_from_token(access_token):
     return credentials
 
 
-def _get_tasks_service(credentials):
+def _service_cache():
+    """Return this thread's LRU of built services (httplib2 is not thread-safe)."""
+    cache = getattr(_thread_state, "services", None)
+    if cache is None:
+        cache = _thread_state.services = OrderedDict()
+    return cache
+
+
+def clear_service_cache():
+    """Drop the calling thread's cached service objects."""
+    _service_cache().clear()
+
+
+def _get_tasks_service(credentials, http=None):
     """
-    Build and return a Google Tasks API service instance.
+    Return a Google Tasks API service instance.
+
+    Services are built from the bundled discovery document (no network) and
+    cached per thread, keyed by the credentials' access token. An entry is
+    rebuilt once its token has expired, and the least recently used entry
+    is evicted beyond GOOGLE_TASKS_SERVICE_CACHE_SIZE.
 
     Args:
         credentials: OAuth2 credentials object with valid access token
+        http: Optional pre-authorized httplib2-compatible transport, used
+              instead of credentials (e.g. a fake transport in tests); not
+              cached
 
     Returns:
         Google Tasks API service instance
@@ -54,7 +99,7 @@ def _get_tasks_service(credentials):
     Raises:
         RuntimeError: If credentials are invalid or missing
     """
-    if not credentials:
+    if not credentials and http is None:
         raise RuntimeError(
             "Google Tasks credentials are required. "
             "Ensure OAuth2 authentication is completed and "
@@ -62,12 +107,53 @@ def _get_tasks_service(credentials):
         )
 
     try:
-        service = build("tasks", "v1", credentials=credentials)
+        if http is not None:
+            return build_from_document(_DISCOVERY_DOCUMENT, http=http)
+
+        cache = _service_cache()
+        key = getattr(credentials, "token", None) or id(credentials)
+        entry = cache.get(key)
+        if entry is not None:
+            service, expiry = entry
+            if expiry is None or expiry > datetime.utcnow():
+                cache.move_to_end(key)
+                return service
+            del cache[key]
+
+        service = build_from_document(_DISCOVERY_DOCUMENT, credentials=credentials)
+        cache[key] = (service, getattr(credentials, "expiry", None))
+        while len(cache) > _SERVICE_CACHE_SIZE:
+            cache.popitem(last=False)
         return service
     except Exception as e:
         raise RuntimeError(f"Failed to build Google Tasks service: {e}")
 
 
+def _format_due(due_date):
+    """
+    Convert a due date to the RFC3339 string the Tasks API expects.
+
+    Args:
+        due_date: date or datetime (as stored), RFC3339 or ISO date string
+
+    Returns:
+        str or None: RFC3339 timestamp, or None if due_date is empty
+    """
+    if not due_date:
+        return None
+    if isinstance(due_date, datetime):
+        return due_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+    if isinstance(due_date, date):
+        return f"{due_date.isoformat()}T00:00:00Z"
+    if "T" in due_date:
+        return due_date
+    try:
+        parsed_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
+        return parsed_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return due_date
+
+
 def create_task(
     tasklist_id,
     title,
@@ -75,6 +161,7 @@ def create_task(
     due_date=None,
     parent=None,
     credentials=None,
+    user_key=None,
 ):
     """
     Create a new task in the specified task list.
@@ -88,6 +175,7 @@ def create_task(
                   (optional)
         parent: Parent task ID to create this as a subtask (optional)
         credentials: OAuth2 credentials object (required)
+        user_key: Rate-limit key of the user (optional, see ``_user_key``)
 
     Returns:
         dict: Created task object with id, title, notes, due, status, etc.
@@ -111,36 +199,18 @@ def create_task(
         task_body["notes"] = notes
 
     if due_date:
-        if isinstance(due_date, str):
-            try:
-                if "T" in due_date:
-                    task_body["due"] = due_date
-                else:
-                    parsed_date = datetime.fromisoformat(
-                        due_date.replace("Z", "+00:00")
-                    )
-                    task_body["due"] = parsed_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-            except ValueError:
-                task_body["due"] = due_date
-        elif isinstance(due_date, datetime):
-            task_body["due"] = due_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+        task_body["due"] = _format_due(due_date)
 
     if parent:
         task_body["parent"] = parent
 
-    try:
-        task = service.tasks().insert(tasklist=tasklist_id, body=task_body).execute()
+    return executor.execute(
+        service.tasks().insert(tasklist=tasklist_id, body=task_body),
+        _user_key(credentials, user_key),
+    )
 
-        return task
-    except HttpError as e:
-        error_msg = e.error_details if hasattr(e, "error_details") else str(e)
-        raise HttpError(
-            e.resp.status,
-            f"Failed to create task: {error_msg}",
-        )
 
-
-def update_task_status(tasklist_id, task_id, status, credentials=None):
+def update_task_status(tasklist_id, task_id, status, credentials=None, user_key=None):
     """
     Update the status of an existing task.
 
@@ -149,6 +219,7 @@ def update_task_status(tasklist_id, task_id, status, credentials=None):
         task_id: ID of the task to update
         status: New status - either "needsAction" or "completed"
         credentials: OAuth2 credentials object (required)
+        user_key: Rate-limit key of the user (optional, see ``_user_key``)
 
     Returns:
         dict: Updated task object
@@ -176,23 +247,13 @@ def update_task_status(tasklist_id, task_id, status, credentials=None):
     if status == "completed":
         task_body["completed"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    try:
-        task = (
-            service.tasks()
-            .patch(tasklist=tasklist_id, task=task_id, body=task_body)
-            .execute()
-        )
-
-        return task
-    except HttpError as e:
-        error_msg = e.error_details if hasattr(e, "error_details") else str(e)
-        raise HttpError(
-            e.resp.status,
-            f"Failed to update task status: {error_msg}",
-        )
+    return executor.execute(
+        service.tasks().patch(tasklist=tasklist_id, task=task_id, body=task_body),
+        _user_key(credentials, user_key),
+    )
 
 
-def delete_task(tasklist_id, task_id, credentials=None):
+def delete_task(tasklist_id, task_id, credentials=None, user_key=None):
     """
     Delete a task from the specified task list.
 
@@ -200,6 +261,7 @@ def delete_task(tasklist_id, task_id, credentials=None):
         tasklist_id: ID of the task list containing the task
         task_id: ID of the task to delete
         credentials: OAuth2 credentials object (required)
+        user_key: Rate-limit key of the user (optional, see ``_user_key``)
 
     Returns:
         None (task is deleted)
@@ -218,14 +280,240 @@ def delete_task(tasklist_id, task_id, credentials=None):
     service = _get_tasks_service(credentials)
 
     try:
-        service.tasks().delete(tasklist=tasklist_id, task=task_id).execute()
-        return None
+        executor.execute(
+            service.tasks().delete(tasklist=tasklist_id, task=task_id),
+            _user_key(credentials, user_key),
+        )
     except HttpError as e:
-        if e.resp.status == 404:
-            return None
+        if e.resp.status != 404:
+            raise
+    return None
+
+
+def batch_insert_tasks(tasklist_id, tasks, credentials=None, http=None, user_key=None):
+    """
+    Create many tasks using batched HTTP requests.
 
-        error_msg = e.error_details if hasattr(e, "error_details") else str(e)
-        raise HttpError(
-            e.resp.status,
-            f"Failed to delete task: {error_msg}",
+    Calls are grouped into batches of up to ``_BATCH_SIZE`` so N tasks cost
+    about N / _BATCH_SIZE round trips instead of N.
+
+    Args:
+        tasklist_id: ID of the task list to add the tasks to
+        tasks: Iterable of (request_id, task_body, parent_id or None)
+        credentials: OAuth2 credentials object (required unless http given)
+        http: Optional transport, see ``_get_tasks_service``
+        user_key: Rate-limit key of the user (optional, see ``_user_key``)
+
+    Returns:
+        dict: request_id → created task dict, or the HttpError for that call
+
+    Raises:
+        RuntimeError: If credentials are missing or invalid
+        ValueError: If tasklist_id is missing
+    """
+    if not tasklist_id:
+        raise ValueError("Task list ID is required")
+
+    tasks = list(tasks)
+    if not tasks:
+        return {}
+
+    service = _get_tasks_service(credentials, http=http)
+    return _execute_batches(
+        service,
+        [
+            (
+                request_id,
+                service.tasks().insert(
+                    tasklist=tasklist_id,
+                    body=body,
+                    **({"parent": parent} if parent else {}),
+                ),
+            )
+            for request_id, body, parent in tasks
+        ],
+        _user_key(credentials, user_key),
+    )
+
+
+def batch_patch_tasks(tasklist_id, patches, credentials=None, http=None, user_key=None):
+    """
+    Update many tasks using batched HTTP requests.
+
+    Args:
+        tasklist_id: ID of the task list holding the tasks
+        patches: Iterable of (request_id, task_id, partial task body)
+        credentials: OAuth2 credentials object (required unless http given)
+        http: Optional transport, see ``_get_tasks_service``
+        user_key: Rate-limit key of the user (optional, see ``_user_key``)
+
+    Returns:
+        dict: request_id → updated task dict, or the HttpError for that call
+    """
+    if not tasklist_id:
+        raise ValueError("Task list ID is required")
+
+    patches = list(patches)
+    if not patches:
+        return {}
+
+    service = _get_tasks_service(credentials, http=http)
+    return _execute_batches(
+        service,
+        [
+            (
+                request_id,
+                service.tasks().patch(tasklist=tasklist_id, task=task_id, body=body),
+            )
+            for request_id, task_id, body in patches
+        ],
+        _user_key(credentials, user_key),
+    )
+
+
+def _execute_batches(service, calls, user_key):
+    """Run (request_id, HttpRequest) pairs in batches of ``_BATCH_SIZE``."""
+    return executor.execute_batch(
+        service, calls, user_key=user_key, batch_size=_BATCH_SIZE
+    )
+
+
+def _user_key(credentials, user_key):
+    """Return the key a user's calls are rate-limited under.
+
+    Callers that know the user pass its ID; otherwise calls made with the
+    same access token share a bucket.
+    """
+    if user_key is not None:
+        return user_key
+    return getattr(credentials, "token", None) or "default"
+
+
+def list_tasks(
+    tasklist_id, updated_min=None, credentials=None, http=None, user_key=None
+):
+    """
+    List the tasks of a task list, following ``nextPageToken``.
+
+    Completed, hidden and deleted tasks are included, so callers see every
+    kind of change.
+
+    Args:
+        tasklist_id: ID of the task list
+        updated_min: Optional RFC3339 timestamp; only tasks updated at or
+                     after it are returned
+        credentials: OAuth2 credentials object (required unless http given)
+        http: Optional transport, see ``_get_tasks_service``
+        user_key: Rate-limit key of the user (optional, see ``_user_key``)
+
+    Returns:
+        list: Task dicts
+    """
+    if not tasklist_id:
+        raise ValueError("Task list ID is required")
+
+    service = _get_tasks_service(credentials, http=http)
+    params = {
+        "tasklist": tasklist_id,
+        "showCompleted": True,
+        "showDeleted": True,
+        "showHidden": True,
+        "maxResults": _LIST_PAGE_SIZE,
+    }
+    if updated_min:
+        params["updatedMin"] = updated_min
+
+    tasks = []
+    page_token = None
+    while True:
+        if page_token:
+            params["pageToken"] = page_token
+        response = executor.execute(
+            service.tasks().list(**params), _user_key(credentials, user_key)
         )
+        tasks.extend(response.get("items", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return tasks
+
+
+def _task_body(title, notes, due_date, completed):
+    body = {"title": title, "status": "completed" if completed else "needsAction"}
+    if notes:
+        body["notes"] = notes
+    due = _format_due(due_date)
+    if due:
+        body["due"] = due
+    return body
+
+
+def sync_assignment_tasks(tasklist_id, assignment, credentials=None, http=None):
+    """
+    Push an assignment's milestones and subtasks to Google Tasks in bulk.
+
+    Milestones without a ``google_task_id`` are created in one batched round,
+    then their subtasks are created under them (``parent``) in a second one.
+    The returned task IDs are written to ``Milestone.google_task_id`` and
+    ``Subtask.google_task_id``; the caller commits the session.
+
+    Args:
+        tasklist_id: ID of the task list to sync into
+        assignment: Assignment model instance (with milestones and subtasks)
+        credentials: OAuth2 credentials object (required unless http given)
+        http: Optional transport, see ``_get_tasks_service``
+
+    Returns:
+        dict: Counts of created milestones/subtasks and a list of failures
+    """
+    summary = {"milestonesCreated": 0, "subtasksCreated": 0, "failed": []}
+
+    def _apply(rows, results):
+        created = 0
+        for key, row in rows.items():
+            result = results.get(key)
+            if isinstance(result, dict) and result.get("id"):
+                row.google_task_id = result["id"]
+                # Just pushed: in sync until the next local change
+                row.updated_at = row.synced_at = datetime.utcnow()
+                created += 1
+            else:
+                summary["failed"].append({"key": key, "error": str(result)})
+        return created
+
+    milestones = {
+        f"m{m.milestone_id}": m for m in assignment.milestones if not m.google_task_id
+    }
+    results = batch_insert_tasks(
+        tasklist_id,
+        [
+            (key, _task_body(m.title, m.description, m.due_date, m.completed), None)
+            for key, m in milestones.items()
+        ],
+        credentials=credentials,
+        http=http,
+        user_key=assignment.user_id,
+    )
+    summary["milestonesCreated"] = _apply(milestones, results)
+
+    subtasks = {
+        f"s{s.subtask_id}": (s, m.google_task_id)
+        for m in assignment.milestones
+        if m.google_task_id
+        for s in m.subtasks
+        if not s.google_task_id
+    }
+    results = batch_insert_tasks(
+        tasklist_id,
+        [
+            (key, _task_body(s.title, s.notes, s.due_date, s.completed), parent)
+            for key, (s, parent) in subtasks.items()
+        ],
+        credentials=credentials,
+        http=http,
+        user_key=assignment.user_id,
+    )
+    summary["subtasksCreated"] = _apply(
+        {key: s for key, (s, _) in subtasks.items()}, results
+    )
+
+    return summary
@@ -0,0 +1,199 @@
+"""
+Async Google Tasks API service.
+
+``async`` variants of ``create_task``, ``update_task_status`` and
+``delete_task`` from ``backend.services.google_tasks`` for the ASGI mode
+(see ``backend.asgi``). The discovery client is built on httplib2 and blocks
+a thread per call, so these talk to the same REST endpoints (taken from the
+bundled discovery document) over a shared ``httpx.AsyncClient`` instead.
+
+Arguments, return values and errors match the blocking functions; failed
+calls raise ``googleapiclient.errors.HttpError``. Calls share the rate limits,
+retry policy and counters of ``google_requests.executor``, waiting with
+``asyncio.sleep``.
+
+Configuration (environment variables):
+- GOOGLE_TASKS_ASYNC_MAX_CONNECTIONS: connections in the shared pool (default 100)
+- GOOGLE_TASKS_TIMEOUT: request timeout in seconds (default 30)
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+import httplib2
+import httpx
+from googleapiclient.errors import HttpError
+
+from backend.services.google_requests import executor, is_retryable
+from backend.services.google_tasks import _DISCOVERY_DOCUMENT, _format_due, _user_key
+
+_MAX_CONNECTIONS = int(os.getenv("GOOGLE_TASKS_ASYNC_MAX_CONNECTIONS", "100"))
+_TIMEOUT = float(os.getenv("GOOGLE_TASKS_TIMEOUT", "30"))
+
+_ROOT_URL = _DISCOVERY_DOCUMENT["rootUrl"] + _DISCOVERY_DOCUMENT["servicePath"]
+_METHODS = _DISCOVERY_DOCUMENT["resources"]["tasks"]["methods"]
+
+_http = None
+
+
+def _get_http():
+    """Return the process-wide async HTTP client, building it on first use."""
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=_MAX_CONNECTIONS,
+                max_keepalive_connections=_MAX_CONNECTIONS,
+            ),
+            timeout=_TIMEOUT,
+        )
+    return _http
+
+
+async def aclose():
+    """Close the shared HTTP client."""
+    global _http
+    if _http is not None:
+        client, _http = _http, None
+        await client.aclose()
+
+
+async def _call(method, credentials, http=None, params=None, body=None, **path):
+    """Send one Tasks API request and return the decoded JSON body (or None).
+
+    Quota and server errors are retried per ``google_requests.executor``.
+
+    Raises:
+        RuntimeError: If credentials are missing
+        HttpError: If the API answers with an error status
+    """
+    if not credentials and http is None:
+        raise RuntimeError(
+            "Google Tasks credentials are required. "
+            "Ensure OAuth2 authentication is completed and "
+            "credentials are available."
+        )
+
+    spec = _METHODS[method]
+    url = _ROOT_URL + spec["flatPath"].format(**path)
+    headers = {}
+    if credentials:
+        credentials.apply(headers)
+    user_key = _user_key(credentials, None)
+    executor.begin()
+    attempt = 0
+    while True:
+        await _sleep(executor.reserve(user_key))
+        response = await (http or _get_http()).request(
+            spec["httpMethod"], url, params=params, json=body, headers=headers
+        )
+        if response.status_code < 400:
+            return response.json() if response.content else None
+
+        resp = httplib2.Response({"status": response.status_code})
+        if "retry-after" in response.headers:
+            resp["retry-after"] = response.headers["retry-after"]
+        error = HttpError(resp, response.content, uri=url)
+        if not is_retryable(error):
+            raise error
+        granted, delay = executor.plan_retry([error], attempt, user_key)
+        if not granted:
+            raise error
+        await _sleep(delay)
+        attempt += 1
+
+
+async def _sleep(seconds):
+    if seconds > 0:
+        await asyncio.sleep(seconds)
+
+
+async def create_task(
+    tasklist_id,
+    title,
+    notes=None,
+    due_date=None,
+    parent=None,
+    credentials=None,
+    http=None,
+):
+    """
+    Create a new task in the specified task list.
+
+    See ``google_tasks.create_task``. ``http`` is an optional
+    ``httpx.AsyncClient`` to use instead of the shared one.
+    """
+    if not title:
+        raise ValueError("Task title is required")
+
+    if not tasklist_id:
+        raise ValueError("Task list ID is required")
+
+    task_body = {"title": title, "status": "needsAction"}
+    if notes:
+        task_body["notes"] = notes
+    if due_date:
+        task_body["due"] = _format_due(due_date)
+
+    return await _call(
+        "insert",
+        credentials,
+        http=http,
+        params={"parent": parent} if parent else None,
+        body=task_body,
+        tasklist=tasklist_id,
+    )
+
+
+async def update_task_status(tasklist_id, task_id, status, credentials=None, http=None):
+    """
+    Update the status of an existing task.
+
+    See ``google_tasks.update_task_status``.
+    """
+    if status not in ["needsAction", "completed"]:
+        raise ValueError(
+            f"Invalid status: {status}. Must be 'needsAction' or 'completed'"
+        )
+
+    if not tasklist_id:
+        raise ValueError("Task list ID is required")
+
+    if not task_id:
+        raise ValueError("Task ID is required")
+
+    task_body = {"status": status}
+    if status == "completed":
+        task_body["completed"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    return await _call(
+        "patch",
+        credentials,
+        http=http,
+        body=task_body,
+        tasklist=tasklist_id,
+        task=task_id,
+    )
+
+
+async def delete_task(tasklist_id, task_id, credentials=None, http=None):
+    """
+    Delete a task from the specified task list; a missing task is not an error.
+
+    See ``google_tasks.delete_task``.
+    """
+    if not tasklist_id:
+        raise ValueError("Task list ID is required")
+
+    if not task_id:
+        raise ValueError("Task ID is required")
+
+    try:
+        await _call(
+            "delete", credentials, http=http, tasklist=tasklist_id, task=task_id
+        )
+    except HttpError as e:
+        if e.resp.status != 404:
+            raise
+    return None
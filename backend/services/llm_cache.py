@@ -0,0 +1,256 @@
+"""
+Content-addressed cache for LLM milestone splits.
+
+Identical assignment descriptions (e.g. a course-wide prompt pasted by every
+student) produce the same cache key, so only the first request pays for a
+Claude round trip.
+
+Backends share a tiny ``get(key)`` / ``set(key, value)`` interface:
+- InMemoryCache: per-process LRU with TTL (default)
+- SQLiteCache: LRU with TTL in a local SQLite file, shared between workers
+- RedisCache: any Redis-compatible client exposing ``get`` and ``set(ex=)``
+
+Configuration (environment variables):
+- LLM_CACHE_BACKEND: "memory" (default), "sqlite", "redis" or "none"
+- LLM_CACHE_TTL: entry lifetime in seconds (default 7 days)
+- LLM_CACHE_MAX_ENTRIES: LRU capacity for memory/sqlite (default 1024)
+- LLM_CACHE_SQLITE_PATH: file for the sqlite backend
+- LLM_CACHE_REDIS_URL: URL for the redis backend (requires the `redis` package)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "llm_cache.sqlite3")
+_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+
+def make_key(description: str, total_days: int, model: str, prompt_version: str) -> str:
+    """Build the content-addressed key for a split request.
+
+    Whitespace in the description is normalized so trivially different
+    pastes of the same text share a key.
+    """
+    normalized = re.sub(r"\s+", " ", description).strip()
+    payload = json.dumps(
+        [normalized, total_days, model, prompt_version], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters and latency saved by cache hits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.saved_seconds = 0.0
+
+    def record_hit(self, saved_seconds: float):
+        with self._lock:
+            self.hits += 1
+            self.saved_seconds += saved_seconds
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def snapshot(self) -> dict:
+        """Return the current counters as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
+
+
+class InMemoryCache:
+    """Per-process LRU cache with a TTL on every entry."""
+
+    def __init__(self, max_entries: int = _CACHE_MAX_ENTRIES, ttl: int = _CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """LRU cache with TTL stored in a SQLite file.
+
+    Useful when several worker processes on one host should share results.
+    """
+
+    def __init__(
+        self,
+        path: str = _CACHE_SQLITE_PATH,
+        max_entries: int = _CACHE_MAX_ENTRIES,
+        ttl: int = _CACHE_TTL,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at"
+            " ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            # Evict expired rows, then least recently used ones over capacity
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class RedisCache:
+    """Cache backed by a Redis-compatible client.
+
+    TTL is enforced by Redis; LRU eviction is left to the server's
+    ``maxmemory-policy``.
+    """
+
+    def __init__(self, client, ttl: int = _CACHE_TTL, prefix: str = "llm-split:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str = _CACHE_REDIS_URL, **kwargs) -> "RedisCache":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis LLM cache backend requires the `redis` package"
+            ) from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    def set(self, key: str, value: str):
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+
+stats = CacheStats()
+
+_cache = None
+_cache_ready = False
+_cache_lock = threading.Lock()
+
+
+def _build_cache():
+    if _CACHE_BACKEND == "none":
+        return None
+    if _CACHE_BACKEND == "sqlite":
+        return SQLiteCache()
+    if _CACHE_BACKEND == "redis":
+        return RedisCache.from_url()
+    return InMemoryCache()
+
+
+def get_cache():
+    """Return the process-wide cache configured by LLM_CACHE_BACKEND, or None."""
+    global _cache, _cache_ready
+    if not _cache_ready:
+        with _cache_lock:
+            if not _cache_ready:
+                _cache = _build_cache()
+                _cache_ready = True
+    return _cache
+
+
+def set_cache(cache):
+    """Replace the process-wide cache (pass None to disable caching)."""
+    global _cache, _cache_ready
+    _cache = cache
+    _cache_ready = True
+
+
+def get_cache_stats() -> dict:
+    """Return cache hit rate and latency saved as a dict."""
+    return stats.snapshot()
@@ -0,0 +1,221 @@
+"""
+Process-wide pool of Anthropic clients.
+
+Building an ``Anthropic`` client per call throws away its HTTP connection
+pool, so every request pays for a fresh TCP + TLS handshake. The registry
+keeps one client per API key for the life of the process and reuses its
+keep-alive connections across threads.
+
+After ``fork()`` (e.g. gunicorn prefork workers) the child drops the clients
+inherited from the parent, since their sockets are shared with it, and
+builds its own on first use.
+
+``AsyncAnthropic`` clients for the ASGI mode (see ``backend.asgi``) live in a
+second registry. Their pool is sized separately because one event loop can
+keep far more calls in flight than a thread pool.
+
+Configuration (environment variables):
+- ANTHROPIC_MAX_CONNECTIONS: maximum open connections per client (default 20)
+- ANTHROPIC_MAX_KEEPALIVE: idle connections kept open (default 10)
+- ANTHROPIC_KEEPALIVE_EXPIRY: seconds an idle connection is kept (default 60)
+- ANTHROPIC_TIMEOUT: overall request timeout in seconds (default 60)
+- ANTHROPIC_CONNECT_TIMEOUT: connect timeout in seconds (default 5)
+- ANTHROPIC_ASYNC_MAX_CONNECTIONS: maximum open connections per async client
+  (default 200)
+"""
+
+import os
+import threading
+
+import httpx
+from anthropic import (
+    Anthropic,
+    AsyncAnthropic,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    Timeout,
+)
+
+_MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "20"))
+_MAX_KEEPALIVE = int(os.getenv("ANTHROPIC_MAX_KEEPALIVE", "10"))
+_KEEPALIVE_EXPIRY = float(os.getenv("ANTHROPIC_KEEPALIVE_EXPIRY", "60"))
+_TIMEOUT = float(os.getenv("ANTHROPIC_TIMEOUT", "60"))
+_CONNECT_TIMEOUT = float(os.getenv("ANTHROPIC_CONNECT_TIMEOUT", "5"))
+_ASYNC_MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_ASYNC_MAX_CONNECTIONS", "200"))
+
+
+def build_client(api_key: str) -> Anthropic:
+    """Build an Anthropic client with the configured pool limits and timeouts."""
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=_MAX_CONNECTIONS,
+            max_keepalive_connections=_MAX_KEEPALIVE,
+            keepalive_expiry=_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return Anthropic(
+        api_key=api_key,
+        http_client=http_client,
+        timeout=Timeout(_TIMEOUT, connect=_CONNECT_TIMEOUT),
+    )
+
+
+def build_async_client(api_key: str) -> AsyncAnthropic:
+    """Build an AsyncAnthropic client for use on one event loop."""
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=_ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=_ASYNC_MAX_CONNECTIONS,
+            keepalive_expiry=_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return AsyncAnthropic(
+        api_key=api_key,
+        http_client=http_client,
+        timeout=Timeout(_TIMEOUT, connect=_CONNECT_TIMEOUT),
+    )
+
+
+class ClientStats:
+    """Counts calls on pooled clients and estimates the latency reuse saves.
+
+    The first call on a newly built client is counted as "cold" (it has to
+    open a connection); later calls are "warm" and normally ride an existing
+    keep-alive connection. The saving per call is the difference between the
+    mean cold and mean warm latency.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.clients_created = 0
+            self.cold_calls = 0
+            self.warm_calls = 0
+            self.cold_seconds = 0.0
+            self.warm_seconds = 0.0
+
+    def record_created(self):
+        with self._lock:
+            self.clients_created += 1
+
+    def record_call(self, latency: float, warm: bool):
+        with self._lock:
+            if warm:
+                self.warm_calls += 1
+                self.warm_seconds += latency
+            else:
+                self.cold_calls += 1
+                self.cold_seconds += latency
+
+    def snapshot(self) -> dict:
+        """Return the current counters as a dict."""
+        with self._lock:
+            calls = self.cold_calls + self.warm_calls
+            saved = 0.0
+            if self.cold_calls and self.warm_calls:
+                saved = max(
+                    0.0,
+                    self.cold_seconds / self.cold_calls
+                    - self.warm_seconds / self.warm_calls,
+                )
+            return {
+                "clients_created": self.clients_created,
+                "calls": calls,
+                "reuse_rate": self.warm_calls / calls if calls else 0.0,
+                "saved_seconds_per_call": round(saved, 4),
+                "saved_seconds_total": round(saved * self.warm_calls, 3),
+            }
+
+
+class ClientRegistry:
+    """Thread-safe registry holding one long-lived client per API key."""
+
+    def __init__(self, factory=build_client):
+        self.factory = factory
+        self.stats = ClientStats()
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._used = set()
+
+    def get(self, api_key: str):
+        """Return the pooled client for ``api_key``, building it on first use."""
+        client = self._clients.get(api_key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(api_key)
+                if client is None:
+                    client = self.factory(api_key)
+                    self._clients[api_key] = client
+                    self.stats.record_created()
+        return client
+
+    def record_call(self, client, latency: float):
+        """Record the latency of a call made with a pooled client."""
+        if client not in self._clients.values():
+            return  # injected client (tests), not pooled
+        with self._lock:
+            warm = id(client) in self._used
+            self._used.add(id(client))
+        self.stats.record_call(latency, warm)
+
+    def close(self):
+        """Close every pooled client and its connections."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+            self._used = set()
+        for client in clients:
+            client.close()
+
+    async def aclose(self):
+        """Close every pooled async client and its connections."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+            self._used = set()
+        for client in clients:
+            await client.close()
+
+    def after_fork_in_child(self):
+        """Forget clients inherited from the parent process.
+
+        They are not closed: their sockets still belong to the parent.
+        """
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._used = set()
+        self.stats = ClientStats()
+
+
+registry = ClientRegistry()
+async_registry = ClientRegistry(factory=build_async_client)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: registry.after_fork_in_child())
+    os.register_at_fork(after_in_child=lambda: async_registry.after_fork_in_child())
+
+
+def get_client(api_key: str) -> Anthropic:
+    """Return the process-wide pooled client for ``api_key``."""
+    return registry.get(api_key)
+
+
+def get_async_client(api_key: str) -> AsyncAnthropic:
+    """Return the process-wide pooled async client for ``api_key``."""
+    return async_registry.get(api_key)
+
+
+def record_call(client, latency: float):
+    """Record call latency for connection-reuse metrics."""
+    registry.record_call(client, latency)
+
+
+def record_async_call(client, latency: float):
+    """Record async call latency for connection-reuse metrics."""
+    async_registry.record_call(client, latency)
+
+
+def get_client_stats() -> dict:
+    """Return connection reuse rate and estimated latency saved."""
+    return registry.stats.snapshot()
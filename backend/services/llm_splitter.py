@@ -3,38 +3,53 @@ LLM-based assignment splitting module.
 
 Uses Anthropic's Claude API to break down assignment descriptions into
 structured, actionable milestones.
+
+``async_split_assignment`` and ``async_stream_split_assignment`` are the
+``AsyncAnthropic`` variants used by the ASGI mode (``backend.asgi``); they
+share validation, caching and parsing with the blocking functions.
 """
 
 import json
 import os
 import re
 import sys
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Iterator, Optional, Union
+
+from anthropic import Anthropic, AsyncAnthropic
 
-from anthropic import Anthropic
+from backend.database.dates import parse_date
+from backend.services import llm_cache, llm_client
 
 # Environment variables
 _ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 _CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-3-haiku-20240307")
 
+# Bump whenever _build_prompt changes so cached results are not reused
+_PROMPT_VERSION = "1"
+_BATCH_WORKERS = int(os.getenv("LLM_BATCH_WORKERS", "8"))
+_DATE_FIELDS = ("suggested_start_date", "suggested_end_date")
+
 
 def _get_client() -> Anthropic:
-    """Get Anthropic client."""
+    """Get the process-wide pooled Anthropic client."""
     if not _ANTHROPIC_API_KEY:
         raise RuntimeError("ANTHROPIC_API_KEY environment variable is not set")
-    return Anthropic(api_key=_ANTHROPIC_API_KEY)
+    return llm_client.get_client(_ANTHROPIC_API_KEY)
 
 
-def _parse_date(date_str: str) -> datetime:
-    """Parse date string to datetime."""
-    formats = ["%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y"]
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str.strip(), fmt)
-        except ValueError:
-            continue
-    raise ValueError(f"Unable to parse date: {date_str}")
+def _get_async_client() -> AsyncAnthropic:
+    """Get the process-wide pooled AsyncAnthropic client."""
+    if not _ANTHROPIC_API_KEY:
+        raise RuntimeError("ANTHROPIC_API_KEY environment variable is not set")
+    return llm_client.get_async_client(_ANTHROPIC_API_KEY)
+
+
+def _parse_date(due_date: Union[str, date]) -> datetime:
+    """Parse a date string, or a stored ``date``, to a midnight datetime."""
+    return datetime.combine(parse_date(due_date), datetime.min.time())
 
 
 def _extract_json(content: str) -> list[dict]:
@@ -62,6 +77,36 @@ def _extract_json(content: str) -> list[dict]:
     return json.loads(content)
 
 
+def _to_relative_dates(milestones: list[dict], today: datetime) -> list[dict]:
+    """Replace YYYY-MM-DD milestone dates with day offsets from ``today``.
+
+    Cached results are keyed on total_days rather than the due date, so dates
+    are stored relative to the day they were generated.
+    """
+    relative = []
+    for m in milestones:
+        m = dict(m)
+        for field in _DATE_FIELDS:
+            try:
+                m[field] = (datetime.strptime(m[field], "%Y-%m-%d") - today).days
+            except (TypeError, ValueError):
+                pass
+        relative.append(m)
+    return relative
+
+
+def _from_relative_dates(milestones: list[dict], today: datetime) -> list[dict]:
+    """Inverse of ``_to_relative_dates``."""
+    absolute = []
+    for m in milestones:
+        m = dict(m)
+        for field in _DATE_FIELDS:
+            if isinstance(m.get(field), int):
+                m[field] = (today + timedelta(days=m[field])).strftime("%Y-%m-%d")
+        absolute.append(m)
+    return absolute
+
+
 def _build_prompt(description: str, due_date: str, total_days: int) -> str:
     """Build LLM prompt."""
     return f"""You are an expert task-analysis researcher. Break down this assignment into 4-6 actionable milestones.
@@ -92,23 +137,65 @@ Requirements:
 Output JSON only, no other text."""
 
 
-def split_assignment(
-    description: str, due_date: str, client: Optional[Anthropic] = None
-) -> list[dict]:
-    """Split assignment into milestones using Claude API.
+_SYSTEM_PROMPT = (
+    "You are an expert task-analysis researcher. Always output valid JSON only."
+)
 
-    Args:
-        description: Assignment description
-        due_date: Due date (YYYY-MM-DD)
-        client: Optional client for testing
 
-    Returns:
-        List of milestone dicts with id, title, description, dates, dependencies
+class _MilestoneStreamParser:
+    """Incrementally extract objects from a streamed JSON array.
+
+    ``feed`` accepts text chunks as they arrive and returns every top-level
+    array element whose closing brace has been seen, so milestones can be
+    used before the rest of the response is generated. Text before the
+    opening ``[`` (e.g. a markdown fence) is ignored.
     """
-    # Validate inputs
+
+    def __init__(self):
+        self._buffer = []
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        objects = []
+        for char in chunk:
+            if not self._in_array:
+                self._in_array = char == "["
+                continue
+
+            if self._depth:
+                self._buffer.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._buffer = [char]
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    objects.append(json.loads("".join(self._buffer)))
+                    self._buffer = []
+        return objects
+
+
+def _validate_inputs(
+    description: str, due_date: Union[str, date]
+) -> tuple[datetime, int]:
+    """Validate split inputs and return (today, total_days)."""
     if not description or not description.strip():
         raise ValueError("Description cannot be empty")
-    if not due_date or not due_date.strip():
+    if not due_date or not str(due_date).strip():
         raise ValueError("Due date cannot be empty")
 
     # Parse and validate date
@@ -127,53 +214,233 @@ def split_assignment(
     if total_days < 1:
         raise ValueError("Need at least 1 day")
 
+    return today, total_days
+
+
+def _cache_lookup(cache, cache_key: str, today: datetime) -> Optional[list[dict]]:
+    """Return cached milestones for ``cache_key``, or None on a miss."""
+    if cache is None:
+        return None
+    try:
+        cached = cache.get(cache_key)
+    except Exception as e:
+        print(f"[LLM] Cache lookup failed: {e}", flush=True)
+        cached = None
+    if cached is None:
+        llm_cache.stats.record_miss()
+        return None
+    entry = json.loads(cached)
+    llm_cache.stats.record_hit(entry["latency"])
+    print("[LLM] Cache hit, skipping Claude API call", flush=True)
+    return _from_relative_dates(entry["milestones"], today)
+
+
+def _cache_store(
+    cache, cache_key: str, milestones: list[dict], today: datetime, latency: float
+):
+    """Store generated milestones along with the latency they cost."""
+    if cache is None:
+        return
+    entry = {"milestones": _to_relative_dates(milestones, today), "latency": latency}
+    try:
+        cache.set(cache_key, json.dumps(entry))
+    except Exception as e:
+        print(f"[LLM] Cache store failed: {e}", flush=True)
+
+
+def _prepare(description: str, due_date: Union[str, date]):
+    """Validate inputs and look the split up in the cache.
+
+    Returns:
+        tuple: (today, total_days, cache, cache_key, cached milestones or None)
+    """
+    today, total_days = _validate_inputs(description, due_date)
+
+    # Serve repeated descriptions from the cache
+    cache = llm_cache.get_cache()
+    cache_key = llm_cache.make_key(
+        description, total_days, _CLAUDE_MODEL, _PROMPT_VERSION
+    )
+    return today, total_days, cache, cache_key, _cache_lookup(cache, cache_key, today)
+
+
+def _request(description: str, due_date: Union[str, date], total_days: int) -> dict:
+    """Keyword arguments for ``messages.create`` / ``messages.stream``."""
+    return {
+        "model": _CLAUDE_MODEL,
+        "max_tokens": 4096,
+        "temperature": 0.3,
+        "system": _SYSTEM_PROMPT,
+        "messages": [
+            {
+                "role": "user",
+                "content": _build_prompt(description, due_date, total_days),
+            }
+        ],
+    }
+
+
+def _parse_response(response) -> list[dict]:
+    """Turn a complete Messages API response into normalized milestones."""
+    if not response.content:
+        raise ValueError("Empty response from Claude API")
+
+    content = response.content[0].text.strip()
+    print(f"[LLM] Received response ({len(content)} chars)", flush=True)
+
+    milestones = _extract_json(content)
+    print(f"[LLM] Parsed {len(milestones)} milestones", flush=True)
+
+    return [_normalize_milestone(m, idx) for idx, m in enumerate(milestones, 1)]
+
+
+def _normalize_milestone(m: dict, idx: int) -> dict:
+    """Fill in defaults so every milestone has the documented shape."""
+    return {
+        "id": m.get("id", idx),
+        "title": m.get("title", f"Milestone {idx}"),
+        "description": m.get("description", ""),
+        "suggested_start_date": m.get("suggested_start_date", ""),
+        "suggested_end_date": m.get("suggested_end_date", ""),
+        "dependencies": (
+            m.get("dependencies", []) if isinstance(m.get("dependencies"), list) else []
+        ),
+    }
+
+
+def split_assignment(
+    description: str, due_date: Union[str, date], client: Optional[Anthropic] = None
+) -> list[dict]:
+    """Split assignment into milestones using Claude API.
+
+    Args:
+        description: Assignment description
+        due_date: Due date (YYYY-MM-DD string or date)
+        client: Optional client for testing
+
+    Results are cached by description, total days, model and prompt version
+    (see ``backend.services.llm_cache``).
+
+    Returns:
+        List of milestone dicts with id, title, description, dates, dependencies
+    """
+    today, total_days, cache, cache_key, cached = _prepare(description, due_date)
+    if cached is not None:
+        return cached
+
     # Get client
     if client is None:
         client = _get_client()
 
-    # Build prompt
-    prompt = _build_prompt(description, due_date, total_days)
-
     # Call API
     print(f"[LLM] Calling Claude API (model: {_CLAUDE_MODEL})...", flush=True)
 
+    started = time.perf_counter()
     try:
-        response = client.messages.create(
-            model=_CLAUDE_MODEL,
-            max_tokens=4096,
-            temperature=0.3,
-            system="You are an expert task-analysis researcher. Always output valid JSON only.",
-            messages=[{"role": "user", "content": prompt}],
+        response = client.messages.create(**_request(description, due_date, total_days))
+        llm_client.record_call(client, time.perf_counter() - started)
+
+        validated = _parse_response(response)
+        _cache_store(cache, cache_key, validated, today, time.perf_counter() - started)
+
+        return validated
+
+    except json.JSONDecodeError as e:
+        print(f"[LLM] JSON parse error: {e}", flush=True)
+        raise
+    except Exception as e:
+        print(f"[LLM] Error: {e}", flush=True)
+        raise Exception(f"Claude API error: {str(e)}") from e
+
+
+def stream_split_assignment(
+    description: str, due_date: Union[str, date], client: Optional[Anthropic] = None
+) -> Iterator[dict]:
+    """Stream milestones from Claude as soon as each one is complete.
+
+    Same inputs, validation, caching and milestone shape as
+    ``split_assignment``, but uses the streaming Messages API and yields each
+    milestone the moment its JSON object closes instead of waiting for the
+    whole response.
+
+    Raises:
+        ValueError: If inputs are invalid (before anything is yielded)
+        Exception: If the Claude API call or JSON parsing fails
+    """
+    today, total_days, cache, cache_key, cached = _prepare(description, due_date)
+    if cached is not None:
+        yield from cached
+        return
+
+    if client is None:
+        client = _get_client()
+
+    print(f"[LLM] Streaming from Claude API (model: {_CLAUDE_MODEL})...", flush=True)
+
+    started = time.perf_counter()
+    parser = _MilestoneStreamParser()
+    validated = []
+    try:
+        with client.messages.stream(
+            **_request(description, due_date, total_days)
+        ) as stream:
+            for chunk in stream.text_stream:
+                for m in parser.feed(chunk):
+                    milestone = _normalize_milestone(m, len(validated) + 1)
+                    if not validated:
+                        print(
+                            f"[LLM] First milestone after "
+                            f"{time.perf_counter() - started:.2f}s",
+                            flush=True,
+                        )
+                    validated.append(milestone)
+                    yield milestone
+    except json.JSONDecodeError as e:
+        print(f"[LLM] JSON parse error: {e}", flush=True)
+        raise
+    except Exception as e:
+        print(f"[LLM] Error: {e}", flush=True)
+        raise Exception(f"Claude API error: {str(e)}") from e
+
+    if not validated:
+        raise ValueError("No milestones in Claude API response")
+
+    print(
+        f"[LLM] Streamed {len(validated)} milestones in "
+        f"{time.perf_counter() - started:.2f}s",
+        flush=True,
+    )
+    _cache_store(cache, cache_key, validated, today, time.perf_counter() - started)
+
+
+async def async_split_assignment(
+    description: str,
+    due_date: Union[str, date],
+    client: Optional[AsyncAnthropic] = None,
+) -> list[dict]:
+    """Async variant of ``split_assignment`` using ``AsyncAnthropic``.
+
+    Waiting on Claude does not hold a thread, so one event loop can have
+    hundreds of these in flight.
+    """
+    today, total_days, cache, cache_key, cached = _prepare(description, due_date)
+    if cached is not None:
+        return cached
+
+    if client is None:
+        client = _get_async_client()
+
+    print(f"[LLM] Calling Claude API async (model: {_CLAUDE_MODEL})...", flush=True)
+
+    started = time.perf_counter()
+    try:
+        response = await client.messages.create(
+            **_request(description, due_date, total_days)
         )
+        llm_client.record_async_call(client, time.perf_counter() - started)
 
-        # Extract content
-        if not response.content:
-            raise ValueError("Empty response from Claude API")
-
-        content = response.content[0].text.strip()
-        print(f"[LLM] Received response ({len(content)} chars)", flush=True)
-
-        # Parse JSON
-        milestones = _extract_json(content)
-        print(f"[LLM] Parsed {len(milestones)} milestones", flush=True)
-
-        # Validate structure
-        validated = []
-        for idx, m in enumerate(milestones, 1):
-            validated.append(
-                {
-                    "id": m.get("id", idx),
-                    "title": m.get("title", f"Milestone {idx}"),
-                    "description": m.get("description", ""),
-                    "suggested_start_date": m.get("suggested_start_date", ""),
-                    "suggested_end_date": m.get("suggested_end_date", ""),
-                    "dependencies": (
-                        m.get("dependencies", [])
-                        if isinstance(m.get("dependencies"), list)
-                        else []
-                    ),
-                }
-            )
+        validated = _parse_response(response)
+        _cache_store(cache, cache_key, validated, today, time.perf_counter() - started)
 
         return validated
 
@@ -185,6 +452,99 @@ def split_assignment(
         raise Exception(f"Claude API error: {str(e)}") from e
 
 
+async def async_stream_split_assignment(
+    description: str,
+    due_date: Union[str, date],
+    client: Optional[AsyncAnthropic] = None,
+) -> AsyncIterator[dict]:
+    """Async variant of ``stream_split_assignment`` using ``AsyncAnthropic``.
+
+    Raises:
+        ValueError: If inputs are invalid (before anything is yielded)
+        Exception: If the Claude API call or JSON parsing fails
+    """
+    today, total_days, cache, cache_key, cached = _prepare(description, due_date)
+    if cached is not None:
+        for milestone in cached:
+            yield milestone
+        return
+
+    if client is None:
+        client = _get_async_client()
+
+    print(
+        f"[LLM] Streaming from Claude API async (model: {_CLAUDE_MODEL})...",
+        flush=True,
+    )
+
+    started = time.perf_counter()
+    parser = _MilestoneStreamParser()
+    validated = []
+    try:
+        async with client.messages.stream(
+            **_request(description, due_date, total_days)
+        ) as stream:
+            async for chunk in stream.text_stream:
+                for m in parser.feed(chunk):
+                    milestone = _normalize_milestone(m, len(validated) + 1)
+                    validated.append(milestone)
+                    yield milestone
+    except json.JSONDecodeError as e:
+        print(f"[LLM] JSON parse error: {e}", flush=True)
+        raise
+    except Exception as e:
+        print(f"[LLM] Error: {e}", flush=True)
+        raise Exception(f"Claude API error: {str(e)}") from e
+
+    if not validated:
+        raise ValueError("No milestones in Claude API response")
+
+    print(
+        f"[LLM] Streamed {len(validated)} milestones in "
+        f"{time.perf_counter() - started:.2f}s",
+        flush=True,
+    )
+    _cache_store(cache, cache_key, validated, today, time.perf_counter() - started)
+
+
+def split_assignments(
+    requests: list[tuple[str, str]],
+    max_workers: int = _BATCH_WORKERS,
+    client: Optional[Anthropic] = None,
+) -> list:
+    """Split many assignments concurrently.
+
+    Identical (whitespace-normalized) description/due date pairs are only
+    sent to Claude once, and at most ``max_workers`` calls run at a time.
+
+    Args:
+        requests: List of (description, due_date) pairs
+        max_workers: Maximum number of concurrent Claude calls
+        client: Optional client for testing
+
+    Returns:
+        List aligned with ``requests``; each item is either the milestone
+        list from ``split_assignment`` or the exception it raised.
+    """
+    keys = [(" ".join(d.split()), due) for d, due in requests]
+    unique = dict(zip(keys, requests))
+    print(
+        f"[LLM] Batch split: {len(requests)} requests, {len(unique)} unique",
+        flush=True,
+    )
+
+    def _split(pair):
+        try:
+            return split_assignment(pair[0], pair[1], client=client)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+        results = dict(zip(unique, pool.map(_split, unique.values())))
+
+    return [results[key] for key in keys]
+
+
 if __name__ == "__main__":
     # Simple test
     sample = "Write a 3000-word research paper on AI in education. Include literature review, case studies, and recommendations."
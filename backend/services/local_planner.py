@@ -0,0 +1,221 @@
+"""
+Deterministic local milestone planner.
+
+Builds a milestone plan from keyword and length heuristics in microseconds,
+with no network access. It returns the same dict shape as
+``split_assignment`` so callers can use either interchangeably.
+
+``generate_milestones`` picks between the planner and the LLM according to
+LOCAL_PLANNER_MODE:
+- "off": always use the LLM (errors propagate)
+- "fallback" (default): use the LLM, and the local plan if it fails
+- "primary": use the local plan for descriptions up to
+  LOCAL_PLANNER_MAX_CHARS characters, the LLM (with fallback) otherwise
+- "race": give the LLM LOCAL_PLANNER_RACE_BUDGET seconds, then answer with
+  the local plan; the LLM call keeps running and warms the result cache
+
+Callers that run the LLM themselves (background jobs, batch imports) use
+``prefers_local`` and ``fallback_plan`` to follow the same mode.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from datetime import timedelta
+
+from backend.services.llm_splitter import _validate_inputs, split_assignment
+
+_MODE = os.getenv("LOCAL_PLANNER_MODE", "fallback").lower()
+_MAX_CHARS = int(os.getenv("LOCAL_PLANNER_MAX_CHARS", "280"))
+_RACE_BUDGET = float(os.getenv("LOCAL_PLANNER_RACE_BUDGET", "3"))
+
+# (key, title, description, share of the schedule, trigger keywords)
+_PHASES = (
+    (
+        "research",
+        "Research and gather sources",
+        "Collect and read the material the assignment depends on. "
+        "Take notes on the key points you will use.",
+        0.2,
+        frozenset(
+            "research sources source literature read reading investigate study "
+            "analyze analyse analysis data survey background references".split()
+        ),
+    ),
+    (
+        "outline",
+        "Outline and plan",
+        "Decide on the structure and main points. "
+        "Write a short outline or plan to work from.",
+        0.15,
+        frozenset(
+            "outline plan structure proposal design thesis argument "
+            "brainstorm scope requirements".split()
+        ),
+    ),
+    (
+        "draft",
+        "Draft the main work",
+        "Produce a complete first version of the deliverable, "
+        "following the outline.",
+        0.35,
+        frozenset(
+            "write draft essay paper report code implement build develop "
+            "create solve calculate prepare words pages".split()
+        ),
+    ),
+    (
+        "revise",
+        "Review and revise",
+        "Check the draft against the requirements, fix weak sections and "
+        "proofread or test the final version.",
+        0.2,
+        frozenset(
+            "revise revision edit editing proofread review feedback test "
+            "testing debug polish citations cite".split()
+        ),
+    ),
+    (
+        "submit",
+        "Finalize and submit",
+        "Do a last check of formatting and requirements, then submit "
+        "or present the work.",
+        0.1,
+        frozenset(
+            "submit submission present presentation deliver upload "
+            "hand demo slides".split()
+        ),
+    ),
+)
+# Phases every plan needs regardless of wording
+_ALWAYS = frozenset(("draft", "submit"))
+# Descriptions at least this long get the full five-phase plan
+_FULL_PLAN_WORDS = 40
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def _detect_phases(description: str) -> list[tuple]:
+    words = _WORD_RE.findall(description.lower())
+    if len(words) >= _FULL_PLAN_WORDS:
+        return list(_PHASES)
+    vocabulary = set(words)
+    phases = [
+        phase
+        for phase in _PHASES
+        if phase[0] in _ALWAYS or not vocabulary.isdisjoint(phase[4])
+    ]
+    if len(phases) < 3:
+        # Too little signal: keep the default research → revise skeleton
+        phases = [phase for phase in _PHASES if phase[0] != "outline"]
+    return phases
+
+
+def plan_assignment(description: str, due_date: str) -> list[dict]:
+    """Build a milestone plan locally.
+
+    Args:
+        description: Assignment description
+        due_date: Due date (YYYY-MM-DD)
+
+    Returns:
+        List of milestone dicts in the same shape as ``split_assignment``
+
+    Raises:
+        ValueError: If inputs are invalid (same rules as ``split_assignment``)
+    """
+    today, total_days = _validate_inputs(description, due_date)
+    start = today.date()
+    phases = _detect_phases(description)
+
+    # Split the days by phase weight; each phase starts the day after the last
+    total_weight = sum(phase[3] for phase in phases)
+    milestones = []
+    elapsed = 0.0
+    start_day = 0
+    for idx, (_, title, text, weight, _) in enumerate(phases, 1):
+        elapsed += weight / total_weight * total_days
+        end_day = max(start_day, min(total_days, round(elapsed)))
+        if idx == len(phases):
+            end_day = total_days
+        milestones.append(
+            {
+                "id": idx,
+                "title": title,
+                "description": text,
+                "suggested_start_date": (start + timedelta(days=start_day)).isoformat(),
+                "suggested_end_date": (start + timedelta(days=end_day)).isoformat(),
+                "dependencies": [idx - 1] if idx > 1 else [],
+            }
+        )
+        start_day = min(end_day + 1, total_days)
+    return milestones
+
+
+def prefers_local(description: str, mode: str = None) -> bool:
+    """Whether ``mode`` answers ``description`` locally without the LLM."""
+    return (mode or _MODE) == "primary" and len(description.strip()) <= _MAX_CHARS
+
+
+def fallback_plan(description: str, due_date: str, mode: str = None):
+    """Return the local plan to use after the LLM failed.
+
+    Returns:
+        List of milestone dicts, or None if ``mode`` is "off" or the inputs
+        cannot be planned
+    """
+    if (mode or _MODE) == "off":
+        return None
+    try:
+        return plan_assignment(description, due_date)
+    except ValueError:
+        return None
+
+
+_race_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-race")
+
+
+def generate_milestones(
+    description: str, due_date: str, mode: str = None, split_fn=None
+) -> list[dict]:
+    """Generate milestones with the LLM and/or the local planner.
+
+    Args:
+        description: Assignment description
+        due_date: Due date (YYYY-MM-DD)
+        mode: Overrides LOCAL_PLANNER_MODE (see module docstring)
+        split_fn: LLM split function, ``split_assignment`` by default
+
+    Returns:
+        List of milestone dicts in the ``split_assignment`` shape
+    """
+    mode = mode or _MODE
+    split_fn = split_fn or split_assignment
+
+    if mode == "off":
+        return split_fn(description, due_date)
+
+    if prefers_local(description, mode):
+        print("[PLANNER] Short description, using local planner", flush=True)
+        return plan_assignment(description, due_date)
+
+    if mode == "race":
+        future = _race_pool.submit(split_fn, description, due_date)
+        try:
+            return future.result(timeout=_RACE_BUDGET)
+        except FuturesTimeoutError:
+            print(
+                f"[PLANNER] LLM slower than {_RACE_BUDGET}s, using local planner",
+                flush=True,
+            )
+            return plan_assignment(description, due_date)
+        except Exception as e:
+            print(f"[PLANNER] LLM failed ({e}), using local planner", flush=True)
+            return plan_assignment(description, due_date)
+
+    try:
+        return split_fn(description, due_date)
+    except Exception as e:
+        print(f"[PLANNER] LLM failed ({e}), using local planner", flush=True)
+        return plan_assignment(description, due_date)
@@ -0,0 +1,102 @@
+"""
+Gap-based ordering keys for milestones.
+
+``Milestone.order`` only has to sort correctly, so keys do not need to be
+0, 1, 2, ... ``reorder_keys`` keeps the key of every row that can stay where
+it is (a longest increasing run of the current keys in the new order) and
+gives the moved rows keys in the gaps between their new neighbours. Moving
+one milestone therefore rewrites one row. Only when a gap is too small are
+all keys respaced to multiples of ``GAP``, which makes room for later moves.
+"""
+
+from bisect import bisect_left
+
+# Distance between keys when (re)numbering
+GAP = 1024
+
+
+def _longest_increasing(keys):
+    """Return the positions of a longest strictly increasing run in ``keys``.
+
+    ``keys`` is a list of (position, key) pairs; O(n log n).
+    """
+    tails, tail_positions = [], []
+    previous = {}
+    for position, key in keys:
+        i = bisect_left(tails, key)
+        if i == len(tails):
+            tails.append(key)
+            tail_positions.append(position)
+        else:
+            tails[i] = key
+            tail_positions[i] = position
+        previous[position] = tail_positions[i - 1] if i else None
+
+    run = []
+    position = tail_positions[-1] if tail_positions else None
+    while position is not None:
+        run.append(position)
+        position = previous[position]
+    return run
+
+
+def _fill(low, high, count, gap):
+    """Return ``count`` increasing keys strictly between ``low`` and ``high``.
+
+    Either bound may be None (start or end of the list). Returns None when
+    the gap is too small.
+    """
+    if low is None and high is None:
+        return [j * gap for j in range(count)]
+    if high is None:
+        return [low + (j + 1) * gap for j in range(count)]
+    if low is None:
+        return [high - (count - j) * gap for j in range(count)]
+    if high - low - 1 < count:
+        return None
+    return [low + (high - low) * (j + 1) // (count + 1) for j in range(count)]
+
+
+def reorder_keys(current, new_order, gap=GAP):
+    """Compute ordering keys that put ``new_order`` in sequence.
+
+    Args:
+        current: {id: current key (may be None)} for every row
+        new_order: The same ids in their new order
+
+    Returns:
+        dict: {id: new key} for the rows whose key has to change
+    """
+    keys = [current[row_id] for row_id in new_order]
+    kept = _longest_increasing(
+        [(position, key) for position, key in enumerate(keys) if key is not None]
+    )
+    new_keys = [None] * len(keys)
+    for position in kept:
+        new_keys[position] = keys[position]
+
+    position = 0
+    while position < len(new_keys):
+        if new_keys[position] is not None:
+            position += 1
+            continue
+        end = position
+        while end < len(new_keys) and new_keys[end] is None:
+            end += 1
+        fill = _fill(
+            new_keys[position - 1] if position else None,
+            new_keys[end] if end < len(new_keys) else None,
+            end - position,
+            gap,
+        )
+        if fill is None:
+            new_keys = [i * gap for i in range(len(keys))]
+            break
+        new_keys[position:end] = fill
+        position = end
+
+    return {
+        row_id: key
+        for row_id, key in zip(new_order, new_keys)
+        if current[row_id] != key
+    }
@@ -0,0 +1,172 @@
+"""
+Bounded worker pool for bcrypt password hashing.
+
+bcrypt is deliberately slow and CPU-bound. Run inline, a burst of logins
+(e.g. at the start of term) takes every CPU and stalls unrelated requests.
+Hashes and checks run here on a fixed number of worker threads instead
+(bcrypt releases the GIL while hashing); the request thread just waits for
+the result. When the workers and a short queue are full, new work is
+refused with ``HasherBusy`` and the route answers 503 with ``Retry-After``
+instead of piling up more CPU work.
+
+The bcrypt cost is calibrated once per process: one hash is timed at
+BCRYPT_MIN_ROUNDS and the cost is raised while the estimated hashing time
+(which doubles per round) stays within BCRYPT_TARGET_MS. Setting
+BCRYPT_LOG_ROUNDS pins the cost and skips calibration. Calibration never
+goes below BCRYPT_MIN_ROUNDS, which defaults to Flask-Bcrypt's cost of 12,
+so a slow host or a busy startup cannot weaken new hashes. Hashes made with
+a lower cost are upgraded on the user's next successful login (see
+``needs_rehash``); stronger ones are kept, so workers that calibrate to
+different costs do not rewrite each other's hashes.
+
+Configuration (environment variables):
+- BCRYPT_LOG_ROUNDS: fixed bcrypt cost (default: calibrated)
+- BCRYPT_TARGET_MS: target time for one hash when calibrating (default 250)
+- BCRYPT_MIN_ROUNDS: lowest cost calibration may pick (default 12)
+- BCRYPT_MAX_ROUNDS: highest cost calibration may pick (default 15)
+- PASSWORD_HASH_WORKERS: hashing threads (default: number of CPUs)
+- PASSWORD_HASH_MAX_QUEUE: hashes allowed to wait for a worker (default 16)
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask_bcrypt import Bcrypt
+
+_LOG_ROUNDS = os.getenv("BCRYPT_LOG_ROUNDS")
+_TARGET_SECONDS = float(os.getenv("BCRYPT_TARGET_MS", "250")) / 1000
+_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "12"))
+_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "15"))
+_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "16"))
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing pool is full; retry after ``retry_after`` s."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing is busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _rounds_of(pw_hash: str) -> int:
+    """Return the cost of a bcrypt hash (``$2b$<cost>$...``)."""
+    return int(pw_hash.split("$")[2])
+
+
+@lru_cache(maxsize=None)
+def calibrate(
+    target_seconds: float = _TARGET_SECONDS,
+    min_rounds: int = _MIN_ROUNDS,
+    max_rounds: int = _MAX_ROUNDS,
+) -> tuple[int, float]:
+    """Pick the highest bcrypt cost whose hash fits in ``target_seconds``.
+
+    Returns (rounds, estimated seconds per hash at that cost).
+    """
+    bcrypt = Bcrypt()
+    started = time.perf_counter()
+    bcrypt.generate_password_hash("calibration", min_rounds)
+    elapsed = max(time.perf_counter() - started, 1e-6)
+
+    extra = math.floor(math.log2(target_seconds / elapsed))
+    rounds = min(max_rounds, max(min_rounds, min_rounds + extra))
+    seconds = elapsed * 2 ** (rounds - min_rounds)
+    print(
+        f"[AUTH] bcrypt cost {rounds} (~{seconds * 1000:.0f} ms per hash)",
+        flush=True,
+    )
+    return rounds, seconds
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool with queue-depth backpressure."""
+
+    def __init__(self, workers: int = _WORKERS, max_queue: int = _MAX_QUEUE):
+        self.bcrypt = Bcrypt()
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = None
+        self.hash_seconds = _TARGET_SECONDS
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = None
+
+    def init_app(self, app):
+        """Bind Flask-Bcrypt settings and choose the bcrypt cost."""
+        self.bcrypt.init_app(app)
+        if self.rounds is not None:
+            return
+        if _LOG_ROUNDS:
+            self.rounds = int(_LOG_ROUNDS)
+        else:
+            self.rounds, self.hash_seconds = calibrate()
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HasherBusy(self._retry_after())
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+            executor = self._executor
+        try:
+            return executor.submit(self._timed, fn, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            # Moving average, used to estimate Retry-After
+            elapsed = time.perf_counter() - started
+            self.hash_seconds = 0.8 * self.hash_seconds + 0.2 * elapsed
+
+    def _retry_after(self) -> int:
+        """Seconds until the current backlog should have drained."""
+        return max(1, math.ceil(self._pending / self.workers * self.hash_seconds))
+
+    def hash(self, password: str) -> str:
+        """Hash ``password`` with the configured cost.
+
+        Raises:
+            HasherBusy: If the pool and its queue are full
+        """
+        return self._submit(
+            self.bcrypt.generate_password_hash, password, self.rounds
+        ).decode("utf-8")
+
+    def check(self, pw_hash: str, password: str) -> bool:
+        """Return whether ``password`` matches ``pw_hash``.
+
+        Raises:
+            HasherBusy: If the pool and its queue are full
+        """
+        return self._submit(self.bcrypt.check_password_hash, pw_hash, password)
+
+    def needs_rehash(self, pw_hash: str) -> bool:
+        """Return whether ``pw_hash`` was made with a lower cost than ours."""
+        return self.rounds is not None and _rounds_of(pw_hash) < self.rounds
+
+    def after_fork_in_child(self):
+        """Drop the parent's executor; its threads do not exist in the child."""
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = None
+
+
+hasher = PasswordHasher()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: hasher.after_fork_in_child())
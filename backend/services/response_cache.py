@@ -0,0 +1,86 @@
+"""
+Per-user cache of serialized read responses.
+
+Every user row carries a ``data_version`` counter. Routes that change any of
+the user's assignments, milestones or subtasks call ``bump_data_version`` in
+the same transaction, so the counter moves whenever something the read
+endpoints return may have changed.
+
+Reads use the counter two ways:
+- in their strong ETag, so a poll sending If-None-Match gets ``304`` from the
+  user row Flask-Login already loaded, without loading any milestones;
+- as the freshness check of ``ResponseCache``, a per-process LRU of response
+  bytes keyed by (user, URL), so a poll without the header gets the stored
+  body instead of re-querying and re-serializing the tree.
+
+The counter is loaded before the response is built, so a cached body is never
+older than the version it is stored under. Because the counter lives in the
+database, a bump committed by any process invalidates every process's cache.
+
+Configuration (environment variables):
+- RESPONSE_CACHE_MAX_ENTRIES: cached responses per process (default 1024,
+  0 disables the cache; ETags and 304s still work)
+"""
+
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import update
+
+from backend.database.models import User, db
+
+_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+CachedResponse = namedtuple("CachedResponse", "version etag body headers")
+
+
+def bump_data_version(user_id):
+    """Increment the user's data version. Does not commit.
+
+    Returns:
+        int: The new version, as seen by this transaction
+    """
+    return db.session.scalar(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+    )
+
+
+class ResponseCache:
+    """Thread-safe LRU of response bytes, each stored under a data version."""
+
+    def __init__(self, max_entries=_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, key, version):
+        """Return the entry for ``key`` if it was stored under ``version``."""
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                return None
+            if entry.version != version:
+                del self._entries[(user_id, key)]
+                return None
+            self._entries.move_to_end((user_id, key))
+            return entry
+
+    def set(self, user_id, key, entry):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[(user_id, key)] = entry
+            self._entries.move_to_end((user_id, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
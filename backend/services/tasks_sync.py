@@ -0,0 +1,262 @@
+"""
+Two-way incremental sync between Google Tasks and milestones/subtasks.
+
+``sync_assignment_tasks`` in ``google_tasks`` creates the tasks;
+``sync_tasklist`` keeps them in step afterwards, in both directions:
+
+1. Pull. Tasks changed since the list's watermark are listed (paged, with
+   ``updatedMin``), so a routine sync of a large account fetches a small
+   delta instead of every task. The watermark is the newest ``updated``
+   time Google reported, stored per (user, task list) in
+   ``TaskSyncState``; the first sync lists everything.
+2. Reconcile. Each changed task is matched to a local row by
+   ``google_task_id``. A row that has not changed locally since its last
+   sync takes the remote title, notes, due date and status. If both sides
+   changed, the later change wins (Google's ``updated`` against the row's
+   ``updated_at``) and the conflict is logged and reported. A task deleted
+   in Google unlinks its row. Tasks with no local row are ignored.
+3. Push. Linked rows changed locally since their last sync
+   (``updated_at > synced_at``) are sent in batched PATCH requests.
+
+Assignments whose rows took a remote change get the same bookkeeping as a
+write through the API: progress is recomputed, their agenda rows are
+rebuilt and the user's data version moves, so cached reads and ETags
+expire.
+
+Rows are matched within the user's assignments only, and the engine assumes
+each user syncs into one task list. Timestamps from Google are compared
+with local UTC clocks, so a large clock skew can pick the wrong winner of
+a conflict. The caller commits.
+"""
+
+from datetime import datetime
+
+from googleapiclient.errors import HttpError
+from sqlalchemy import or_, select
+
+from backend.database.models import Assignment, Milestone, Subtask, TaskSyncState, db
+from backend.services.agenda import refresh_assignments
+from backend.services.google_tasks import _task_body, batch_patch_tasks, list_tasks
+from backend.services.progress import recompute_progress
+from backend.services.response_cache import bump_data_version
+
+# Ids per IN (...) lookup of linked rows
+_IN_CHUNK = 500
+
+
+def _parse_time(value):
+    """Parse an RFC3339 UTC timestamp from the API into a naive UTC datetime."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def _user_rows(user_id, *criteria):
+    """Return the user's milestones and subtasks matching ``criteria``."""
+    milestones = db.session.scalars(
+        select(Milestone)
+        .join(Assignment, Assignment.assignment_id == Milestone.assignment_id)
+        .where(Assignment.user_id == user_id, *[c(Milestone) for c in criteria])
+    )
+    subtasks = db.session.scalars(
+        select(Subtask)
+        .join(Milestone, Milestone.milestone_id == Subtask.milestone_id)
+        .join(Assignment, Assignment.assignment_id == Milestone.assignment_id)
+        .where(Assignment.user_id == user_id, *[c(Subtask) for c in criteria])
+    )
+    return [*milestones, *subtasks]
+
+
+def _linked_rows(user_id, task_ids):
+    """Return {google_task_id: row} for the user's rows linked to ``task_ids``."""
+    rows = {}
+    for start in range(0, len(task_ids), _IN_CHUNK):
+        chunk = task_ids[start : start + _IN_CHUNK]
+        for row in _user_rows(user_id, lambda m: m.google_task_id.in_(chunk)):
+            rows[row.google_task_id] = row
+    return rows
+
+
+def _dirty_rows(user_id):
+    return _user_rows(
+        user_id,
+        lambda m: m.google_task_id.isnot(None),
+        lambda m: or_(m.synced_at.is_(None), m.updated_at > m.synced_at),
+    )
+
+
+def _assignment_id(row):
+    if isinstance(row, Milestone):
+        return row.assignment_id
+    return row.milestone.assignment_id
+
+
+def _key(row):
+    if isinstance(row, Milestone):
+        return f"m{row.milestone_id}"
+    return f"s{row.subtask_id}"
+
+
+def _local_fields(row):
+    """Return the synced fields of a row as (title, notes, due_date, completed).
+
+    A milestone syncs its ``title``, as ``sync_assignment_tasks`` created the
+    task from it; ``text`` may hold more (e.g. "Title: description").
+    """
+    notes = row.description if isinstance(row, Milestone) else row.notes
+    return row.title, notes or None, row.due_date, bool(row.completed)
+
+
+def _remote_fields(task):
+    due = task.get("due")
+    return (
+        task.get("title", "")[:500],
+        task.get("notes") or None,
+        datetime.fromisoformat(due[:10]).date() if due else None,
+        task.get("status") == "completed",
+    )
+
+
+def _apply_remote(row, fields):
+    title, notes, due_date, completed = fields
+    if isinstance(row, Milestone):
+        # ``text`` follows a rename only when it was just the title
+        if row.text == row.title:
+            row.text = title
+        row.title, row.description = title[:500], notes
+    else:
+        row.title, row.notes = title[:500], notes
+    row.due_date = due_date
+    row.completed = completed
+
+
+def _mark_synced(row, now):
+    # Setting updated_at explicitly keeps its onupdate from moving it past
+    # synced_at for this write
+    row.updated_at = row.synced_at = now
+
+
+def _reconcile(row, task, now, summary):
+    """Merge one changed remote task into its local row.
+
+    A row that keeps its local change stays dirty and is pushed afterwards.
+
+    Returns:
+        bool: Whether the remote change was applied to the row
+    """
+    remote_updated = _parse_time(task["updated"])
+    locally_changed = row.synced_at is None or row.updated_at > row.synced_at
+
+    if row.synced_at is not None and remote_updated <= row.synced_at:
+        return False  # already seen (e.g. the echo of our own push)
+
+    if task.get("deleted"):
+        row.google_task_id = None
+        _mark_synced(row, now)
+        summary["unlinked"] += 1
+        return False
+
+    fields = _remote_fields(task)
+    if fields == _local_fields(row):
+        _mark_synced(row, now)
+        return False
+
+    if locally_changed:
+        winner = "google" if remote_updated > row.updated_at else "local"
+        print(
+            f"[SYNC] Conflict on {_key(row)} (task {task['id']}): "
+            f"local change at {row.updated_at:%Y-%m-%dT%H:%M:%S}, "
+            f"Google change at {task['updated']}; keeping {winner}",
+            flush=True,
+        )
+        summary["conflicts"].append(
+            {"key": _key(row), "taskId": task["id"], "winner": winner}
+        )
+        if winner == "local":
+            return False
+
+    _apply_remote(row, fields)
+    _mark_synced(row, now)
+    summary["pulled"] += 1
+    return True
+
+
+def sync_tasklist(user_id, tasklist_id, credentials=None, http=None):
+    """
+    Pull remote changes into the user's rows, then push local changes.
+
+    Args:
+        user_id: Owner of the milestones and subtasks to sync
+        tasklist_id: ID of the task list the user syncs into
+        credentials: OAuth2 credentials object (required unless http given)
+        http: Optional transport, see ``google_tasks._get_tasks_service``
+
+    Returns:
+        dict: ``fetched`` tasks listed, ``pulled`` rows updated from Google,
+        ``pushed`` rows sent to Google, ``unlinked`` rows whose task was
+        deleted, ``conflicts`` resolved, ``failed`` pushes and the new
+        ``watermark``
+    """
+    state = db.session.get(TaskSyncState, (user_id, tasklist_id))
+    if state is None:
+        state = TaskSyncState(user_id=user_id, tasklist_id=tasklist_id)
+        db.session.add(state)
+
+    summary = {
+        "fetched": 0,
+        "pulled": 0,
+        "pushed": 0,
+        "unlinked": 0,
+        "conflicts": [],
+        "failed": [],
+    }
+    now = datetime.utcnow()
+
+    tasks = list_tasks(
+        tasklist_id,
+        updated_min=state.updated_min,
+        credentials=credentials,
+        http=http,
+        user_key=user_id,
+    )
+    summary["fetched"] = len(tasks)
+    rows = _linked_rows(user_id, [task["id"] for task in tasks])
+    changed = set()
+    for task in tasks:
+        row = rows.get(task["id"])
+        if row is not None and _reconcile(row, task, now, summary):
+            changed.add(_assignment_id(row))
+    if tasks:
+        newest = max(tasks, key=lambda task: _parse_time(task["updated"]))
+        state.updated_min = newest["updated"]
+
+    db.session.flush()
+    if changed:
+        recompute_progress(sorted(changed))
+        refresh_assignments(changed)
+        bump_data_version(user_id)
+
+    dirty = {_key(row): row for row in _dirty_rows(user_id)}
+    results = batch_patch_tasks(
+        tasklist_id,
+        [
+            (key, row.google_task_id, _task_body(*_local_fields(row)))
+            for key, row in dirty.items()
+        ],
+        credentials=credentials,
+        http=http,
+        user_key=user_id,
+    )
+    for key, row in dirty.items():
+        result = results.get(key)
+        if isinstance(result, dict):
+            _mark_synced(row, datetime.utcnow())
+            summary["pushed"] += 1
+        elif isinstance(result, HttpError) and result.resp.status == 404:
+            row.google_task_id = None
+            _mark_synced(row, datetime.utcnow())
+            summary["unlinked"] += 1
+        else:
+            summary["failed"].append({"key": key, "error": str(result)})
+
+    state.synced_at = datetime.utcnow()
+    summary["watermark"] = state.updated_min
+    return summary
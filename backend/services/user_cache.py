@@ -0,0 +1,150 @@
+"""
+Per-process cache for Flask-Login's ``user_loader``.
+
+Without it every ``@login_required`` request starts by loading the full user
+row. ``load_user`` instead returns a ``SessionUser``, a small detached record
+of the fields routes read (id, username, email, name), kept in an LRU with a
+TTL.
+
+``data_version`` is deliberately not cached: it moves on every write and
+drives read ETags and the response cache (see ``response_cache``), possibly
+from another process. ``SessionUser.data_version`` reads it with a primary
+key lookup of that one column, so only the read routes that need it pay for
+a query, and they always see the current value.
+
+Entries are dropped on signup, login and logout, and whenever a ``User`` row
+is updated through the ORM in this process (profile or password changes).
+Changes made by another process show up within USER_CACHE_TTL seconds.
+
+Configuration (environment variables):
+- USER_CACHE_TTL: entry lifetime in seconds (default 60)
+- USER_CACHE_MAX_ENTRIES: cached users per process (default 1024, 0 disables)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask_login import UserMixin
+from sqlalchemy import event, select
+
+from backend.database.models import User, db
+
+_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
+_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+
+
+class SessionUser(UserMixin):
+    """Detached, read-only view of a user for ``current_user``."""
+
+    __slots__ = ("user_id", "username", "email", "name")
+
+    def __init__(self, user_id, username, email, name):
+        self.user_id = user_id
+        self.username = username
+        self.email = email
+        self.name = name
+
+    def get_id(self):
+        return str(self.user_id)
+
+    @property
+    def data_version(self):
+        """The user's current data version, read from the database."""
+        return db.session.scalar(
+            select(User.data_version).where(User.user_id == self.user_id)
+        )
+
+
+class UserCache:
+    """Thread-safe LRU of ``SessionUser`` records with a TTL and counters."""
+
+    def __init__(self, max_entries=_MAX_ENTRIES, ttl=_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def get(self, user_id):
+        """Return the cached record for ``user_id``, or None."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def set(self, record):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[record.user_id] = (time.monotonic() + self.ttl, record)
+            self._entries.move_to_end(record.user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def snapshot(self) -> dict:
+        """Return the current counters as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
+
+
+user_cache = UserCache()
+
+
+def load_user(user_id):
+    """Flask-Login ``user_loader``: return a ``SessionUser`` or None."""
+    user_id = int(user_id)
+    record = user_cache.get(user_id)
+    if record is None:
+        row = db.session.execute(
+            select(User.user_id, User.username, User.email, User.name).where(
+                User.user_id == user_id
+            )
+        ).first()
+        if row is None:
+            return None
+        record = SessionUser(*row)
+        user_cache.set(record)
+    return record
+
+
+def invalidate_user(user_id):
+    """Drop ``user_id`` from this process's cache."""
+    user_cache.invalidate(int(user_id))
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    invalidate_user(target.user_id)
@@ -0,0 +1,97 @@
+"""
+Username allocation for signup.
+
+A username is the part of the email before ``@``, with a numeric suffix when
+that is taken: ``john``, ``john1``, ``john2``, ... Probing candidates one
+query at a time costs O(k) queries for a common base and races between
+concurrent signups. Instead each base has a ``username_counter`` row holding
+the last suffix handed out, and ``allocate_username`` claims the next one
+with a single ``UPDATE ... RETURNING``. The row lock taken by the UPDATE
+serializes concurrent signups for the same base until their transaction
+ends, so they get distinct suffixes without retrying.
+
+The first allocation for a base seeds its counter from one prefix scan of
+the existing usernames. A username can still be taken outside the counter
+(e.g. ``john5@...`` signs up directly as ``john5``); the insert then fails
+on the unique constraint and the caller calls ``resync_counter`` and
+retries.
+"""
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.database.models import User, UsernameCounter, db
+
+_INSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def username_base(email):
+    """Return the username base for ``email`` (the part before ``@``)."""
+    return email.split("@")[0]
+
+
+def _format(base, suffix):
+    return base if suffix == 0 else f"{base}{suffix}"
+
+
+def _highest_suffix(base):
+    """Return the highest suffix in use for ``base``, or -1 if none is.
+
+    One prefix scan over the unique username index.
+    """
+    highest = -1
+    usernames = db.session.scalars(
+        select(User.username).where(User.username.startswith(base, autoescape=True))
+    )
+    for username in usernames:
+        rest = username[len(base) :]
+        if rest == "":
+            highest = max(highest, 0)
+        elif rest.isdigit():
+            highest = max(highest, int(rest))
+    return highest
+
+
+def _claim(base):
+    """Increment the counter for ``base`` and return the new suffix, or None."""
+    return db.session.scalar(
+        update(UsernameCounter)
+        .where(UsernameCounter.base == base)
+        .values(last_suffix=UsernameCounter.last_suffix + 1)
+        .returning(UsernameCounter.last_suffix)
+    )
+
+
+def allocate_username(email):
+    """Reserve a unique username for ``email``. Does not commit.
+
+    The counter row stays locked until the caller's transaction ends, so
+    commit (or roll back) promptly.
+    """
+    base = username_base(email)
+    suffix = _claim(base)
+    if suffix is None:
+        insert = _INSERT[db.session.get_bind().dialect.name]
+        db.session.execute(
+            insert(UsernameCounter)
+            .values(base=base, last_suffix=_highest_suffix(base))
+            .on_conflict_do_nothing(index_elements=["base"])
+        )
+        suffix = _claim(base)
+    return _format(base, suffix)
+
+
+def resync_counter(email):
+    """Move the counter for ``email``'s base past every username in use.
+
+    Called after an insert lost a unique-constraint race to a username that
+    was not handed out by the counter. Commits.
+    """
+    base = username_base(email)
+    highest = _highest_suffix(base)
+    db.session.execute(
+        update(UsernameCounter)
+        .where(UsernameCounter.base == base, UsernameCounter.last_suffix < highest)
+        .values(last_suffix=highest)
+    )
+    db.session.commit()
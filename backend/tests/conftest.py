@@ -0,0 +1,133 @@
+"""
+Shared pytest fixtures.
+
+Unit tests run the real Flask app against an in-memory SQLite database so no
+external services (Postgres, Claude, Google) are needed.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+os.environ["DATABASE_URL"] = "sqlite://"
+# Cheap bcrypt cost: tests sign up a user per test
+os.environ.setdefault("BCRYPT_LOG_ROUNDS", "4")
+# No Google rate limits: tests that need them build their own executor
+os.environ.setdefault("GOOGLE_TASKS_USER_QPS", "0")
+os.environ.setdefault("GOOGLE_TASKS_PROJECT_QPS", "0")
+
+from backend.database.models import db
+from backend.main import create_app
+from backend.services import llm_cache
+from backend.services.user_cache import user_cache
+
+
+class FakeAnthropic:
+    """Minimal stand-in for the Anthropic client's ``messages.create``."""
+
+    def __init__(self, milestones):
+        self.text = json.dumps(milestones)
+        self.calls = 0
+        self.messages = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+@pytest.fixture(autouse=True)
+def llm_cache_reset():
+    """Give every test an empty LLM cache and fresh cache stats."""
+    llm_cache.set_cache(llm_cache.InMemoryCache())
+    llm_cache.stats.reset()
+    yield
+    llm_cache.set_cache(None)
+
+
+@pytest.fixture(autouse=True)
+def user_cache_reset():
+    """User ids restart in every test database; start with an empty cache."""
+    user_cache.clear()
+    user_cache.reset_stats()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture
+def due_date():
+    """Return a due date two weeks from today as YYYY-MM-DD."""
+    return (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture
+def fake_anthropic(due_date):
+    """Return a fake Claude client that answers with two milestones."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    return FakeAnthropic(
+        [
+            {
+                "id": 1,
+                "title": "Research",
+                "description": "Read the sources.",
+                "suggested_start_date": today,
+                "suggested_end_date": today,
+                "dependencies": [],
+            },
+            {
+                "id": 2,
+                "title": "Write",
+                "description": "Write the essay.",
+                "suggested_start_date": today,
+                "suggested_end_date": due_date,
+                "dependencies": [1],
+            },
+        ]
+    )
+
+
+@pytest.fixture
+def app():
+    """Create a fresh app and schema for each test."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Return a test client for the app."""
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_client(client):
+    """Return a test client logged in as a freshly registered user."""
+    response = client.post(
+        "/auth/signup",
+        json={"email": "student@example.com", "password": "secret", "name": "Student"},
+    )
+    assert response.status_code == 201
+    client.user_id = response.get_json()["user"]["id"]
+    return client
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SQL statements sent to the database while the fixture is active."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
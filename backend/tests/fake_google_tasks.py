@@ -0,0 +1,176 @@
+"""
+In-memory fake of the Google Tasks REST API.
+
+``FakeTasksHttp`` implements the httplib2 ``request`` interface, so it can be
+passed as ``http=`` to ``googleapiclient.discovery.build``. It serves task
+CRUD requests, paged listing with ``updatedMin`` and ``showDeleted``, and
+multipart/mixed batch requests to ``/batch``, from a dict. Deleted tasks are
+kept with ``deleted: true``, as Google does. ``fail`` makes the next calls
+answer with an error, e.g. a 429 with ``Retry-After``.
+"""
+
+import itertools
+import json
+import re
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from urllib.parse import parse_qs, unquote, urlparse
+
+import httplib2
+
+_TASKS_PATH = re.compile(
+    r"^/tasks/v1/lists/(?P<list>[^/]+)/tasks(?:/(?P<task>[^/]+))?$"
+)
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class FakeTasksHttp:
+    """Fake httplib2.Http serving the Tasks API from memory."""
+
+    def __init__(self, page_size=100):
+        self.tasklists = {}
+        self.requests = []
+        self.batch_requests = 0
+        self.page_size = page_size
+        self.failures = []
+        self._ids = itertools.count(1)
+
+    def fail(self, status, times=1, reason="backendError", retry_after=None):
+        """Answer the next ``times`` calls with ``status`` instead of serving them."""
+        self.failures.extend([(status, reason, retry_after)] * times)
+
+    def edit(self, tasklist_id, task_id, **fields):
+        """Change a task as a user would in Google Tasks."""
+        task = self.tasklists[tasklist_id][task_id]
+        task.update(fields)
+        task["updated"] = _now()
+        return task
+
+    def request(
+        self,
+        uri,
+        method="GET",
+        body=None,
+        headers=None,
+        redirections=5,
+        connection_type=None,
+    ):
+        parsed = urlparse(uri)
+        if parsed.path == "/batch":
+            self.batch_requests += 1
+            return self._batch(body, headers or {})
+        status, payload, headers = self._serve(method, parsed, body)
+        return self._response(status, payload, headers)
+
+    @staticmethod
+    def _response(status, payload, headers):
+        response = httplib2.Response(
+            {"status": str(status), "content-type": "application/json", **headers}
+        )
+        content = b"" if payload is None else json.dumps(payload).encode()
+        return response, content
+
+    def _serve(self, method, parsed, body):
+        """Serve one call, or fail it; return (status, payload, headers)."""
+        if not self.failures:
+            return (*self.handle(method, parsed.path, parsed.query, body), {})
+        self.requests.append((method, parsed.path))
+        status, reason, retry_after = self.failures.pop(0)
+        payload = {
+            "error": {
+                "code": status,
+                "message": "Injected failure",
+                "errors": [{"reason": reason}],
+            }
+        }
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        return status, payload, headers
+
+    def handle(self, method, path, query, body):
+        """Serve one API call and return (status, JSON payload)."""
+        self.requests.append((method, path))
+        match = _TASKS_PATH.match(path)
+        if not match:
+            return 404, {"error": {"code": 404, "message": "Not found"}}
+        tasks = self.tasklists.setdefault(unquote(match["list"]), {})
+        task_id = match["task"] and unquote(match["task"])
+        params = {k: v[0] for k, v in parse_qs(query).items()}
+        data = json.loads(body) if body else {}
+
+        if method == "POST" and task_id is None:
+            task = {
+                "kind": "tasks#task",
+                "id": f"task{next(self._ids)}",
+                "status": "needsAction",
+                **data,
+                "updated": _now(),
+            }
+            if params.get("parent"):
+                task["parent"] = params["parent"]
+            tasks[task["id"]] = task
+            return 200, task
+        if method == "GET" and task_id is None:
+            return 200, self._list(tasks, params)
+        if task_id not in tasks or tasks[task_id].get("deleted"):
+            return 404, {"error": {"code": 404, "message": "Task not found"}}
+        if method == "PATCH":
+            tasks[task_id].update(data)
+            tasks[task_id]["updated"] = _now()
+            return 200, tasks[task_id]
+        if method == "DELETE":
+            tasks[task_id].update(deleted=True, updated=_now())
+            return 204, None
+        return 200, tasks[task_id]
+
+    def _list(self, tasks, params):
+        items = [
+            task
+            for task in tasks.values()
+            if (params.get("showDeleted") == "true" or not task.get("deleted"))
+            and task["updated"] >= params.get("updatedMin", "")
+        ]
+        size = min(int(params.get("maxResults", 100)), self.page_size)
+        start = int(params.get("pageToken", 0))
+        page = {"kind": "tasks#tasks", "items": items[start : start + size]}
+        if start + size < len(items):
+            page["nextPageToken"] = str(start + size)
+        return page
+
+    def _batch(self, body, headers):
+        content_type = headers.get("content-type") or headers.get("Content-Type")
+        if isinstance(body, str):
+            body = body.encode()
+        message = BytesParser().parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+        )
+
+        boundary = "fake-batch-boundary"
+        parts = []
+        for part in message.get_payload():
+            content_id = part["Content-ID"].strip("<>")
+            raw = part.get_payload(decode=True) or part.get_payload().encode()
+            head, _, sub_body = raw.replace(b"\r\n", b"\n").partition(b"\n\n")
+            method, target, _ = head.split(b"\n", 1)[0].decode().split(" ", 2)
+            status, payload, headers = self._serve(
+                method, urlparse(target), sub_body.decode() or None
+            )
+            extra = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\n"
+                f"Content-Type: application/json\r\n{extra}\r\n"
+                f"{'' if payload is None else json.dumps(payload)}\r\n"
+            )
+        content = "".join(parts) + f"--{boundary}--\r\n"
+        response = httplib2.Response(
+            {
+                "status": "200",
+                "content-type": f"multipart/mixed; boundary={boundary}",
+            }
+        )
+        return response, content.encode()
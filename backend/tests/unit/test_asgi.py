@@ -0,0 +1,212 @@
+"""
+Unit tests for the ASGI entry point: async LLM routes and the Flask bridge.
+"""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from backend.asgi import AsgiApp
+from backend.services import llm_splitter
+
+
+class FakeAsyncAnthropic:
+    """Stand-in for ``AsyncAnthropic`` that answers after a delay."""
+
+    def __init__(self, text, delay=0.0):
+        self.text = text
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.messages = self
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+    @asynccontextmanager
+    async def stream(self, **kwargs):
+        async def text_stream():
+            for i in range(0, len(self.text), 7):
+                yield self.text[i : i + 7]
+
+        yield SimpleNamespace(text_stream=text_stream())
+
+
+@pytest.fixture
+def asgi(app):
+    asgi = AsgiApp(app, threads=4)
+    yield asgi
+    asgi.executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def fake_async(monkeypatch, fake_anthropic):
+    client = FakeAsyncAnthropic(fake_anthropic.text)
+    monkeypatch.setattr(llm_splitter, "_get_async_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def cookie(auth_client):
+    return f"session={auth_client.get_cookie('session').value}"
+
+
+async def _call(asgi, method, path, body=None, cookie=None, headers=()):
+    """Send one HTTP request through the ASGI app; return (status, headers, body)."""
+    raw_headers = [(b"host", b"testserver")]
+    payload = b""
+    if body is not None:
+        payload = json.dumps(body).encode()
+        raw_headers.append((b"content-type", b"application/json"))
+    if cookie:
+        raw_headers.append((b"cookie", cookie.encode()))
+    raw_headers += [(k.encode(), v.encode()) for k, v in headers]
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "query_string": b"",
+        "headers": raw_headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 5000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi(scope, receive, send)
+    start, *chunks = messages
+    return (
+        start["status"],
+        {k.decode(): v.decode() for k, v in start["headers"]},
+        b"".join(chunk.get("body", b"") for chunk in chunks),
+    )
+
+
+def _split_body(due_date, n=0):
+    return {"description": f"Write essay #{n}", "deadline": due_date}
+
+
+def test_flask_routes_are_delegated(asgi):
+    status, headers, body = asyncio.run(_call(asgi, "GET", "/health"))
+
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    assert json.loads(body) == {"status": "ok"}
+
+
+def test_flask_session_is_accepted_on_async_routes(asgi, cookie, fake_async, due_date):
+    status, _, body = asyncio.run(
+        _call(asgi, "POST", "/llm/split", _split_body(due_date), cookie=cookie)
+    )
+
+    assert status == 200
+    assert [m["title"] for m in json.loads(body)] == ["Research", "Write"]
+    assert fake_async.calls == 1
+
+
+def test_async_routes_require_login(asgi, fake_async, due_date):
+    status, _, body = asyncio.run(
+        _call(asgi, "POST", "/llm/split", _split_body(due_date))
+    )
+
+    assert status == 401
+    assert "error" in json.loads(body)
+    assert fake_async.calls == 0
+
+
+def test_async_split_validates_input(asgi, cookie, fake_async):
+    status, _, _ = asyncio.run(
+        _call(asgi, "POST", "/llm/split", {"description": "x"}, cookie=cookie)
+    )
+
+    assert status == 400
+
+
+def test_async_split_reports_llm_failure(asgi, cookie, fake_async, due_date):
+    fake_async.text = "not json"
+
+    status, _, body = asyncio.run(
+        _call(asgi, "POST", "/llm/split", _split_body(due_date), cookie=cookie)
+    )
+
+    assert status == 500
+    assert json.loads(body)["error"].startswith("LLM generation failed")
+
+
+def test_cors_headers_on_async_routes(asgi, cookie, fake_async, due_date):
+    _, headers, _ = asyncio.run(
+        _call(
+            asgi,
+            "POST",
+            "/llm/split",
+            _split_body(due_date),
+            cookie=cookie,
+            headers=[("origin", "http://localhost:3000")],
+        )
+    )
+
+    assert headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert headers["access-control-allow-credentials"] == "true"
+
+
+def test_async_stream_sends_sse_events(asgi, cookie, fake_async, due_date):
+    status, headers, body = asyncio.run(
+        _call(asgi, "POST", "/llm/split/stream", _split_body(due_date), cookie=cookie)
+    )
+
+    assert status == 200
+    assert headers["content-type"] == "text/event-stream"
+    events = [block.split("\n")[0] for block in body.decode().strip().split("\n\n")]
+    assert events == ["event: milestone", "event: milestone", "event: done"]
+
+
+def test_concurrent_splits_do_not_block_reads(asgi, cookie, fake_async, due_date):
+    fake_async.delay = 0.3
+
+    async def run():
+        timings = {}
+
+        async def split(n):
+            status, _, _ = await _call(
+                asgi, "POST", "/llm/split", _split_body(due_date, n), cookie=cookie
+            )
+            return status
+
+        async def health():
+            await asyncio.sleep(0.05)
+            status, _, _ = await _call(asgi, "GET", "/health")
+            timings["health"] = time.perf_counter()
+            return status
+
+        started = time.perf_counter()
+        statuses = await asyncio.gather(health(), *(split(n) for n in range(200)))
+        timings["all"] = time.perf_counter()
+        return started, timings, statuses
+
+    started, timings, statuses = asyncio.run(run())
+
+    assert set(statuses) == {200}
+    assert fake_async.calls == 200
+    assert fake_async.peak_in_flight == 200
+    # 200 calls of 0.3s each finish together instead of queueing on 4 threads
+    assert timings["all"] - started < 3
+    # the read was answered while the LLM calls were still pending
+    assert timings["health"] - started < 0.3
@@ -0,0 +1,129 @@
+"""
+Unit tests for POST /assignments/batch.
+"""
+
+import pytest
+
+from backend.api.routes import assignments as assignment_routes
+from backend.services import local_planner
+from backend.services.generation_jobs import DEFAULT_MILESTONES
+from backend.services.llm_splitter import split_assignments
+from backend.services.local_planner import plan_assignment
+
+
+@pytest.fixture
+def fake_split(monkeypatch, fake_anthropic):
+    monkeypatch.setattr(
+        assignment_routes,
+        "split_assignments",
+        lambda requests: split_assignments(requests, client=fake_anthropic),
+    )
+    return fake_anthropic
+
+
+def test_batch_creates_all_items_and_dedupes_llm_calls(
+    auth_client, fake_split, due_date
+):
+    items = [
+        {"title": f"Week {i}", "description": "Read  chapter 1", "deadline": due_date}
+        for i in range(3)
+    ] + [{"title": "Quiz", "deadline": due_date, "subtasks": [{"text": "Study"}]}]
+
+    response = auth_client.post("/assignments/batch", json={"assignments": items})
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["created"] == 4
+    assert body["failed"] == 0
+    assert fake_split.calls == 1
+    assert [r["assignment"]["title"] for r in body["results"]] == [
+        "Week 0",
+        "Week 1",
+        "Week 2",
+        "Quiz",
+    ]
+    assert len(body["results"][0]["assignment"]["subtasks"]) == 2
+    assert body["results"][3]["assignment"]["subtasks"][0]["text"] == "Study"
+    assert len(auth_client.get("/assignments").get_json()) == 4
+
+
+def test_batch_reports_per_item_errors(auth_client, fake_split, due_date):
+    items = [
+        {"title": "Essay", "description": "Write", "deadline": due_date},
+        {"title": "No deadline"},
+        {"title": "Past", "description": "Write", "deadline": "2000-01-01"},
+    ]
+
+    body = auth_client.post(
+        "/assignments/batch", json={"assignments": items}
+    ).get_json()
+
+    assert [r["ok"] for r in body["results"]] == [True, False, True]
+    assert body["results"][1]["error"] == "Title and deadline are required"
+    assert "warning" in body["results"][2]
+    assert [s["text"] for s in body["results"][2]["assignment"]["subtasks"]] == (
+        DEFAULT_MILESTONES
+    )
+
+
+@pytest.mark.parametrize(
+    "subtasks", [["oops"], [{"text": 5}], [{"text": "Read", "completed": "yes"}], "x"]
+)
+def test_malformed_subtasks_fail_only_their_item(auth_client, due_date, subtasks):
+    items = [
+        {"title": "Essay", "deadline": due_date, "subtasks": [{"text": "Draft"}]},
+        {"title": "Bad", "deadline": due_date, "subtasks": subtasks},
+    ]
+
+    response = auth_client.post("/assignments/batch", json={"assignments": items})
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["results"][0]["ok"] is True
+    assert body["results"][1]["index"] == 1
+    assert body["results"][1]["ok"] is False
+    assert "subtask" in body["results"][1]["error"].lower()
+    assert (body["created"], body["failed"]) == (1, 1)
+
+
+def test_failed_splits_get_the_local_plan(auth_client, monkeypatch, due_date):
+    monkeypatch.setattr(
+        assignment_routes,
+        "split_assignments",
+        lambda requests: [RuntimeError("overloaded")] * len(requests),
+    )
+    item = {"title": "Essay", "description": "Write an essay", "deadline": due_date}
+
+    body = auth_client.post("/assignments/batch", json={"assignments": [item]})
+
+    [result] = body.get_json()["results"]
+    assert "warning" in result
+    titles = [m["title"] for m in plan_assignment("Write an essay", due_date)]
+    assert [s["text"].split(":")[0] for s in result["assignment"]["subtasks"]] == (
+        titles
+    )
+
+
+def test_primary_mode_skips_the_llm_for_short_items(
+    auth_client, fake_split, monkeypatch, due_date
+):
+    monkeypatch.setattr(local_planner, "_MODE", "primary")
+    items = [
+        {"title": "Quiz", "description": "Study", "deadline": due_date},
+        {"title": "Thesis", "description": "x " * 200, "deadline": due_date},
+    ]
+
+    body = auth_client.post("/assignments/batch", json={"assignments": items})
+
+    assert body.status_code == 201
+    assert fake_split.calls == 1
+    assert len(body.get_json()["results"][0]["assignment"]["subtasks"]) == len(
+        plan_assignment("Study", due_date)
+    )
+
+
+@pytest.mark.parametrize("payload", [{}, {"assignments": []}, {"assignments": "x"}])
+def test_batch_rejects_malformed_body(auth_client, payload):
+    response = auth_client.post("/assignments/batch", json=payload)
+
+    assert response.status_code == 400
@@ -0,0 +1,222 @@
+"""
+Unit tests for JSON Patch updates in PATCH /assignments/{id}.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.database.models import Assignment, Milestone, Subtask, db
+from backend.services.ordering import GAP
+
+
+@pytest.fixture
+def assignment_id(auth_client):
+    assignment = Assignment(
+        user_id=auth_client.user_id,
+        title="Essay",
+        deadline=date(2030, 1, 10),
+        created_at=datetime(2030, 1, 1),
+    )
+    assignment.milestones = [
+        Milestone(title=text, text=text, order=idx)
+        for idx, text in enumerate(["Research", "Draft", "Revise"])
+    ]
+    assignment.milestones[1].subtasks = [
+        Subtask(title="Intro", order=0),
+        Subtask(title="Body", order=1),
+    ]
+    db.session.add(assignment)
+    db.session.commit()
+    return assignment.assignment_id
+
+
+def _patch(client, assignment_id, operations, version=None):
+    headers = {"If-Match": f'"{version}"'} if version is not None else {}
+    return client.patch(
+        f"/assignments/{assignment_id}",
+        json=operations,
+        headers=headers,
+    )
+
+
+def _writes(statements):
+    # agenda_item is derived data rebuilt per assignment; see test_timeline.py
+    return [
+        s.split()[0] + " " + s.split()[1 if s.startswith("UPDATE") else 2]
+        for s in statements
+        if s.split()[0] in ("INSERT", "UPDATE", "DELETE") and "agenda_item" not in s
+    ]
+
+
+def test_replace_field_writes_one_row(auth_client, assignment_id, query_counter):
+    query_counter.clear()
+
+    response = _patch(
+        auth_client,
+        assignment_id,
+        [{"op": "replace", "path": "/subtasks/1/completed", "value": True}],
+        version=1,
+    )
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"2-')
+    assert body["version"] == 2
+    assert [s["completed"] for s in body["subtasks"]] == [False, True, False]
+    assert _writes(query_counter) == [
+        "UPDATE milestone",
+        "UPDATE assignment",
+        "UPDATE user",
+    ]
+
+
+def test_add_move_and_remove_milestones(auth_client, assignment_id):
+    response = _patch(
+        auth_client,
+        assignment_id,
+        [
+            {"op": "add", "path": "/subtasks/-", "value": {"text": "Submit"}},
+            {"op": "move", "from": "/subtasks/2", "path": "/subtasks/0"},
+            {"op": "remove", "path": "/subtasks/1"},
+            {"op": "replace", "path": "/title", "value": "Final essay"},
+        ],
+    )
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["title"] == "Final essay"
+    assert [s["text"] for s in body["subtasks"]] == ["Revise", "Draft", "Submit"]
+    orders = db.session.execute(
+        db.select(Milestone.text, Milestone.order)
+        .filter_by(assignment_id=assignment_id)
+        .order_by(Milestone.order)
+    ).all()
+    assert [text for text, _ in orders] == ["Revise", "Draft", "Submit"]
+    # Draft did not move, so it keeps its key
+    assert orders[1] == ("Draft", 1)
+
+
+def test_patch_nested_subtasks(auth_client, assignment_id):
+    response = _patch(
+        auth_client,
+        assignment_id,
+        [
+            {"op": "add", "path": "/subtasks/1/children/0", "value": {"title": "Hook"}},
+            {
+                "op": "replace",
+                "path": "/subtasks/1/children/2/completed",
+                "value": True,
+            },
+        ],
+    )
+
+    assert response.status_code == 200
+    milestone = db.session.scalars(
+        db.select(Milestone).filter_by(assignment_id=assignment_id, order=1)
+    ).one()
+    assert [(s.title, s.order, s.completed) for s in milestone.subtasks] == [
+        ("Hook", -GAP, False),
+        ("Intro", 0, False),
+        ("Body", 1, True),
+    ]
+
+
+def test_failed_operation_rolls_back_whole_patch(auth_client, assignment_id):
+    response = _patch(
+        auth_client,
+        assignment_id,
+        [
+            {"op": "replace", "path": "/title", "value": "Changed"},
+            {"op": "remove", "path": "/subtasks/7"},
+        ],
+    )
+
+    assert response.status_code == 400
+    body = auth_client.get(f"/assignments/{assignment_id}").get_json()
+    assert body["title"] == "Essay"
+    assert body["version"] == 1
+
+
+def test_failed_test_operation_returns_409(auth_client, assignment_id):
+    response = _patch(
+        auth_client,
+        assignment_id,
+        [
+            {"op": "test", "path": "/subtasks/0/text", "value": "Outline"},
+            {"op": "remove", "path": "/subtasks/0"},
+        ],
+    )
+
+    assert response.status_code == 409
+    assert len(auth_client.get(f"/assignments/{assignment_id}").json["subtasks"]) == 3
+
+
+@pytest.mark.parametrize(
+    "operations",
+    [
+        {"op": "replace", "path": "/title", "value": "x"},
+        [{"op": "copy", "from": "/title", "path": "/description"}],
+        [{"op": "replace", "path": "/progress", "value": 101}],
+        [{"op": "replace", "path": "/archived", "value": "yes"}],
+        [{"op": "replace", "path": "/owner", "value": 2}],
+        [{"op": "add", "path": "/subtasks/01", "value": {"text": "x"}}],
+        [{"op": "replace", "path": "/subtasks/0"}],
+    ],
+)
+def test_invalid_patches_are_rejected(auth_client, assignment_id, operations):
+    response = _patch(auth_client, assignment_id, operations)
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_stale_version_is_rejected(auth_client, assignment_id):
+    first = _patch(
+        auth_client,
+        assignment_id,
+        [{"op": "replace", "path": "/progress", "value": 50}],
+        version=1,
+    )
+    second = _patch(
+        auth_client,
+        assignment_id,
+        [{"op": "replace", "path": "/progress", "value": 10}],
+        version=1,
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 412
+    assert auth_client.get(f"/assignments/{assignment_id}").json["progress"] == 50
+
+
+def test_concurrent_commit_is_detected(auth_client, assignment_id, app):
+    # Another request bumps the version between our read and our write
+    @db.event.listens_for(db.session, "before_flush", once=True)
+    def concurrent_update(session, flush_context, instances):
+        session.connection().execute(
+            db.update(Assignment)
+            .where(Assignment.assignment_id == assignment_id)
+            .values(version=Assignment.version + 1)
+        )
+
+    response = _patch(
+        auth_client,
+        assignment_id,
+        [{"op": "replace", "path": "/title", "value": "Changed"}],
+    )
+
+    assert response.status_code == 412
+    assert auth_client.get(f"/assignments/{assignment_id}").json["title"] == "Essay"
+
+
+def test_put_bumps_version_and_honors_if_match(auth_client, assignment_id):
+    response = auth_client.put(f"/assignments/{assignment_id}", json={"progress": 20})
+    stale = auth_client.put(
+        f"/assignments/{assignment_id}",
+        json={"progress": 30},
+        headers={"If-Match": '"1"'},
+    )
+
+    assert response.get_json()["version"] == 2
+    assert stale.status_code == 412
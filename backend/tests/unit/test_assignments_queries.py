@@ -0,0 +1,139 @@
+"""
+Query-count regression tests for the assignment listing endpoints.
+
+Listing assignments must cost a constant number of queries regardless of how
+many assignments the user has (no N+1 milestone lookups).
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.database.models import Assignment, Milestone, db
+from backend.services.response_cache import bump_data_version
+
+
+def _seed(user_id, count, archived=False, milestones_per_assignment=3):
+    for i in range(count):
+        assignment = Assignment(
+            user_id=user_id,
+            title=f"Assignment {i}",
+            description="",
+            deadline=date(2030, 1, 1),
+            created_at=datetime(2029, 12, 1),
+            archived=archived,
+        )
+        db.session.add(assignment)
+        db.session.flush()
+        for order in range(milestones_per_assignment):
+            db.session.add(
+                Milestone(
+                    assignment_id=assignment.assignment_id,
+                    title=f"Step {order}",
+                    text=f"Step {order}",
+                    order=order,
+                )
+            )
+    # Writes outside the routes must invalidate cached reads too
+    bump_data_version(user_id)
+    db.session.commit()
+
+
+def _count_queries(client, query_counter, url):
+    query_counter.clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    return len(query_counter), response.get_json()
+
+
+@pytest.mark.parametrize(
+    "url,archived", [("/assignments", False), ("/assignments/archived", True)]
+)
+def test_listing_query_count_is_constant(auth_client, query_counter, url, archived):
+    _seed(auth_client.user_id, 1, archived=archived)
+    small_count, small = _count_queries(auth_client, query_counter, url)
+
+    _seed(auth_client.user_id, 30, archived=archived)
+    large_count, large = _count_queries(auth_client, query_counter, url)
+
+    assert len(small) == 1
+    assert len(large) == 31
+    assert large_count == small_count
+    # user loader + assignments + one IN query for milestones
+    assert large_count <= 3
+
+
+def test_listing_returns_milestones_in_order(auth_client):
+    _seed(auth_client.user_id, 1, milestones_per_assignment=4)
+
+    [assignment] = auth_client.get("/assignments").get_json()
+
+    assert [s["text"] for s in assignment["subtasks"]] == [
+        "Step 0",
+        "Step 1",
+        "Step 2",
+        "Step 3",
+    ]
+
+
+def test_cursor_pagination_walks_every_assignment_once(auth_client):
+    _seed(auth_client.user_id, 7)
+
+    seen = []
+    response = auth_client.get("/assignments?limit=3")
+    pages = 1
+    while "X-Next-Cursor" in response.headers:
+        seen.extend(a["id"] for a in response.get_json())
+        cursor = response.headers["X-Next-Cursor"]
+        response = auth_client.get(f"/assignments?limit=3&cursor={cursor}")
+        pages += 1
+    seen.extend(a["id"] for a in response.get_json())
+
+    assert pages == 3
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+def test_page_query_count_does_not_grow_with_account(auth_client, query_counter):
+    _seed(auth_client.user_id, 40)
+
+    count, page = _count_queries(auth_client, query_counter, "/assignments?limit=5")
+
+    assert len(page) == 5
+    assert count <= 3
+
+
+def test_fields_projection_skips_milestones(auth_client, query_counter):
+    _seed(auth_client.user_id, 5)
+
+    count, page = _count_queries(
+        auth_client, query_counter, "/assignments?fields=title,deadline"
+    )
+
+    assert page[0].keys() == {"id", "title", "deadline"}
+    assert not any("milestone" in statement for statement in query_counter)
+    assert count <= 2
+
+
+@pytest.mark.parametrize(
+    "query", ["limit=0", "limit=abc", "cursor=not-a-cursor", "fields=title,secret"]
+)
+def test_invalid_list_params_are_rejected(auth_client, query):
+    response = auth_client.get(f"/assignments?{query}")
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_archiving_moves_assignment_between_listings(auth_client):
+    _seed(auth_client.user_id, 2)
+    first, second = auth_client.get("/assignments").get_json()
+
+    assert auth_client.delete(f"/assignments/{first['id']}").status_code == 200
+    response = auth_client.patch(
+        f"/assignments/{second['id']}/archive", json={"archived": True}
+    )
+
+    assert response.status_code == 200
+    assert auth_client.get("/assignments").get_json() == []
+    assert len(auth_client.get("/assignments/archived").get_json()) == 2
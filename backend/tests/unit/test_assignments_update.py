@@ -0,0 +1,107 @@
+"""
+Unit tests for diff-based milestone updates in PUT /assignments/{id}.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.database.models import Assignment, Milestone, db
+
+
+@pytest.fixture
+def assignment_id(auth_client):
+    assignment = Assignment(
+        user_id=auth_client.user_id,
+        title="Essay",
+        deadline=date(2030, 1, 10),
+        created_at=datetime(2030, 1, 1),
+    )
+    assignment.milestones = [
+        Milestone(title=text, text=text, order=idx, google_task_id=f"g{idx}")
+        for idx, text in enumerate(["Research", "Draft", "Revise"])
+    ]
+    db.session.add(assignment)
+    db.session.commit()
+    return assignment.assignment_id
+
+
+def _subtasks(client, assignment_id):
+    return client.get(f"/assignments/{assignment_id}").get_json()["subtasks"]
+
+
+def _writes(statements):
+    return [
+        s.split()[0]
+        for s in statements
+        if s.split()[0] in ("INSERT", "UPDATE", "DELETE") and "milestone" in s
+    ]
+
+
+def test_ticking_one_checkbox_updates_one_row(
+    auth_client, assignment_id, query_counter
+):
+    subtasks = _subtasks(auth_client, assignment_id)
+    subtasks[1]["completed"] = True
+    query_counter.clear()
+
+    response = auth_client.put(
+        f"/assignments/{assignment_id}", json={"subtasks": subtasks}
+    )
+
+    body = response.get_json()
+    assert _writes(query_counter) == ["UPDATE"]
+    assert body["changes"] == {
+        "inserted": [],
+        "updated": [subtasks[1]["id"]],
+        "reordered": [],
+        "deleted": [],
+    }
+    assert [s["id"] for s in body["subtasks"]] == [s["id"] for s in subtasks]
+    assert db.session.get(Milestone, subtasks[1]["id"]).google_task_id == "g1"
+
+
+def test_unchanged_list_writes_nothing(auth_client, assignment_id, query_counter):
+    subtasks = _subtasks(auth_client, assignment_id)
+    query_counter.clear()
+
+    body = auth_client.put(
+        f"/assignments/{assignment_id}", json={"subtasks": subtasks}
+    ).get_json()
+
+    assert _writes(query_counter) == []
+    assert body["changes"] == {
+        "inserted": [],
+        "updated": [],
+        "reordered": [],
+        "deleted": [],
+    }
+
+
+def test_reorder_insert_and_delete(auth_client, assignment_id):
+    research, draft, revise = _subtasks(auth_client, assignment_id)
+    submitted = [
+        draft,
+        research,
+        {"id": 999999, "text": "Submit", "completed": False},
+    ]
+
+    body = auth_client.put(
+        f"/assignments/{assignment_id}", json={"subtasks": submitted}
+    ).get_json()
+
+    changes = body["changes"]
+    # Research keeps its key; only Draft moves in front of it
+    assert changes["reordered"] == [draft["id"]]
+    assert changes["deleted"] == [revise["id"]]
+    assert len(changes["inserted"]) == 1
+    assert [s["text"] for s in body["subtasks"]] == ["Draft", "Research", "Submit"]
+    assert body["subtasks"][2]["id"] == changes["inserted"][0]
+
+
+def test_rejects_malformed_subtasks(auth_client, assignment_id):
+    response = auth_client.put(
+        f"/assignments/{assignment_id}", json={"subtasks": "nope"}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Unit tests for native date columns and date parsing.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+
+from backend.database.dates import parse_date, parse_datetime
+from backend.database.models import db
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2030-01-15",
+        "2030/01/15",
+        "15/01/2030",
+        "2030-01-15T20:00:00Z",
+        date(2030, 1, 15),
+        datetime(2030, 1, 15, 8, 30),
+    ],
+)
+def test_parse_date_accepts_mixed_formats(value):
+    assert parse_date(value) == date(2030, 1, 15)
+
+
+def test_parse_datetime_converts_to_naive_utc():
+    assert parse_datetime("2025-11-11T14:23:57.959Z") == datetime(
+        2025, 11, 11, 14, 23, 57, 959000
+    )
+    assert parse_datetime("2025-11-11T16:00:00+02:00") == datetime(2025, 11, 11, 14)
+    assert parse_datetime("2025-11-11") == datetime(2025, 11, 11)
+
+
+@pytest.mark.parametrize("value", ["", "next week", None, 20300115])
+def test_parse_date_rejects_garbage(value):
+    with pytest.raises(ValueError):
+        parse_date(value)
+
+
+def test_create_normalizes_dates(auth_client):
+    response = auth_client.post(
+        "/assignments",
+        json={
+            "title": "Essay",
+            "deadline": "2030/01/15",
+            "createdAt": "2029-12-01T10:00:00.000Z",
+            "subtasks": [{"text": "Draft"}],
+        },
+    )
+
+    body = response.get_json()
+    assert response.status_code == 201
+    assert body["deadline"] == "2030-01-15"
+    assert body["createdAt"] == "2029-12-01T10:00:00"
+
+
+def test_invalid_deadline_is_rejected(auth_client):
+    response = auth_client.post(
+        "/assignments", json={"title": "Essay", "deadline": "someday"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_due_this_week_is_an_index_range_scan(app):
+    plan = db.session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT assignment_id FROM assignment "
+            "WHERE user_id = 1 AND archived = 0 "
+            "AND deadline BETWEEN '2030-01-13' AND '2030-01-19'"
+        )
+    ).all()
+
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_assignment_user_archived_deadline" in detail
+    assert "deadline>? AND deadline<?" in detail
@@ -0,0 +1,142 @@
+"""
+Unit tests for background milestone generation.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.database.models import Assignment, GenerationJob, db
+from backend.services import local_planner
+from backend.services.generation_jobs import milestones_from_split
+from backend.services.llm_splitter import split_assignment
+from backend.services.local_planner import plan_assignment
+
+
+@pytest.fixture
+def pool(app, monkeypatch):
+    """Return the app's worker pool with submissions and retries recorded."""
+    pool = app.extensions["generation_jobs"]
+    pool.submitted = []
+    pool.retried = []
+    monkeypatch.setattr(pool, "submit", pool.submitted.append)
+    monkeypatch.setattr(
+        pool, "_retry_later", lambda job_id, attempts: pool.retried.append(job_id)
+    )
+    return pool
+
+
+def _create_async(client, due_date):
+    response = client.post(
+        "/assignments",
+        json={
+            "title": "Essay",
+            "description": "Write an essay",
+            "deadline": due_date,
+            "async": True,
+        },
+    )
+    assert response.status_code == 202
+    return response.get_json()
+
+
+def test_async_create_commits_before_generation(auth_client, pool, due_date):
+    body = _create_async(auth_client, due_date)
+
+    assert body["status"] == "generating"
+    assert body["subtasks"] == []
+    assert pool.submitted == [body["jobId"]]
+    status = auth_client.get(f"/assignments/{body['id']}/generation").get_json()
+    assert status["status"] == "pending"
+
+
+def test_job_generates_milestones(auth_client, pool, due_date, fake_anthropic):
+    body = _create_async(auth_client, due_date)
+    pool.split_fn = lambda d, dl: split_assignment(d, dl, client=fake_anthropic)
+
+    assert pool.run(body["jobId"]) == "done"
+
+    assignment = auth_client.get(f"/assignments/{body['id']}").get_json()
+    assert assignment["status"] == "ready"
+    assert [s["text"] for s in assignment["subtasks"]] == [
+        "Research: Read the sources.",
+        "Write: Write the essay.",
+    ]
+
+
+def test_job_retries_then_falls_back(auth_client, pool, due_date):
+    body = _create_async(auth_client, due_date)
+
+    def failing_split(description, deadline):
+        raise RuntimeError("overloaded")
+
+    pool.split_fn = failing_split
+    pool.max_attempts = 2
+
+    assert pool.run(body["jobId"]) == "pending"
+    assert pool.retried == [body["jobId"]]
+    assert pool.run(body["jobId"]) == "failed"
+
+    status = auth_client.get(f"/assignments/{body['id']}/generation").get_json()
+    assert status["attempts"] == 2
+    assert status["error"] == "overloaded"
+    assignment = auth_client.get(f"/assignments/{body['id']}").get_json()
+    assert assignment["status"] == "ready"
+    plan = milestones_from_split(None, plan_assignment("Write an essay", due_date))
+    assert [s["text"] for s in assignment["subtasks"]] == [m.text for m in plan]
+
+
+def test_primary_mode_plans_short_descriptions_locally(
+    auth_client, pool, due_date, monkeypatch
+):
+    monkeypatch.setattr(local_planner, "_MODE", "primary")
+    body = _create_async(auth_client, due_date)
+
+    def unused_split(description, deadline):
+        raise AssertionError("LLM called")
+
+    pool.split_fn = unused_split
+
+    assert pool.run(body["jobId"]) == "done"
+    assignment = auth_client.get(f"/assignments/{body['id']}").get_json()
+    assert len(assignment["subtasks"]) == len(
+        plan_assignment("Write an essay", due_date)
+    )
+
+
+def test_invalid_inputs_fall_back_without_retrying(auth_client, pool, due_date):
+    body = _create_async(auth_client, due_date)
+
+    def invalid_split(description, deadline):
+        raise ValueError("Due date cannot be in the past")
+
+    pool.split_fn = invalid_split
+
+    assert pool.run(body["jobId"]) == "failed"
+    assert pool.retried == []
+    status = auth_client.get(f"/assignments/{body['id']}/generation").get_json()
+    assert status["attempts"] == 1
+
+
+def test_finished_job_is_not_run_again(auth_client, pool, due_date, fake_anthropic):
+    body = _create_async(auth_client, due_date)
+    pool.split_fn = lambda d, dl: split_assignment(d, dl, client=fake_anthropic)
+    pool.run(body["jobId"])
+
+    assert pool.run(body["jobId"]) is None
+    assert fake_anthropic.calls == 1
+
+
+def test_resume_requeues_pending_and_stale_jobs(auth_client, pool, due_date):
+    pending = _create_async(auth_client, due_date)["jobId"]
+    stale = _create_async(auth_client, due_date)["jobId"]
+    fresh = _create_async(auth_client, due_date)["jobId"]
+    GenerationJob.query.filter_by(job_id=stale).update(
+        {"status": "running", "updated_at": datetime.utcnow() - timedelta(hours=1)}
+    )
+    GenerationJob.query.filter_by(job_id=fresh).update({"status": "running"})
+    db.session.commit()
+    pool.submitted.clear()
+
+    assert sorted(pool.resume()) == [pending, stale]
+    assert sorted(pool.submitted) == [pending, stale]
@@ -0,0 +1,160 @@
+"""
+Unit tests for rate limiting and retries of Google Tasks calls, run against a
+fake HTTP transport with a fake clock.
+"""
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from backend.services import google_tasks
+from backend.services.google_requests import RequestExecutor, RetryBudget, TokenBucket
+from backend.services.google_tasks import (
+    _get_tasks_service,
+    batch_insert_tasks,
+    create_task,
+    delete_task,
+)
+from backend.tests.fake_google_tasks import FakeTasksHttp
+
+
+class FakeClock:
+    """Monotonic clock that only moves when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_http(monkeypatch):
+    fake = FakeTasksHttp()
+    # create_task/delete_task take credentials only; serve them from the fake
+    monkeypatch.setattr(
+        google_tasks,
+        "_get_tasks_service",
+        lambda credentials, http=None: _get_tasks_service(None, http=fake),
+    )
+    return fake
+
+
+def _use(monkeypatch, clock, **kwargs):
+    options = {"user_rate": 0, "project_rate": 0, "jitter": lambda: 1.0, **kwargs}
+    executor = RequestExecutor(sleep=clock.sleep, clock=clock, **options)
+    monkeypatch.setattr(google_tasks, "executor", executor)
+    return executor
+
+
+def test_rate_limited_call_waits_for_retry_after(monkeypatch, clock, fake_http):
+    executor = _use(monkeypatch, clock)
+    fake_http.fail(429, retry_after=7)
+
+    task = create_task("@default", "Essay", credentials=object())
+
+    assert task["title"] == "Essay"
+    assert clock.sleeps == [7.0]
+    stats = executor.stats.snapshot()
+    assert (stats["calls"], stats["retries"], stats["rate_limited"]) == (1, 1, 1)
+
+
+def test_server_errors_back_off_exponentially(monkeypatch, clock, fake_http):
+    executor = _use(monkeypatch, clock, backoff_base=0.5)
+    fake_http.fail(503, times=3)
+
+    create_task("@default", "Essay", credentials=object())
+
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+    assert executor.stats.snapshot()["server_errors"] == 3
+
+
+def test_errors_are_reraised_unchanged(monkeypatch, clock, fake_http):
+    _use(monkeypatch, clock, max_retries=2)
+    fake_http.fail(400, reason="invalid")
+
+    with pytest.raises(HttpError) as excinfo:
+        create_task("@default", "Essay", credentials=object())
+    assert excinfo.value.resp.status == 400
+    assert clock.sleeps == []
+
+    fake_http.fail(503, times=3)
+    with pytest.raises(HttpError) as excinfo:
+        delete_task("@default", "task1", credentials=object())
+    assert excinfo.value.resp.status == 503
+
+
+@pytest.mark.parametrize(
+    "reason, retried", [("userRateLimitExceeded", True), ("forbidden", False)]
+)
+def test_only_quota_403s_are_retried(monkeypatch, clock, fake_http, reason, retried):
+    _use(monkeypatch, clock)
+    fake_http.fail(403, reason=reason)
+
+    if retried:
+        assert create_task("@default", "Essay", credentials=object())
+    else:
+        with pytest.raises(HttpError):
+            create_task("@default", "Essay", credentials=object())
+
+
+def test_retries_stop_when_budget_is_spent(monkeypatch, clock, fake_http):
+    executor = _use(monkeypatch, clock, budget=RetryBudget(ratio=0, burst=1))
+    fake_http.fail(503, times=3)
+
+    with pytest.raises(HttpError):
+        create_task("@default", "Essay", credentials=object())
+
+    stats = executor.stats.snapshot()
+    assert (stats["retries"], stats["budget_denied"]) == (1, 1)
+
+
+def test_failed_batch_calls_are_retried_in_a_smaller_batch(monkeypatch, clock):
+    executor = _use(monkeypatch, clock)
+    fake_http = FakeTasksHttp()
+    fake_http.fail(429, times=2, retry_after=1)
+    tasks = [(f"t{i}", {"title": f"Task {i}"}, None) for i in range(5)]
+
+    results = batch_insert_tasks("@default", tasks, http=fake_http)
+
+    assert all(isinstance(result, dict) for result in results.values())
+    assert len(fake_http.tasklists["@default"]) == 5
+    assert fake_http.batch_requests == 2
+    assert executor.stats.snapshot()["retries"] == 2
+    assert clock.sleeps == [1.0]
+
+
+def test_batches_are_paced_per_user(monkeypatch, clock):
+    monkeypatch.setattr(google_tasks, "_BATCH_SIZE", 5)
+    executor = _use(monkeypatch, clock, user_rate=10, burst=5)
+    tasks = [(f"t{i}", {"title": f"Task {i}"}, None) for i in range(20)]
+
+    batch_insert_tasks("@default", tasks, http=FakeTasksHttp(), user_key=1)
+
+    # 5 calls fit the burst; the other 15 arrive at 10 per second
+    assert sum(clock.sleeps) == pytest.approx(1.5)
+    assert executor.stats.snapshot()["throttled"] == 15
+
+    clock.sleeps.clear()
+    batch_insert_tasks("@default", tasks[:5], http=FakeTasksHttp(), user_key=2)
+    assert clock.sleeps == []
+
+
+def test_token_bucket_refills_and_pauses(clock):
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+    clock.now += 10
+    assert bucket.reserve() == 0.0
+
+    bucket.pause(3)
+    assert bucket.reserve() == pytest.approx(3.5)
@@ -0,0 +1,142 @@
+"""
+Unit tests for the async Google Tasks service, run against a mock transport.
+"""
+
+import asyncio
+import json
+from datetime import date
+
+import httpx
+import pytest
+from googleapiclient.errors import HttpError
+
+from backend.services import google_tasks_async
+from backend.services.google_requests import RequestExecutor
+
+
+class Recorder:
+    """httpx mock handler that records requests and answers with ``status``."""
+
+    def __init__(self, status=200, body=None):
+        self.status = status
+        self.body = body
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.body is None:
+            return httpx.Response(self.status)
+        return httpx.Response(self.status, json=self.body)
+
+
+def _run(coro_fn, handler, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            return await coro_fn(http=http, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_create_task_posts_to_the_tasklist():
+    handler = Recorder(body={"id": "t1", "title": "Essay"})
+
+    task = _run(
+        google_tasks_async.create_task,
+        handler,
+        tasklist_id="list-1",
+        title="Essay",
+        due_date=date(2030, 1, 5),
+        parent="p1",
+    )
+
+    assert task["id"] == "t1"
+    request = handler.requests[0]
+    assert request.method == "POST"
+    assert request.url.path == "/tasks/v1/lists/list-1/tasks"
+    assert request.url.params["parent"] == "p1"
+    assert json.loads(request.content) == {
+        "title": "Essay",
+        "status": "needsAction",
+        "due": "2030-01-05T00:00:00Z",
+    }
+
+
+def test_update_task_status_patches_the_task():
+    handler = Recorder(body={"id": "t1", "status": "completed"})
+
+    _run(
+        google_tasks_async.update_task_status,
+        handler,
+        tasklist_id="list-1",
+        task_id="t1",
+        status="completed",
+    )
+
+    request = handler.requests[0]
+    assert request.method == "PATCH"
+    assert request.url.path == "/tasks/v1/lists/list-1/tasks/t1"
+    assert json.loads(request.content)["status"] == "completed"
+
+
+def test_delete_of_missing_task_is_not_an_error():
+    handler = Recorder(status=404)
+
+    assert (
+        _run(
+            google_tasks_async.delete_task,
+            handler,
+            tasklist_id="list-1",
+            task_id="gone",
+        )
+        is None
+    )
+    assert handler.requests[0].method == "DELETE"
+
+
+def test_api_errors_raise_http_error():
+    handler = Recorder(status=403, body={"error": {"message": "forbidden"}})
+
+    with pytest.raises(HttpError) as excinfo:
+        _run(
+            google_tasks_async.update_task_status,
+            handler,
+            tasklist_id="list-1",
+            task_id="t1",
+            status="needsAction",
+        )
+
+    assert excinfo.value.resp.status == 403
+
+
+def test_credentials_are_required_without_a_client():
+    with pytest.raises(RuntimeError):
+        asyncio.run(google_tasks_async.create_task("list-1", "Essay"))
+
+
+def test_rate_limited_calls_are_retried(monkeypatch):
+    monkeypatch.setattr(
+        google_tasks_async,
+        "executor",
+        RequestExecutor(user_rate=0, project_rate=0, jitter=lambda: 0.0),
+    )
+    answers = [
+        httpx.Response(429, headers={"retry-after": "0"}),
+        httpx.Response(200, json={"id": "t1", "status": "completed"}),
+    ]
+    requests = []
+
+    def respond(request):
+        requests.append(request)
+        return answers.pop(0)
+
+    task = _run(
+        google_tasks_async.update_task_status,
+        respond,
+        tasklist_id="list-1",
+        task_id="t1",
+        status="completed",
+    )
+
+    assert task["id"] == "t1"
+    assert len(requests) == 2
+    assert google_tasks_async.executor.stats.snapshot()["retries"] == 1
@@ -0,0 +1,99 @@
+"""
+Unit tests for batched Google Tasks sync, run against a fake HTTP transport.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.database.models import Assignment, Milestone, Subtask, db
+from backend.services import google_tasks
+from backend.services.google_tasks import batch_insert_tasks, sync_assignment_tasks
+from backend.tests.fake_google_tasks import FakeTasksHttp
+
+
+@pytest.fixture
+def fake_http():
+    return FakeTasksHttp()
+
+
+@pytest.fixture
+def assignment(auth_client):
+    assignment = Assignment(
+        user_id=auth_client.user_id,
+        title="Essay",
+        deadline=date(2030, 1, 10),
+        created_at=datetime(2030, 1, 1),
+    )
+    for m_idx in range(3):
+        milestone = Milestone(
+            title=f"Milestone {m_idx}",
+            text=f"Milestone {m_idx}",
+            due_date=date(2030, 1, 5),
+            order=m_idx,
+        )
+        milestone.subtasks = [
+            Subtask(title=f"Subtask {m_idx}.{s_idx}", order=s_idx) for s_idx in range(2)
+        ]
+        assignment.milestones.append(milestone)
+    db.session.add(assignment)
+    db.session.commit()
+    return assignment
+
+
+def test_sync_pushes_tree_in_two_batches(assignment, fake_http):
+    summary = sync_assignment_tasks("@default", assignment, http=fake_http)
+    db.session.commit()
+
+    assert summary == {"milestonesCreated": 3, "subtasksCreated": 6, "failed": []}
+    assert fake_http.batch_requests == 2
+    remote = fake_http.tasklists["@default"]
+    for milestone in assignment.milestones:
+        assert remote[milestone.google_task_id]["title"] == milestone.title
+        assert remote[milestone.google_task_id]["due"] == "2030-01-05T00:00:00Z"
+        for subtask in milestone.subtasks:
+            assert remote[subtask.google_task_id]["parent"] == (
+                milestone.google_task_id
+            )
+
+
+def test_sync_skips_rows_already_linked(assignment, fake_http):
+    sync_assignment_tasks("@default", assignment, http=fake_http)
+    fake_http.batch_requests = 0
+
+    summary = sync_assignment_tasks("@default", assignment, http=fake_http)
+
+    assert summary["milestonesCreated"] == 0
+    assert summary["subtasksCreated"] == 0
+    assert fake_http.batch_requests == 0
+
+
+def test_batches_are_chunked(monkeypatch, fake_http):
+    monkeypatch.setattr(google_tasks, "_BATCH_SIZE", 50)
+    tasks = [(f"t{i}", {"title": f"Task {i}"}, None) for i in range(120)]
+
+    results = batch_insert_tasks("@default", tasks, http=fake_http)
+
+    assert fake_http.batch_requests == 3
+    assert len(results) == 120
+    assert results["t119"]["title"] == "Task 119"
+
+
+def test_failed_calls_are_reported_per_item(assignment, fake_http, monkeypatch):
+    handle = fake_http.handle
+
+    def flaky_handle(method, path, query, body):
+        if body and "Milestone 1" in body:
+            return 400, {"error": {"code": 400, "message": "Invalid task"}}
+        return handle(method, path, query, body)
+
+    monkeypatch.setattr(fake_http, "handle", flaky_handle)
+
+    summary = sync_assignment_tasks("@default", assignment, http=fake_http)
+
+    assert summary["milestonesCreated"] == 2
+    assert summary["subtasksCreated"] == 4
+    assert [f["key"] for f in summary["failed"]] == [
+        f"m{assignment.milestones[1].milestone_id}"
+    ]
+    assert assignment.milestones[1].google_task_id is None
@@ -0,0 +1,74 @@
+"""
+Unit tests for the cached Google Tasks service objects.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from backend.services import google_tasks
+from backend.services.google_tasks import (
+    _get_tasks_service,
+    clear_service_cache,
+    get_credentials_from_token,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_service_cache()
+    yield
+    clear_service_cache()
+
+
+def test_service_is_reused_for_same_token():
+    service = _get_tasks_service(get_credentials_from_token("token-a"))
+
+    assert _get_tasks_service(get_credentials_from_token("token-a")) is service
+    assert _get_tasks_service(get_credentials_from_token("token-b")) is not service
+
+
+def test_expired_token_rebuilds_service():
+    expired = Credentials(
+        token="token-a", expiry=datetime.utcnow() - timedelta(minutes=1)
+    )
+    service = _get_tasks_service(expired)
+
+    assert _get_tasks_service(expired) is not service
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(google_tasks, "_SERVICE_CACHE_SIZE", 2)
+    first = _get_tasks_service(get_credentials_from_token("token-1"))
+    _get_tasks_service(get_credentials_from_token("token-2"))
+    _get_tasks_service(get_credentials_from_token("token-3"))
+
+    assert len(google_tasks._service_cache()) == 2
+    assert _get_tasks_service(get_credentials_from_token("token-1")) is not first
+
+
+def test_threads_do_not_share_services():
+    credentials = get_credentials_from_token("token-a")
+    main_service = _get_tasks_service(credentials)
+    other = []
+    thread = threading.Thread(
+        target=lambda: other.append(_get_tasks_service(credentials))
+    )
+    thread.start()
+    thread.join()
+
+    assert other[0] is not main_service
+
+
+def test_service_uses_bundled_discovery_document():
+    service = _get_tasks_service(get_credentials_from_token("token-a"))
+
+    assert service._rootDesc["id"] == "tasks:v1"
+    assert service._baseUrl == "https://tasks.googleapis.com/"
+
+
+def test_missing_credentials_still_raise():
+    with pytest.raises(RuntimeError):
+        _get_tasks_service(None)
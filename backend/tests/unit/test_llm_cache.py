@@ -0,0 +1,116 @@
+"""
+Unit tests for the LLM split cache and its use in split_assignment.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from backend.services import llm_cache
+from backend.services.llm_splitter import (
+    _from_relative_dates,
+    _to_relative_dates,
+    split_assignment,
+)
+
+
+class FakeRedis:
+    """Local stand-in for a Redis client (get / set with ex=)."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        value, expires_at = self.store.get(key, (None, None))
+        if value is None or expires_at <= time.time():
+            return None
+        return value.encode("utf-8")
+
+    def set(self, key, value, ex=None):
+        self.store[key] = (value, time.time() + ex)
+
+
+def test_key_ignores_whitespace_but_not_inputs():
+    key = llm_cache.make_key("Write  an essay\n", 10, "model", "1")
+
+    assert key == llm_cache.make_key("Write an essay", 10, "model", "1")
+    assert key != llm_cache.make_key("Write an essay", 11, "model", "1")
+    assert key != llm_cache.make_key("Write an essay", 10, "other", "1")
+    assert key != llm_cache.make_key("Write an essay", 10, "model", "2")
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = llm_cache.InMemoryCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+def test_in_memory_cache_expires_entries():
+    cache = llm_cache.InMemoryCache(ttl=-1)
+    cache.set("a", "1")
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = llm_cache.SQLiteCache(path, max_entries=2)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    cache.set("b", "2")
+    time.sleep(0.01)
+    cache.set("c", "3")
+
+    reopened = llm_cache.SQLiteCache(path, max_entries=2)
+    assert reopened.get("a") is None
+    assert reopened.get("b") == "2"
+    assert reopened.get("c") == "3"
+    assert len(reopened) == 2
+
+
+def test_redis_cache_round_trip():
+    cache = llm_cache.RedisCache(FakeRedis(), ttl=60)
+    cache.set("a", "1")
+
+    assert cache.get("a") == "1"
+    assert cache.get("missing") is None
+
+
+def test_split_assignment_hits_cache_for_repeated_description(fake_anthropic, due_date):
+    first = split_assignment("Write an essay", due_date, client=fake_anthropic)
+    second = split_assignment("Write  an essay ", due_date, client=fake_anthropic)
+
+    assert fake_anthropic.calls == 1
+    assert second == first
+    stats = llm_cache.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cached_dates_are_relative_to_today(fake_anthropic, due_date):
+    milestones = split_assignment("Write an essay", due_date, client=fake_anthropic)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    relative = _to_relative_dates(milestones, today)
+    assert relative[1]["suggested_end_date"] == 14
+
+    # A hit on a later day shifts every date by the same amount
+    shifted = _from_relative_dates(relative, today + timedelta(days=1))
+    assert shifted[1]["suggested_end_date"] == (
+        datetime.strptime(due_date, "%Y-%m-%d") + timedelta(days=1)
+    ).strftime("%Y-%m-%d")
+
+
+def test_disabled_cache_always_calls_llm(fake_anthropic, due_date):
+    llm_cache.set_cache(None)
+
+    split_assignment("Write an essay", due_date, client=fake_anthropic)
+    split_assignment("Write an essay", due_date, client=fake_anthropic)
+
+    assert fake_anthropic.calls == 2
@@ -0,0 +1,71 @@
+"""
+Unit tests for the pooled Anthropic client registry.
+"""
+
+import threading
+from types import SimpleNamespace
+
+from backend.services import llm_client
+
+
+def _fake_factory(api_key):
+    return SimpleNamespace(api_key=api_key, closed=False)
+
+
+def test_registry_reuses_one_client_per_key():
+    registry = llm_client.ClientRegistry(factory=_fake_factory)
+
+    first = registry.get("key-a")
+
+    assert registry.get("key-a") is first
+    assert registry.get("key-b") is not first
+    assert registry.stats.snapshot()["clients_created"] == 2
+
+
+def test_registry_builds_once_under_concurrency():
+    registry = llm_client.ClientRegistry(factory=_fake_factory)
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(registry.get("key")))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in seen}) == 1
+    assert registry.stats.snapshot()["clients_created"] == 1
+
+
+def test_fork_child_gets_fresh_clients():
+    registry = llm_client.ClientRegistry(factory=_fake_factory)
+    parent_client = registry.get("key")
+
+    registry.after_fork_in_child()
+
+    assert registry.get("key") is not parent_client
+
+
+def test_reuse_rate_and_saved_latency():
+    registry = llm_client.ClientRegistry(factory=_fake_factory)
+    client = registry.get("key")
+
+    registry.record_call(client, 0.5)  # cold: opens the connection
+    registry.record_call(client, 0.2)
+    registry.record_call(client, 0.2)
+    registry.record_call(object(), 9.9)  # not pooled, ignored
+
+    stats = registry.stats.snapshot()
+    assert stats["calls"] == 3
+    assert stats["reuse_rate"] == 2 / 3
+    assert stats["saved_seconds_per_call"] == 0.3
+    assert stats["saved_seconds_total"] == 0.6
+
+
+def test_build_client_applies_pool_settings():
+    client = llm_client.build_client("test-key")
+
+    assert client.api_key == "test-key"
+    assert client.timeout.connect == llm_client._CONNECT_TIMEOUT
+    client.close()
@@ -0,0 +1,132 @@
+"""
+Unit tests for streaming milestone generation and the SSE endpoint.
+"""
+
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from backend.api.routes import milestones as milestone_routes
+from backend.services import llm_cache
+from backend.services.llm_splitter import (
+    _MilestoneStreamParser,
+    split_assignment,
+    stream_split_assignment,
+)
+
+
+class FakeStreamingAnthropic:
+    """Stand-in for ``client.messages.stream`` that replays text chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+        self.messages = self
+
+    def _text_stream(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    @contextmanager
+    def stream(self, **kwargs):
+        yield SimpleNamespace(text_stream=self._text_stream())
+
+
+def _chunked(milestones, size=7):
+    text = "```json\n" + json.dumps(milestones, indent=2) + "\n```"
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.fixture
+def streaming_client(fake_anthropic):
+    return FakeStreamingAnthropic(_chunked(json.loads(fake_anthropic.text)))
+
+
+def test_parser_handles_braces_and_escapes_inside_strings():
+    parser = _MilestoneStreamParser()
+    text = (
+        '[{"title": "Use {braces} and \\"quotes\\"", "dependencies": [1]}, {"id": 2}]'
+    )
+
+    objects = []
+    for char in text:
+        objects.extend(parser.feed(char))
+
+    assert objects == [
+        {"title": 'Use {braces} and "quotes"', "dependencies": [1]},
+        {"id": 2},
+    ]
+
+
+def test_first_milestone_is_yielded_before_stream_ends(streaming_client, due_date):
+    milestones = stream_split_assignment(
+        "Write an essay", due_date, client=streaming_client
+    )
+
+    first = next(milestones)
+
+    assert first["title"] == "Research"
+    assert streaming_client.consumed < len(streaming_client.chunks)
+    assert [m["title"] for m in milestones] == ["Write"]
+
+
+def test_streamed_result_is_cached(streaming_client, fake_anthropic, due_date):
+    streamed = list(
+        stream_split_assignment("Write an essay", due_date, client=streaming_client)
+    )
+
+    assert split_assignment("Write an essay", due_date, client=fake_anthropic) == (
+        streamed
+    )
+    assert fake_anthropic.calls == 0
+    assert llm_cache.get_cache_stats()["hits"] == 1
+
+
+def test_invalid_inputs_raise_before_streaming(streaming_client):
+    with pytest.raises(ValueError):
+        next(stream_split_assignment("Essay", "2000-01-01", client=streaming_client))
+
+
+def test_stream_endpoint_emits_sse_events(
+    auth_client, monkeypatch, streaming_client, due_date
+):
+    monkeypatch.setattr(
+        milestone_routes,
+        "stream_split_assignment",
+        lambda d, dl: stream_split_assignment(d, dl, client=streaming_client),
+    )
+
+    response = auth_client.post(
+        "/llm/split/stream",
+        json={"description": "Write an essay", "deadline": due_date},
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = [
+        block.split("\n")
+        for block in response.get_data(as_text=True).strip().split("\n\n")
+    ]
+    assert [e[0] for e in events] == [
+        "event: milestone",
+        "event: milestone",
+        "event: done",
+    ]
+    assert json.loads(events[0][1][len("data: ") :])["title"] == "Research"
+
+
+def test_stream_endpoint_rejects_bad_deadline(auth_client):
+    response = auth_client.get(
+        "/llm/split/stream?description=Essay&deadline=not-a-date"
+    )
+
+    assert response.status_code == 400
+
+
+def test_stream_endpoint_requires_login(client):
+    response = client.post("/llm/split/stream", json={})
+
+    assert response.status_code == 401
@@ -0,0 +1,136 @@
+"""
+Unit tests for the local milestone planner and generation modes.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.services import local_planner
+from backend.services.local_planner import generate_milestones, plan_assignment
+
+
+def _titles(milestones):
+    return [m["title"] for m in milestones]
+
+
+def test_plan_matches_split_assignment_shape(due_date):
+    plan = plan_assignment("Write an essay", due_date)
+
+    assert set(plan[0]) == {
+        "id",
+        "title",
+        "description",
+        "suggested_start_date",
+        "suggested_end_date",
+        "dependencies",
+    }
+    assert [m["id"] for m in plan] == list(range(1, len(plan) + 1))
+    assert plan[0]["dependencies"] == []
+    assert plan[1]["dependencies"] == [1]
+
+
+def test_plan_detects_phases_from_keywords(due_date):
+    plan = plan_assignment(
+        "Read the literature, write an outline, then present slides", due_date
+    )
+
+    assert _titles(plan) == [
+        "Research and gather sources",
+        "Outline and plan",
+        "Draft the main work",
+        "Finalize and submit",
+    ]
+
+
+def test_long_description_gets_full_plan(due_date):
+    plan = plan_assignment(" ".join(["topic"] * 60), due_date)
+
+    assert len(plan) == 5
+
+
+def test_plan_covers_schedule_without_overlap(due_date):
+    plan = plan_assignment("Research and write a report, then revise it", due_date)
+    today = datetime.now().date().isoformat()
+
+    assert plan[0]["suggested_start_date"] == today
+    assert plan[-1]["suggested_end_date"] == due_date
+    for previous, current in zip(plan, plan[1:]):
+        assert previous["suggested_end_date"] < current["suggested_start_date"]
+
+
+def test_plan_is_deterministic(due_date):
+    assert plan_assignment("Write an essay", due_date) == plan_assignment(
+        "Write an essay", due_date
+    )
+
+
+def test_plan_handles_one_day_deadline():
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    plan = plan_assignment("Write an essay", tomorrow)
+
+    assert plan[-1]["suggested_end_date"] == tomorrow
+
+
+def test_plan_rejects_past_deadline():
+    with pytest.raises(ValueError):
+        plan_assignment("Write an essay", "2000-01-01")
+
+
+def _failing_split(description, due_date):
+    raise RuntimeError("Claude is down")
+
+
+def _slow_split(description, due_date):
+    time.sleep(0.5)
+    return [{"title": "From LLM"}]
+
+
+def test_fallback_mode_uses_plan_when_llm_fails(due_date):
+    milestones = generate_milestones(
+        "Write an essay", due_date, mode="fallback", split_fn=_failing_split
+    )
+
+    assert milestones == plan_assignment("Write an essay", due_date)
+
+
+def test_off_mode_propagates_llm_errors(due_date):
+    with pytest.raises(RuntimeError):
+        generate_milestones("Essay", due_date, mode="off", split_fn=_failing_split)
+
+
+def test_primary_mode_skips_llm_for_short_descriptions(due_date):
+    calls = []
+
+    def split(description, due_date):
+        calls.append(description)
+        return [{"title": "From LLM"}]
+
+    short = generate_milestones("Essay", due_date, mode="primary", split_fn=split)
+    long = generate_milestones("x" * 1000, due_date, mode="primary", split_fn=split)
+
+    assert short == plan_assignment("Essay", due_date)
+    assert long == [{"title": "From LLM"}]
+    assert len(calls) == 1
+
+
+def test_race_mode_answers_within_budget(monkeypatch, due_date):
+    monkeypatch.setattr(local_planner, "_RACE_BUDGET", 0.05)
+
+    started = time.perf_counter()
+    milestones = generate_milestones(
+        "Essay", due_date, mode="race", split_fn=_slow_split
+    )
+
+    assert time.perf_counter() - started < 0.4
+    assert milestones == plan_assignment("Essay", due_date)
+
+
+def test_race_mode_prefers_fast_llm(due_date):
+    milestones = generate_milestones(
+        "Essay", due_date, mode="race", split_fn=lambda d, dl: [{"title": "LLM"}]
+    )
+
+    assert milestones == [{"title": "LLM"}]
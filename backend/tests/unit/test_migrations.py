@@ -0,0 +1,163 @@
+"""
+Unit tests for the Alembic migration chain, run against SQLite files.
+"""
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+from backend.database.migrate import downgrade, main, upgrade
+from backend.database.models import db
+from backend.services.generation_jobs import GenerationWorkerPool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _schema_drift(engine):
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"compare_type": True})
+        return compare_metadata(context, db.metadata)
+
+
+def test_fresh_database_matches_models(engine):
+    upgrade(engine)
+
+    assert _schema_drift(engine) == []
+
+
+def test_downgrade_and_upgrade_round_trip(engine):
+    upgrade(engine)
+    downgrade(engine, "0001_baseline")
+    upgrade(engine)
+
+    assert _schema_drift(engine) == []
+
+
+def test_upgrade_adds_missing_columns_to_legacy_database(engine):
+    upgrade(engine, "0001_baseline")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO user (user_id, username, email, name, password) "
+            "VALUES (1, 'ada', 'ada@example.com', 'Ada', 'x')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO assignment "
+            "(assignment_id, user_id, title, deadline, progress, created_at) VALUES "
+            "(1, 1, 'Essay', '2025-11-12', 0, '2025-11-11T14:23:57.959Z'), "
+            "(2, 1, 'Lab', '11/23/2025', 0, '2025-11-14 04:16:37'), "
+            "(3, 1, 'Quiz', 'soon', 0, 'unknown')"
+        )
+        conn.exec_driver_sql(
+            'INSERT INTO milestone (milestone_id, assignment_id, title, due_date, "order") '
+            "VALUES (1, 1, 'Research', '2025-11-20', 0), (2, 1, 'Draft', 'tbd', 1)"
+        )
+
+    upgrade(engine)
+
+    with engine.connect() as conn:
+        assignments = conn.execute(
+            db.select(
+                db.metadata.tables["assignment"].c[
+                    "deadline", "created_at", "archived", "status", "version"
+                ]
+            ).order_by("assignment_id")
+        ).all()
+        milestones = conn.exec_driver_sql(
+            "SELECT text, due_date FROM milestone ORDER BY milestone_id"
+        ).all()
+
+    assert [str(a.deadline) for a in assignments[:2]] == ["2025-11-12", "2025-11-23"]
+    assert str(assignments[0].created_at) == "2025-11-11 14:23:57.959000"
+    assert assignments[2].deadline is not None
+    assert {(a.archived, a.status, a.version) for a in assignments} == {
+        (False, "ready", 1)
+    }
+    assert milestones == [("Research", "2025-11-20"), ("Draft", None)]
+    assert _schema_drift(engine) == []
+
+
+def test_upgrade_backfills_change_times_of_linked_rows(engine):
+    upgrade(engine, "0006_username_counter")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO user (user_id, username, email, name, password) "
+            "VALUES (1, 'ada', 'ada@example.com', 'Ada', 'x')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO assignment "
+            "(assignment_id, user_id, title, deadline, progress, created_at) "
+            "VALUES (1, 1, 'Essay', '2030-01-10', 0, '2030-01-01 00:00:00')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO milestone "
+            '(milestone_id, assignment_id, title, google_task_id, "order") '
+            "VALUES (1, 1, 'Research', 'T1', 0)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO subtask (subtask_id, milestone_id, title, google_task_id) "
+            "VALUES (1, 1, 'Read', 'T2')"
+        )
+
+    upgrade(engine)
+
+    with engine.connect() as conn:
+        for table in ("milestone", "subtask"):
+            updated_at, synced_at = conn.exec_driver_sql(
+                f"SELECT updated_at, synced_at FROM {table}"
+            ).one()
+            assert updated_at is not None
+            assert synced_at is None
+    columns = {c["name"]: c for c in inspect(engine).get_columns("milestone")}
+    assert columns["updated_at"]["nullable"] is False
+    assert _schema_drift(engine) == []
+
+
+def test_upgrade_keeps_tables_created_by_create_all(app):
+    # A database bootstrapped with db.create_all() before migrations existed
+    upgrade(db.engine)
+
+    indexes = {
+        index["name"]: index for index in inspect(db.engine).get_indexes("assignment")
+    }
+    assert "ix_assignment_user_archived_deadline" in indexes
+    assert "ix_assignment_active_user_deadline" in indexes
+    assert _schema_drift(db.engine) == []
+
+
+def test_active_listing_is_served_by_an_index(engine):
+    upgrade(engine)
+
+    with engine.connect() as conn:
+        (index_sql,) = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master "
+            "WHERE name = 'ix_assignment_active_user_deadline'"
+        ).one()
+        plan = conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT assignment_id FROM assignment "
+            "WHERE user_id = 1 AND archived = 0 ORDER BY deadline"
+        ).all()
+
+    detail = " ".join(row[-1] for row in plan)
+    assert index_sql.endswith("WHERE archived = 0")
+    assert "USING COVERING INDEX ix_assignment_" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_cli_does_not_start_generation_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'cli.db'}")
+    resumed = []
+    monkeypatch.setattr(GenerationWorkerPool, "resume", resumed.append)
+
+    main(["upgrade"])
+    main(["upgrade"])
+
+    assert resumed == []
+    engine = create_engine(f"sqlite:///{tmp_path / 'cli.db'}")
+    assert _schema_drift(engine) == []
+    engine.dispose()
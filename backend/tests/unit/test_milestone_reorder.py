@@ -0,0 +1,148 @@
+"""
+Unit tests for gap-based milestone ordering and the reorder route.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.database.models import Assignment, Milestone, db
+from backend.services.ordering import GAP, reorder_keys
+
+
+def _apply(current, new_order):
+    changes = reorder_keys(current, new_order)
+    keys = {**current, **changes}
+    assert sorted(new_order, key=keys.get) == new_order
+    assert len(set(keys.values())) == len(keys)
+    return changes
+
+
+def test_moving_one_item_touches_one_row():
+    current = {i: i * GAP for i in range(1, 11)}
+
+    changes = _apply(current, [1, 2, 9, 3, 4, 5, 6, 7, 8, 10])
+
+    assert list(changes) == [9]
+    assert 2 * GAP < changes[9] < 3 * GAP
+
+
+def test_moves_to_the_ends_use_gaps_outside_the_range():
+    current = {i: i * GAP for i in range(1, 5)}
+
+    assert list(_apply(current, [4, 1, 2, 3])) == [4]
+    assert list(_apply(current, [2, 3, 4, 1])) == [1]
+
+
+def test_dense_keys_are_respaced_when_there_is_no_gap():
+    current = {1: 0, 2: 1, 3: 2}
+
+    changes = _apply(current, [1, 3, 2])
+
+    assert {**current, **changes} == {1: 0, 3: GAP, 2: 2 * GAP}
+
+
+def test_unchanged_order_writes_nothing():
+    current = {1: 5, 2: 7, 3: 9}
+
+    assert reorder_keys(current, [1, 2, 3]) == {}
+
+
+@pytest.mark.parametrize(
+    "current",
+    [
+        {1: None, 2: None, 3: None},
+        {1: 0, 2: 0, 3: 0},
+        {1: 3 * GAP, 2: None, 3: GAP},
+    ],
+)
+def test_missing_and_duplicate_keys_are_repaired(current):
+    _apply(current, [3, 1, 2])
+
+
+@pytest.fixture
+def assignment(auth_client):
+    assignment = Assignment(
+        user_id=auth_client.user_id,
+        title="Essay",
+        deadline=date(2030, 1, 10),
+        created_at=datetime(2030, 1, 1),
+    )
+    assignment.milestones = [
+        Milestone(title=text, text=text, order=idx * GAP)
+        for idx, text in enumerate(["Research", "Outline", "Draft", "Revise"])
+    ]
+    db.session.add(assignment)
+    db.session.commit()
+    return assignment
+
+
+def _reorder(client, assignment, order):
+    return client.patch(
+        f"/assignments/{assignment.assignment_id}/milestones/reorder",
+        json={"order": order},
+    )
+
+
+def test_reorder_route_updates_only_moved_rows(auth_client, assignment, query_counter):
+    ids = [m.milestone_id for m in assignment.milestones]
+    new_order = [ids[0], ids[3], ids[1], ids[2]]
+    query_counter.clear()
+
+    response = _reorder(auth_client, assignment, new_order)
+
+    assert response.status_code == 200
+    assert response.get_json()["moved"] == [ids[3]]
+    assert len([s for s in query_counter if s.startswith("UPDATE milestone")]) == 1
+    listed = auth_client.get(f"/assignments/{assignment.assignment_id}").get_json()
+    assert [s["id"] for s in listed["subtasks"]] == new_order
+
+
+def test_reorder_rejects_mismatched_lists(auth_client, assignment):
+    ids = [m.milestone_id for m in assignment.milestones]
+
+    assert _reorder(auth_client, assignment, ids[:3]).status_code == 400
+    assert _reorder(auth_client, assignment, ids[:3] + ids[:1]).status_code == 400
+
+
+def test_reorder_of_unknown_assignment_is_404(auth_client):
+    response = auth_client.patch(
+        "/assignments/999/milestones/reorder", json={"order": [1]}
+    )
+
+    assert response.status_code == 404
+
+
+def _keys():
+    rows = db.session.execute(db.select(Milestone.milestone_id, Milestone.order))
+    return dict(rows.all())
+
+
+def test_edits_after_a_reorder_keep_the_gap_keys(
+    auth_client, assignment, query_counter
+):
+    ids = [m.milestone_id for m in assignment.milestones]
+    _reorder(auth_client, assignment, [ids[0], ids[3], ids[1], ids[2]])
+    _reorder(auth_client, assignment, [ids[2], ids[0], ids[3], ids[1]])
+    url = f"/assignments/{assignment.assignment_id}"
+    subtasks = auth_client.get(url).get_json()["subtasks"]
+    keys = _keys()
+    subtasks[1]["completed"] = True
+    query_counter.clear()
+
+    body = auth_client.put(url, json={"subtasks": subtasks}).get_json()
+
+    assert body["changes"]["updated"] == [subtasks[1]["id"]]
+    assert body["changes"]["reordered"] == []
+    assert len([s for s in query_counter if s.startswith("UPDATE milestone")]) == 1
+
+    query_counter.clear()
+    response = auth_client.patch(
+        url, json=[{"op": "replace", "path": "/title", "value": "Final essay"}]
+    )
+
+    assert response.status_code == 200
+    assert [s for s in query_counter if s.startswith("UPDATE milestone")] == []
+    assert _keys() == keys
+    listed = auth_client.get(url).get_json()["subtasks"]
+    assert [s["id"] for s in listed] == [ids[2], ids[0], ids[3], ids[1]]
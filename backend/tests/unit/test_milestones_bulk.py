@@ -0,0 +1,173 @@
+"""
+Unit tests for PATCH /milestones/bulk, PATCH /milestones/{id} and progress.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select
+
+from backend.database.models import Assignment, Milestone, Subtask, User, db
+
+
+@pytest.fixture
+def assignments(auth_client):
+    created = []
+    for title in ("Essay", "Lab"):
+        assignment = Assignment(
+            user_id=auth_client.user_id,
+            title=title,
+            deadline=date(2030, 1, 10),
+            created_at=datetime(2030, 1, 1),
+        )
+        assignment.milestones = [
+            Milestone(title=text, text=text, order=idx)
+            for idx, text in enumerate(["Research", "Draft", "Revise"])
+        ]
+        db.session.add(assignment)
+        created.append(assignment)
+    created[0].milestones[1].subtasks = [
+        Subtask(title="Intro", order=0, completed=True),
+        Subtask(title="Body", order=1),
+    ]
+    db.session.commit()
+    return created
+
+
+@pytest.fixture
+def other_milestone_id(app):
+    other = User(username="eve", email="eve@example.com", name="Eve", password="x")
+    assignment = Assignment(
+        user=other, title="Secret", deadline=date(2030, 1, 1), created_at=datetime.now()
+    )
+    assignment.milestones = [Milestone(title="Hidden", text="Hidden", order=0)]
+    db.session.add(assignment)
+    db.session.commit()
+    return assignment.milestones[0].milestone_id
+
+
+def _ids(assignment):
+    return [m.milestone_id for m in assignment.milestones]
+
+
+def _stored(column, assignment_id):
+    return db.session.scalar(
+        select(column).where(Assignment.assignment_id == assignment_id)
+    )
+
+
+def test_bulk_update_writes_once_and_recomputes_progress(
+    auth_client, assignments, query_counter
+):
+    essay, lab = assignments
+    query_counter.clear()
+
+    response = auth_client.patch(
+        "/milestones/bulk",
+        json={
+            "milestones": [
+                {"id": _ids(essay)[0], "completed": True},
+                {"id": _ids(essay)[2], "completed": True, "text": "Revise twice"},
+                {"id": _ids(lab)[1], "completed": True},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.get_json()
+    # Essay: 2 of 3 milestones + 1 of 2 subtasks; Lab: 1 of 3 milestones
+    assert body["assignments"] == [
+        {"id": essay.assignment_id, "progress": 60},
+        {"id": lab.assignment_id, "progress": 33},
+    ]
+    assert [m["completed"] for m in body["milestones"]] == [True, True, True]
+    assert body["milestones"][1]["text"] == "Revise twice"
+    assert _stored(Assignment.progress, essay.assignment_id) == 60
+    assert _stored(Assignment.version, essay.assignment_id) == 2
+
+    milestone_updates = [s for s in query_counter if s.startswith("UPDATE milestone")]
+    assert len(milestone_updates) == 1
+    assert len([s for s in query_counter if s.startswith("UPDATE assignment")]) == 1
+
+
+def test_bulk_update_authorizes_with_one_query(auth_client, assignments, query_counter):
+    query_counter.clear()
+
+    auth_client.patch(
+        "/milestones/bulk",
+        json=[{"id": i, "completed": True} for i in _ids(assignments[0])],
+    )
+
+    lookups = [
+        s for s in query_counter if s.startswith("SELECT") and "JOIN assignment" in s
+    ]
+    assert len(lookups) == 1
+
+
+def test_foreign_milestones_reject_the_whole_batch(
+    auth_client, assignments, other_milestone_id
+):
+    own = _ids(assignments[0])[0]
+
+    response = auth_client.patch(
+        "/milestones/bulk",
+        json=[{"id": own, "completed": True}, {"id": other_milestone_id, "text": "x"}],
+    )
+
+    assert response.status_code == 404
+    assert response.get_json()["ids"] == [other_milestone_id]
+    assert not db.session.scalar(
+        select(Milestone.completed).where(Milestone.milestone_id == own)
+    )
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"milestones": []},
+        [{"completed": True}],
+        [{"id": 1, "completed": "yes"}],
+        [{"id": 1}, {"id": 1}],
+        {"milestones": [{"id": 1, "text": 3}]},
+    ],
+)
+def test_malformed_bulk_bodies(auth_client, body):
+    assert auth_client.patch("/milestones/bulk", json=body).status_code == 400
+
+
+def test_single_update_recomputes_progress(auth_client, assignments):
+    lab = assignments[1]
+
+    response = auth_client.patch(
+        f"/milestones/{_ids(lab)[0]}", json={"completed": True}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["id"] == _ids(lab)[0]
+    assert response.get_json()["completed"] is True
+    assert _stored(Assignment.progress, lab.assignment_id) == 33
+
+
+def test_single_update_hides_other_users_milestones(auth_client, other_milestone_id):
+    response = auth_client.patch(
+        f"/milestones/{other_milestone_id}", json={"completed": True}
+    )
+
+    assert response.status_code == 404
+
+
+def test_text_edits_keep_title_in_step(auth_client, assignments):
+    essay = assignments[0]
+    long_text = "x" * 600
+
+    auth_client.patch(
+        "/milestones/bulk", json=[{"id": _ids(essay)[0], "text": "Read widely"}]
+    )
+    auth_client.patch(f"/milestones/{_ids(essay)[1]}", json={"text": long_text})
+
+    titles = db.session.scalars(
+        select(Milestone.title)
+        .where(Milestone.milestone_id.in_(_ids(essay)))
+        .order_by(Milestone.milestone_id)
+    ).all()
+    assert titles == ["Read widely", "x" * 500, "Revise"]
@@ -0,0 +1,111 @@
+"""
+Unit tests for the bounded bcrypt pool, cost calibration and rehash-on-login.
+"""
+
+import threading
+import time
+
+import pytest
+
+from backend.database.models import User, db
+from backend.services.password_hashing import (
+    HasherBusy,
+    PasswordHasher,
+    _rounds_of,
+    calibrate,
+    hasher,
+)
+
+
+def _login(client, password="secret"):
+    return client.post(
+        "/auth/login", json={"email": "student@example.com", "password": password}
+    )
+
+
+def test_pool_rejects_work_beyond_workers_and_queue():
+    pool = PasswordHasher(workers=2, max_queue=1)
+    results = []
+
+    def run():
+        try:
+            results.append(pool._submit(time.sleep, 0.3))
+        except HasherBusy as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    rejected = [r for r in results if isinstance(r, HasherBusy)]
+    assert len(rejected) == 2
+    assert pool.rejected == 2
+    assert all(e.retry_after >= 1 for e in rejected)
+    assert pool._pending == 0
+
+
+def test_calibration_respects_bounds():
+    assert calibrate.__wrapped__(60.0, 4, 6)[0] == 6
+    assert calibrate.__wrapped__(1e-9, 4, 6)[0] == 4
+
+
+def test_busy_pool_answers_503_with_retry_after(auth_client, monkeypatch):
+    monkeypatch.setattr(hasher, "max_queue", 0)
+    monkeypatch.setattr(hasher, "_pending", hasher.workers)
+
+    response = _login(auth_client)
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_login_rehashes_when_cost_changes(auth_client, monkeypatch):
+    user = db.session.get(User, auth_client.user_id)
+    assert _rounds_of(user.password) == hasher.rounds
+    monkeypatch.setattr(hasher, "rounds", hasher.rounds + 1)
+
+    response = _login(auth_client)
+
+    assert response.status_code == 200
+    db.session.refresh(user)
+    assert _rounds_of(user.password) == hasher.rounds
+    assert _login(auth_client).status_code == 200
+
+
+def test_stronger_hashes_are_not_downgraded(auth_client, monkeypatch):
+    user = db.session.get(User, auth_client.user_id)
+    monkeypatch.setattr(hasher, "rounds", hasher.rounds + 1)
+    user.password = hasher.hash("secret")
+    db.session.commit()
+    strong_hash = user.password
+    monkeypatch.undo()
+
+    assert _login(auth_client).status_code == 200
+
+    db.session.refresh(user)
+    assert user.password == strong_hash
+    assert not hasher.needs_rehash(strong_hash)
+
+
+def test_wrong_password_is_not_rehashed(auth_client, monkeypatch):
+    user = db.session.get(User, auth_client.user_id)
+    old_hash = user.password
+    monkeypatch.setattr(hasher, "rounds", hasher.rounds + 1)
+
+    assert _login(auth_client, password="wrong").status_code == 401
+
+    db.session.refresh(user)
+    assert user.password == old_hash
+
+
+@pytest.mark.parametrize("rounds", [4, 5])
+def test_hash_round_trip(rounds, monkeypatch):
+    monkeypatch.setattr(hasher, "rounds", rounds)
+
+    pw_hash = hasher.hash("secret")
+
+    assert _rounds_of(pw_hash) == rounds
+    assert hasher.check(pw_hash, "secret")
+    assert not hasher.check(pw_hash, "other")
@@ -0,0 +1,155 @@
+"""
+Unit tests for ETags, 304s and the per-user response cache on GET routes.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from backend.database.models import Assignment, Milestone, db
+from backend.services.response_cache import CachedResponse, ResponseCache
+
+
+@pytest.fixture
+def assignment_id(auth_client):
+    for title in ("Essay", "Lab", "Quiz"):
+        assignment = Assignment(
+            user_id=auth_client.user_id,
+            title=title,
+            deadline=date(2030, 1, 10),
+            created_at=datetime(2030, 1, 1),
+        )
+        assignment.milestones = [
+            Milestone(title=text, text=text, order=idx)
+            for idx, text in enumerate(["Research", "Draft"])
+        ]
+        db.session.add(assignment)
+    db.session.commit()
+    return assignment.assignment_id
+
+
+def _tree_queries(statements):
+    return [s for s in statements if "assignment" in s or "milestone" in s]
+
+
+def test_repeated_list_is_served_from_cache(auth_client, assignment_id, query_counter):
+    first = auth_client.get("/assignments")
+    query_counter.clear()
+
+    second = auth_client.get("/assignments")
+
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["Cache-Control"] == "private, no-cache"
+    assert _tree_queries(query_counter) == []
+
+
+def test_unchanged_poll_gets_304(app, auth_client, assignment_id, query_counter):
+    etag = auth_client.get("/assignments").headers["ETag"]
+    app.extensions["response_cache"].clear()
+    query_counter.clear()
+
+    response = auth_client.get("/assignments", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    assert _tree_queries(query_counter) == []
+
+
+def test_single_assignment_304_skips_milestones(
+    app, auth_client, assignment_id, query_counter
+):
+    url = f"/assignments/{assignment_id}"
+    etag = auth_client.get(url).headers["ETag"]
+    app.extensions["response_cache"].clear()
+    query_counter.clear()
+
+    response = auth_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert not any("milestone" in s for s in query_counter)
+
+
+def test_writes_change_the_etag(auth_client, assignment_id):
+    url = f"/assignments/{assignment_id}"
+    before = auth_client.get("/assignments")
+    etag = auth_client.get(url).headers["ETag"]
+
+    patched = auth_client.patch(
+        url,
+        json=[{"op": "replace", "path": "/title", "value": "Final quiz"}],
+        headers={"If-Match": etag},
+    )
+    listing = auth_client.get(
+        "/assignments", headers={"If-None-Match": before.headers["ETag"]}
+    )
+    single = auth_client.get(url, headers={"If-None-Match": etag})
+
+    assert patched.status_code == 200
+    assert listing.status_code == 200
+    assert listing.headers["ETag"] != before.headers["ETag"]
+    assert "Final quiz" in {a["title"] for a in listing.get_json()}
+    assert single.status_code == 200
+    assert single.headers["ETag"] == patched.headers["ETag"]
+    assert single.get_json()["title"] == "Final quiz"
+
+
+def test_archiving_invalidates_both_listings(auth_client, assignment_id):
+    auth_client.get("/assignments")
+    auth_client.get("/assignments/archived")
+
+    auth_client.delete(f"/assignments/{assignment_id}")
+
+    assert len(auth_client.get("/assignments").get_json()) == 2
+    assert len(auth_client.get("/assignments/archived").get_json()) == 1
+
+
+def test_cached_page_keeps_its_cursor(auth_client, assignment_id):
+    first = auth_client.get("/assignments?limit=2")
+    second = auth_client.get("/assignments?limit=2")
+
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+
+def test_cache_is_per_user(app, auth_client, assignment_id):
+    auth_client.get("/assignments")
+    other = app.test_client()
+    other.post(
+        "/auth/signup",
+        json={"email": "other@example.com", "password": "secret", "name": "Other"},
+    )
+
+    assert other.get("/assignments").get_json() == []
+
+
+def _entry(version):
+    return CachedResponse(version, f"1-{version}", b"[]", {})
+
+
+def test_stale_entries_are_dropped():
+    cache = ResponseCache(max_entries=4)
+    cache.set(1, "/assignments", _entry(1))
+
+    assert cache.get(1, "/assignments", 1) == _entry(1)
+    assert cache.get(1, "/assignments", 2) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.set(1, "/a", _entry(1))
+    cache.set(1, "/b", _entry(1))
+    cache.get(1, "/a", 1)
+    cache.set(1, "/c", _entry(1))
+
+    assert cache.get(1, "/b", 1) is None
+    assert cache.get(1, "/a", 1) is not None
+
+
+def test_zero_capacity_disables_the_cache():
+    cache = ResponseCache(max_entries=0)
+    cache.set(1, "/a", _entry(1))
+
+    assert len(cache) == 0
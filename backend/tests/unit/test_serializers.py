@@ -0,0 +1,133 @@
+"""
+Unit tests for the row-based assignment serializers and JSON backends.
+"""
+
+import json
+import sys
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select
+
+from backend.api import serializers
+from backend.api.serializers import (
+    ASSIGNMENT_FIELDS,
+    assignment_serializer,
+    load_backend,
+    serialize_assignment,
+)
+from backend.database.models import Assignment, Milestone, db
+
+
+@pytest.fixture
+def assignments(auth_client):
+    created = []
+    for i in range(5):
+        assignment = Assignment(
+            user_id=auth_client.user_id,
+            title=f"Übung {i}",
+            description="Lies das Kapitel",
+            deadline=date(2030, 1, 10 + i),
+            created_at=datetime(2030, 1, 1, 9, 30),
+        )
+        assignment.milestones = [
+            Milestone(title=text, text=text, order=order, completed=order == 0)
+            for order, text in ((1, "Draft"), (0, "Research"), (2, "Revise"))
+        ]
+        db.session.add(assignment)
+        created.append(assignment)
+    db.session.commit()
+    return created
+
+
+def _rows(serializer):
+    return db.session.execute(
+        select(*serializer.columns).order_by(Assignment.assignment_id)
+    ).all()
+
+
+def test_rows_and_instances_serialize_alike(assignments):
+    serializer = assignment_serializer(ASSIGNMENT_FIELDS)
+
+    from_rows = serializer.rows(_rows(serializer))
+
+    assert from_rows == [serialize_assignment(a) for a in assignments]
+    assert from_rows[0]["deadline"] == "2030-01-10"
+    assert from_rows[0]["createdAt"] == "2030-01-01T09:30:00"
+    assert [s["text"] for s in from_rows[0]["subtasks"]] == [
+        "Research",
+        "Draft",
+        "Revise",
+    ]
+
+
+def test_projection_selects_only_requested_columns(assignments, query_counter):
+    serializer = assignment_serializer(("id", "deadline"))
+
+    items = serializer.rows(_rows(serializer))
+
+    assert [column.key for column in serializer.columns] == [
+        "assignment_id",
+        "deadline",
+    ]
+    assert items[0] == {"id": assignments[0].assignment_id, "deadline": "2030-01-10"}
+    assert not any("milestone" in statement for statement in query_counter)
+
+
+def test_serializers_are_compiled_once():
+    assert assignment_serializer(("id", "title")) is assignment_serializer(
+        ("id", "title")
+    )
+
+
+def test_milestones_are_fetched_in_chunks(assignments, query_counter, monkeypatch):
+    monkeypatch.setattr(serializers, "_IN_CHUNK", 2)
+    serializer = assignment_serializer(ASSIGNMENT_FIELDS)
+    rows = _rows(serializer)
+    query_counter.clear()
+
+    items = serializer.rows(rows)
+
+    assert len(query_counter) == 3
+    assert all(len(item["subtasks"]) == 3 for item in items)
+
+
+@pytest.mark.parametrize("name", ["stdlib", "orjson"])
+def test_backends_produce_the_same_json(name):
+    if name != "stdlib":
+        pytest.importorskip(name)
+    _, dumps = load_backend(name)
+    payload = [{"id": 1, "title": "Übung", "completed": True, "description": None}]
+
+    encoded = dumps(payload)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == payload
+    assert "Übung".encode() in encoded
+
+
+def test_missing_backend_is_reported(monkeypatch):
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    with pytest.raises(RuntimeError, match="msgspec"):
+        load_backend("msgspec")
+
+
+def test_auto_falls_back_to_stdlib(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    assert load_backend("auto")[0] == "stdlib"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_backend("yaml")
+
+
+def test_listing_responses_are_utf8_json(auth_client, assignments):
+    response = auth_client.get("/assignments")
+
+    assert response.mimetype == "application/json"
+    assert "Übung 0".encode() in response.data
+    assert response.get_json()[0]["subtasks"][0]["completed"] is True
@@ -0,0 +1,260 @@
+"""
+Unit tests for two-way incremental Google Tasks sync, run against a fake
+Tasks server.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import update
+
+from backend.database.models import (
+    Assignment,
+    Milestone,
+    Subtask,
+    TaskSyncState,
+    User,
+    db,
+)
+from backend.services.google_tasks import sync_assignment_tasks
+from backend.services.tasks_sync import sync_tasklist
+from backend.tests.fake_google_tasks import FakeTasksHttp
+
+LIST = "@default"
+
+
+@pytest.fixture
+def fake_http():
+    return FakeTasksHttp(page_size=4)
+
+
+@pytest.fixture
+def assignment(auth_client, fake_http):
+    assignment = Assignment(
+        user_id=auth_client.user_id,
+        title="Essay",
+        deadline=date(2030, 1, 10),
+        created_at=datetime(2030, 1, 1),
+    )
+    for m_idx in range(3):
+        milestone = Milestone(
+            title=f"Milestone {m_idx}",
+            text=f"Milestone {m_idx}",
+            due_date=date(2030, 1, 5),
+            order=m_idx,
+        )
+        milestone.subtasks = [
+            Subtask(title=f"Subtask {m_idx}.{s_idx}", order=s_idx) for s_idx in range(2)
+        ]
+        assignment.milestones.append(milestone)
+    db.session.add(assignment)
+    db.session.commit()
+    sync_assignment_tasks(LIST, assignment, http=fake_http)
+    db.session.commit()
+    return assignment
+
+
+def _sync(auth_client, fake_http):
+    fake_http.requests.clear()
+    fake_http.batch_requests = 0
+    summary = sync_tasklist(auth_client.user_id, LIST, http=fake_http)
+    db.session.commit()
+    return summary
+
+
+def test_first_sync_pages_through_everything_then_pulls_deltas(
+    auth_client, assignment, fake_http
+):
+    first = _sync(auth_client, fake_http)
+
+    assert first["fetched"] == 9
+    assert [method for method, _ in fake_http.requests] == ["GET"] * 3
+    assert first["pulled"] == first["pushed"] == 0
+    assert fake_http.batch_requests == 0
+    state = db.session.get(TaskSyncState, (auth_client.user_id, LIST))
+    assert state.updated_min == first["watermark"]
+
+    second = _sync(auth_client, fake_http)
+
+    # updatedMin is inclusive, so only the newest task is listed again
+    assert second["fetched"] == 1
+    assert second["pulled"] == second["pushed"] == 0
+
+
+def test_remote_edits_are_pulled(auth_client, assignment, fake_http):
+    _sync(auth_client, fake_http)
+    milestone = assignment.milestones[1]
+    subtask = milestone.subtasks[0]
+    fake_http.edit(
+        LIST,
+        milestone.google_task_id,
+        title="Write the draft",
+        notes="Two pages",
+        due="2030-01-07T00:00:00.000Z",
+    )
+    fake_http.edit(LIST, subtask.google_task_id, status="completed")
+
+    summary = _sync(auth_client, fake_http)
+
+    # The two edits plus the task at the inclusive watermark
+    assert summary["fetched"] == 3
+    assert summary["pulled"] == 2
+    assert summary["pushed"] == 0
+    assert (milestone.title, milestone.text) == ("Write the draft", "Write the draft")
+    assert milestone.description == "Two pages"
+    assert milestone.due_date == date(2030, 1, 7)
+    assert subtask.completed is True
+
+
+def test_pulled_changes_reach_cached_reads_and_the_timeline(
+    auth_client, assignment, fake_http
+):
+    _sync(auth_client, fake_http)
+    url = f"/assignments/{assignment.assignment_id}"
+    etag = auth_client.get(url).headers["ETag"]
+    milestone = assignment.milestones[1]
+    fake_http.edit(
+        LIST,
+        milestone.google_task_id,
+        title="Write the draft",
+        due="2030-01-07T00:00:00.000Z",
+        status="completed",
+    )
+
+    _sync(auth_client, fake_http)
+
+    response = auth_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert "Write the draft" in [s["text"] for s in body["subtasks"]]
+    assert body["progress"] == 11  # 1 of 3 milestones and 6 subtasks
+    items = auth_client.get("/timeline?from=2030-01-07&to=2030-01-07").json["items"]
+    assert [(i["type"], i["title"]) for i in items] == [
+        ("milestone", "Write the draft")
+    ]
+
+
+def test_only_locally_changed_rows_are_pushed(auth_client, assignment, fake_http):
+    _sync(auth_client, fake_http)
+    milestone = assignment.milestones[2]
+    milestone.completed = True
+    db.session.commit()
+
+    summary = _sync(auth_client, fake_http)
+
+    assert summary["pushed"] == 1
+    assert fake_http.batch_requests == 1
+    assert [m for m, _ in fake_http.requests].count("PATCH") == 1
+    assert fake_http.tasklists[LIST][milestone.google_task_id]["status"] == "completed"
+    # The echo of the push is not pulled back as a change
+    assert _sync(auth_client, fake_http)["pulled"] == 0
+    assert fake_http.batch_requests == 0
+
+
+def test_later_change_wins_a_conflict(auth_client, assignment, fake_http, capsys):
+    _sync(auth_client, fake_http)
+    local_wins, google_wins = assignment.milestones[0], assignment.milestones[1]
+    fake_http.edit(LIST, local_wins.google_task_id, title="Remote title")
+    local_wins.title = local_wins.text = "Local title"
+    google_wins.title = google_wins.text = "Local title"
+    db.session.commit()
+    fake_http.edit(LIST, google_wins.google_task_id, title="Remote title")
+
+    summary = _sync(auth_client, fake_http)
+
+    winners = {c["taskId"]: c["winner"] for c in summary["conflicts"]}
+    assert winners == {
+        local_wins.google_task_id: "local",
+        google_wins.google_task_id: "google",
+    }
+    assert "[SYNC] Conflict" in capsys.readouterr().out
+    assert google_wins.text == "Remote title"
+    assert local_wins.text == "Local title"
+    remote = fake_http.tasklists[LIST]
+    assert remote[local_wins.google_task_id]["title"] == "Local title"
+    assert summary["pushed"] == 1
+
+
+def test_milestones_sync_their_title_not_their_text(auth_client, assignment, fake_http):
+    # As generated by the planner: text is "Title: description"
+    milestone = assignment.milestones[0]
+    milestone.title = "Research"
+    milestone.text = "Research: Read the sources."
+    milestone.description = "Read the sources."
+    db.session.commit()
+    _sync(auth_client, fake_http)
+    milestone.completed = True
+    db.session.commit()
+
+    assert _sync(auth_client, fake_http)["pushed"] == 1
+    remote = fake_http.tasklists[LIST][milestone.google_task_id]
+    assert (remote["title"], remote["notes"]) == ("Research", "Read the sources.")
+
+    fake_http.edit(LIST, milestone.google_task_id, title="Gather sources")
+    assert _sync(auth_client, fake_http)["pulled"] == 1
+    assert milestone.title == "Gather sources"
+    assert milestone.text == "Research: Read the sources."
+
+
+def test_rows_linked_before_the_migration_sync_cleanly(
+    auth_client, assignment, fake_http
+):
+    # As left by migration 0007: change time backfilled, never synced
+    for model in (Milestone, Subtask):
+        db.session.execute(
+            update(model).values(updated_at=datetime(2020, 1, 1), synced_at=None)
+        )
+    db.session.commit()
+    db.session.expire_all()
+    milestone = assignment.milestones[0]
+    fake_http.edit(LIST, milestone.google_task_id, title="Renamed in Google")
+
+    summary = _sync(auth_client, fake_http)
+
+    assert summary["fetched"] == 9
+    assert summary["pulled"] == 1
+    assert summary["pushed"] == 0
+    assert [c["winner"] for c in summary["conflicts"]] == ["google"]
+    assert milestone.text == "Renamed in Google"
+    assert _sync(auth_client, fake_http)["pushed"] == 0
+
+
+def test_deleted_tasks_unlink_their_rows(auth_client, assignment, fake_http):
+    _sync(auth_client, fake_http)
+    pulled, pushed = assignment.milestones[0], assignment.milestones[1]
+    fake_http.request(
+        f"https://tasks.googleapis.com/tasks/v1/lists/{LIST}/tasks/"
+        f"{pulled.google_task_id}",
+        method="DELETE",
+    )
+    # Gone from Google without showing up in the delta; the push finds out
+    deleted_id = pushed.google_task_id
+    pushed.completed = True
+    db.session.commit()
+    fake_http.tasklists[LIST][deleted_id]["deleted"] = True
+
+    summary = _sync(auth_client, fake_http)
+
+    assert summary["unlinked"] == 2
+    assert pulled.google_task_id is None
+    assert pushed.google_task_id is None
+    assert summary["failed"] == []
+
+
+def test_other_users_rows_are_not_touched(auth_client, assignment, fake_http):
+    other = User(username="eve", email="eve@example.com", name="Eve", password="x")
+    foreign = Assignment(
+        user=other, title="Secret", deadline=date(2030, 1, 1), created_at=datetime.now()
+    )
+    foreign.milestones = [Milestone(title="Hidden", text="Hidden", order=0)]
+    db.session.add(foreign)
+    db.session.commit()
+    sync_assignment_tasks(LIST, foreign, http=fake_http)
+    foreign.milestones[0].completed = True
+    db.session.commit()
+    fake_http.edit(LIST, foreign.milestones[0].google_task_id, title="Changed")
+
+    summary = _sync(auth_client, fake_http)
+
+    assert summary["pulled"] == summary["pushed"] == 0
+    assert foreign.milestones[0].text == "Hidden"
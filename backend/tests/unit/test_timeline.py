@@ -0,0 +1,153 @@
+"""
+Unit tests for GET /timeline and the agenda index behind it.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from backend.api.routes import assignments as assignment_routes
+from backend.database.models import AgendaItem, Assignment, Milestone, Subtask, db
+from backend.services.agenda import refresh_assignments
+from backend.services.llm_splitter import split_assignments
+
+
+@pytest.fixture
+def fake_split(monkeypatch, fake_anthropic):
+    monkeypatch.setattr(
+        assignment_routes,
+        "split_assignments",
+        lambda requests: split_assignments(requests, client=fake_anthropic),
+    )
+    return fake_anthropic
+
+
+@pytest.fixture
+def created(auth_client, fake_split, due_date):
+    items = [
+        {"title": "Essay", "description": "Write an essay", "deadline": due_date},
+        {"title": "Quiz", "deadline": due_date, "subtasks": [{"text": "Study"}]},
+    ]
+    body = auth_client.post("/assignments/batch", json={"assignments": items})
+    return [r["assignment"] for r in body.get_json()["results"]]
+
+
+def _timeline(client, **params):
+    return client.get("/timeline", query_string=params)
+
+
+def test_timeline_merges_assignments_and_milestones_by_date(
+    auth_client, created, due_date
+):
+    response = _timeline(auth_client, to=due_date)
+
+    items = response.get_json()["items"]
+    assert response.status_code == 200
+    assert [i["dueDate"] for i in items] == sorted(i["dueDate"] for i in items)
+    assert {(i["type"], i["assignmentTitle"]) for i in items} == {
+        ("assignment", "Essay"),
+        ("assignment", "Quiz"),
+        ("milestone", "Essay"),
+    }
+    milestones = [i for i in items if i["type"] == "milestone"]
+    assert all(i["milestoneId"] for i in milestones)
+    assert {i["title"] for i in milestones} == {"Research", "Write"}
+
+
+def test_timeline_respects_the_range(auth_client, created, due_date):
+    today = date.today().isoformat()
+
+    items = _timeline(auth_client, **{"from": today, "to": today}).json["items"]
+
+    assert [(i["type"], i["title"]) for i in items] == [("milestone", "Research")]
+
+
+def test_writes_keep_the_agenda_in_sync(auth_client, created, due_date):
+    essay = created[0]["id"]
+    auth_client.patch(
+        f"/assignments/{essay}",
+        json=[{"op": "replace", "path": "/title", "value": "Final essay"}],
+    )
+    auth_client.delete(f"/assignments/{created[1]['id']}")
+
+    items = _timeline(auth_client, to=due_date).json["items"]
+
+    assert {i["assignmentTitle"] for i in items} == {"Final essay"}
+
+    auth_client.patch(
+        f"/assignments/{created[1]['id']}/archive", json={"archived": False}
+    )
+    items = _timeline(auth_client, to=due_date).json["items"]
+    assert {i["assignmentTitle"] for i in items} == {"Final essay", "Quiz"}
+
+
+def test_subtasks_with_due_dates_are_listed(auth_client):
+    assignment = Assignment(
+        user_id=auth_client.user_id,
+        title="Project",
+        deadline=date(2030, 1, 20),
+        created_at=datetime(2030, 1, 1),
+    )
+    milestone = Milestone(title="Build", text="Build", order=0)
+    milestone.subtasks = [
+        Subtask(title="Backend", due_date=date(2030, 1, 5), order=0),
+        Subtask(title="Frontend", order=1),
+    ]
+    assignment.milestones = [milestone]
+    db.session.add(assignment)
+    db.session.flush()
+    refresh_assignments([assignment.assignment_id])
+    db.session.commit()
+
+    items = _timeline(auth_client, **{"from": "2030-01-01", "to": "2030-01-31"}).json[
+        "items"
+    ]
+
+    assert [(i["type"], i["title"], i["dueDate"]) for i in items] == [
+        ("subtask", "Backend", "2030-01-05"),
+        ("assignment", "Project", "2030-01-20"),
+    ]
+    assert items[0]["milestoneId"] == milestone.milestone_id
+    assert items[0]["subtaskId"] == milestone.subtasks[0].subtask_id
+
+
+def test_other_users_items_are_not_visible(auth_client, created, due_date, client):
+    db.session.execute(db.update(AgendaItem).values(user_id=auth_client.user_id + 1))
+    db.session.commit()
+
+    assert _timeline(auth_client, to=due_date).json["items"] == []
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "not-a-date"},
+        {"from": "2030-02-01", "to": "2030-01-01"},
+        {"from": "2030-01-01", "to": "2032-01-01"},
+    ],
+)
+def test_invalid_ranges_are_rejected(auth_client, params):
+    assert _timeline(auth_client, **params).status_code == 400
+
+
+def test_default_range_is_two_weeks(auth_client):
+    body = _timeline(auth_client).get_json()
+
+    today = date.today()
+    assert body["from"] == today.isoformat()
+    assert body["to"] == (today + timedelta(days=14)).isoformat()
+
+
+def test_lookup_is_an_index_range_scan(app):
+    plan = db.session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT * FROM agenda_item WHERE user_id = 1 "
+            "AND due_date >= '2030-01-01' AND due_date <= '2030-01-14' "
+            "ORDER BY due_date, agenda_item_id"
+        )
+    ).all()
+
+    detail = " ".join(row[-1] for row in plan)
+    assert "USING INDEX ix_agenda_item_user_due_date" in detail
+    assert "TEMP B-TREE" not in detail
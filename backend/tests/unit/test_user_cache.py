@@ -0,0 +1,98 @@
+"""
+Unit tests for the cached Flask-Login user_loader.
+"""
+
+import time
+
+from flask import g
+from sqlalchemy import update
+
+from backend.database.models import User, db
+from backend.services.user_cache import SessionUser, UserCache, user_cache
+
+
+def _get(client, url):
+    # The fixtures keep one app context open, so Flask-Login's per-request
+    # user on ``g`` would otherwise survive between test requests.
+    g.pop("_login_user", None)
+    return client.get(url)
+
+
+def _user_queries(statements):
+    return [s for s in statements if "FROM user" in s]
+
+
+def test_repeat_requests_skip_the_user_query(auth_client, query_counter):
+    _get(auth_client, "/timeline")
+    query_counter.clear()
+
+    response = _get(auth_client, "/timeline")
+
+    assert response.status_code == 200
+    assert _user_queries(query_counter) == []
+    assert user_cache.snapshot()["hits"] >= 1
+
+
+def test_data_version_is_always_read_fresh(auth_client):
+    first = _get(auth_client, "/assignments")
+    # A write committed elsewhere (e.g. another worker process)
+    db.session.execute(
+        update(User)
+        .where(User.user_id == auth_client.user_id)
+        .values(data_version=User.data_version + 1)
+    )
+    db.session.commit()
+
+    second = _get(auth_client, "/assignments")
+
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+
+def test_profile_changes_invalidate(auth_client):
+    _get(auth_client, "/auth/me")
+    user = db.session.get(User, auth_client.user_id)
+    user.name = "Renamed"
+    db.session.commit()
+
+    assert _get(auth_client, "/auth/me").get_json()["name"] == "Renamed"
+
+
+def test_logout_invalidates(auth_client):
+    _get(auth_client, "/auth/me")
+    assert len(user_cache) == 1
+
+    auth_client.post("/auth/logout")
+
+    assert len(user_cache) == 0
+    assert _get(auth_client, "/auth/me").status_code == 401
+
+
+def test_deleted_user_is_logged_out(auth_client):
+    db.session.delete(db.session.get(User, auth_client.user_id))
+    db.session.commit()
+    user_cache.clear()
+
+    assert _get(auth_client, "/auth/me").status_code == 401
+
+
+def test_hit_rate_counters():
+    cache = UserCache(max_entries=10, ttl=60)
+    cache.set(SessionUser(1, "ada", "ada@example.com", "Ada"))
+
+    cache.get(1)
+    cache.get(1)
+    cache.get(2)
+
+    stats = cache.snapshot()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_expired_and_evicted_entries_miss():
+    cache = UserCache(max_entries=1, ttl=0.05)
+    cache.set(SessionUser(1, "ada", "ada@example.com", "Ada"))
+    cache.set(SessionUser(2, "bob", "bob@example.com", "Bob"))
+
+    assert cache.get(1) is None
+    time.sleep(0.06)
+    assert cache.get(2) is None
@@ -0,0 +1,99 @@
+"""
+Unit tests for counter-based username allocation on signup.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.database.models import User, UsernameCounter, db
+from backend.main import create_app
+from backend.services.password_hashing import hasher
+
+
+def _signup(client, email):
+    return client.post(
+        "/auth/signup", json={"email": email, "password": "secret", "name": "John"}
+    )
+
+
+def test_usernames_are_numbered_per_base(client):
+    usernames = [
+        _signup(client, f"john@{domain}").get_json()["user"]["username"]
+        for domain in ("a.com", "b.com", "c.com")
+    ]
+
+    assert usernames == ["john", "john1", "john2"]
+    assert db.session.get(UsernameCounter, "john").last_suffix == 2
+
+
+def test_allocation_is_one_query(client, query_counter):
+    _signup(client, "john@a.com")
+    query_counter.clear()
+
+    _signup(client, "john@b.com")
+
+    counter_queries = [q for q in query_counter if "username_counter" in q]
+    assert len(counter_queries) == 1
+    assert counter_queries[0].startswith("UPDATE")
+    assert not any("LIKE" in q for q in query_counter)
+
+
+def test_counter_is_seeded_from_existing_usernames(client):
+    db.session.add_all(
+        User(username=name, email=f"{name}@old.com", name="x", password="x")
+        for name in ("john", "john7", "johnny", "john_3")
+    )
+    db.session.commit()
+
+    response = _signup(client, "john@new.com")
+
+    assert response.get_json()["user"]["username"] == "john8"
+
+
+def test_taken_username_is_retried(client):
+    _signup(client, "john@a.com")
+    # Takes the next numbered name without going through the counter
+    _signup(client, "john1@a.com")
+
+    response = _signup(client, "john@b.com")
+
+    assert response.status_code == 201
+    assert response.get_json()["user"]["username"] == "john2"
+
+
+def test_like_wildcards_in_base_are_literal(client):
+    db.session.add(User(username="a_c5", email="x@old.com", name="x", password="x"))
+    db.session.commit()
+
+    response = _signup(client, "abc@new.com")
+
+    assert response.get_json()["user"]["username"] == "abc"
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """An app on a SQLite file, so threads get their own connections."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+    monkeypatch.setattr(hasher, "max_queue", 10_000)
+    app = create_app()
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30}}
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_concurrent_signups_sharing_a_prefix(file_app):
+    signups = 100
+
+    def signup(i):
+        return _signup(file_app.test_client(), f"john@{i}.example.com")
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        responses = list(pool.map(signup, range(signups)))
+
+    assert {r.status_code for r in responses} == {201}
+    usernames = {r.get_json()["user"]["username"] for r in responses}
+    assert usernames == {"john"} | {f"john{i}" for i in range(1, signups)}